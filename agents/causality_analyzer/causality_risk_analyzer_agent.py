@@ -1,6 +1,7 @@
 import argparse
 import json
 import os
+import sqlite3
 import sys
 import time
 from operator import add
@@ -14,8 +15,20 @@ from agents.causality_analyzer.prompts import (
     CAUSALITY_JSON_SCHEMA,
     CAUSALITY_SYSTEM_PROMPT,
     CAUSALITY_USER_PROMPT,
+    COMPACT_CAUSALITY_JSON_SCHEMA,
+    COMPACT_CAUSALITY_USER_PROMPT,
+)
+from utils.models import CausalityAdapter, CompactCausalityAdapter
+from utils.prompt_encoding import compact_prompts_enabled, compact_risks, minify
+from utils.risk_index import get_risk_index
+from utils.run_store import get_run_store, json_export_enabled
+from utils.serialization import write_artifact
+from utils.utils import (
+    STAGE_TEMPERATURES,
+    bind_json_schema,
+    create_logger,
+    get_llm_instance,
 )
-from utils.utils import create_logger, get_llm_instance
 
 _logger = create_logger("causality_analyzer")
 
@@ -54,6 +67,14 @@ def node_load(state: CausalAnalysisState) -> CausalAnalysisState:
     state["messages"] = []
     state["errors"] = []
 
+    # Fall back to the run store when only the run_id is provided
+    run_id = (state.get("metadata") or {}).get("run_id")
+    if state.get("analysis") is None and run_id:
+        stored = get_run_store().load_stage(run_id, "domain")
+        if stored:
+            state["metadata"] = {**stored.get("metadata", {}), **state["metadata"]}
+            state["analysis"] = stored.get("analysis")
+
     # Ensure analysis is present (passed from domain_analyzer)
     if state.get("analysis") is None:
         err = "No analysis data present in initial state"
@@ -110,13 +131,17 @@ def node_validate(state: CausalAnalysisState) -> CausalAnalysisState:
 # ================================
 #  Utility function for building messages
 # ================================
-def _build_messages(analysis_json: Dict[str, Any], language: str) -> List[Any]:
+def _build_messages(
+    analysis_json: Dict[str, Any], language: str, compact: bool = False
+) -> List[Any]:
     """
     Build messages for the LLM based on analysis JSON and language.
 
     Args:
         analysis_json: The domain analysis JSON data.
         language: The language for the analysis.
+        compact: Send only id, title, short explanation and severity of each
+            risk as minified JSON (see ``_reattach_risk_fields``).
 
     Returns:
         A list of messages formatted for the LLM.
@@ -125,15 +150,60 @@ def _build_messages(analysis_json: Dict[str, Any], language: str) -> List[Any]:
         "role": "system",
         "content": CAUSALITY_SYSTEM_PROMPT,
     }
+    if compact:
+        template = COMPACT_CAUSALITY_USER_PROMPT
+        payload = minify(
+            compact_risks(analysis_json, ["title", "explanation", "severity"])
+        )
+    else:
+        template = CAUSALITY_USER_PROMPT
+        payload = json.dumps(analysis_json, ensure_ascii=False)
     user_msg = {
         "role": "user",
-        "content": CAUSALITY_USER_PROMPT.replace(
-            "{{domain_analysis_json}}", json.dumps(analysis_json, ensure_ascii=False)
-        ).replace("{{language}}", language),
+        "content": template.replace("{{domain_analysis_json}}", payload).replace(
+            "{{language}}", language
+        ),
     }
     return [system_msg, user_msg]
 
 
+# ================================
+#  Utility function for re-attaching the fields omitted by the compact prompt
+# ================================
+def _reattach_risk_fields(
+    parsed: Dict[str, Any], analysis: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Merge the compact causality response with the domain analysis risks.
+
+    Args:
+        parsed: The compact response, risks referenced by "id".
+        analysis: The domain analysis sent to the model.
+
+    Returns:
+        The flat analysis (same shape as the full prompt response).
+
+    Raises:
+        ValueError: If the response misses a subdomain or a risk.
+    """
+    flat = {}
+    for subdomain, content in analysis.items():
+        returned = (parsed.get(subdomain) or {}).get("risks")
+        if returned is None:
+            raise ValueError(f"Causality response missing subdomain {subdomain}")
+        by_id = {item.get("id"): item for item in returned}
+        risks = []
+        for index, risk in enumerate(content["risks"]):
+            if index not in by_id:
+                raise ValueError(
+                    f"Causality response missing risk {index} of subdomain {subdomain}"
+                )
+            fields = {k: v for k, v in by_id[index].items() if k != "id"}
+            risks.append({**risk, **fields})
+        flat[subdomain] = {"risks": risks}
+    return flat
+
+
 # ================================
 #  Utility function for converting flat → nested
 # ================================
@@ -203,14 +273,17 @@ def node_analyze(state: CausalAnalysisState) -> CausalAnalysisState:
         Updated state dictionary with causality analysis results.
     """
     analysis_json = state.get("analysis")
-    llm = get_llm_instance(t=0)
+    llm = get_llm_instance(t=STAGE_TEMPERATURES["causality"])
 
     # Retrieve language from metadata, default to 'en'
     language = (state.get("metadata") or {}).get("language", "en")
 
-    messages = _build_messages(analysis_json, language)
+    compact = compact_prompts_enabled()
+    messages = _build_messages(analysis_json, language, compact=compact)
     state["messages"] = messages
-    _logger.info("Causality analysis start", step="analyze", language=language)
+    _logger.info(
+        "Causality analysis start", step="analyze", language=language, compact=compact
+    )
     _logger.debug(
         "Messages prepared",
         step="analyze",
@@ -218,18 +291,19 @@ def node_analyze(state: CausalAnalysisState) -> CausalAnalysisState:
         language=language,
     )
 
-    # Prefer the same strategy as domain analyzer: structured output + TypeAdapter validation
-    structured = llm.with_structured_output(
-        schema=CAUSALITY_JSON_SCHEMA, method="json_schema"
+    # Same strategy as the domain analyzer: the raw JSON text is parsed and
+    # validated once by a precompiled TypeAdapter returning plain dicts
+    json_llm = bind_json_schema(
+        llm, COMPACT_CAUSALITY_JSON_SCHEMA if compact else CAUSALITY_JSON_SCHEMA
     )
     try:
-        result = structured.invoke(messages)
-        if hasattr(result, "parsed") and isinstance(result.parsed, dict):
-            parsed = result.parsed
-        elif isinstance(result, dict):
-            parsed = result
+        response = json_llm.invoke(messages)
+        if compact:
+            parsed = _reattach_risk_fields(
+                CompactCausalityAdapter.validate_json(response.text), analysis_json
+            )
         else:
-            raise RuntimeError("Unexpected structured response type")
+            parsed = CausalityAdapter.validate_json(response.text)
 
         # Convert flat structure to nested structure
         state["analysis"] = _convert_analysis_to_nested(parsed)
@@ -246,15 +320,14 @@ def node_analyze(state: CausalAnalysisState) -> CausalAnalysisState:
 # ================================
 def _save_output(state: CausalAnalysisState) -> Optional[str]:
     """
-    Save the complete output in JSON.
+    Save the complete output in the run store (and as JSON if exports are enabled).
 
     Args:
         state: State dictionary containing 'analysis' and 'metadata'.
 
     Returns:
-        The path to the saved JSON file.
+        The path to the exported JSON file, None if JSON exports are disabled.
     """
-    CAUSALITY_DIR.mkdir(parents=True, exist_ok=True)
     ts = time.strftime("%Y%m%d_%H%M%S")
     run_id = (state.get("metadata") or {}).get("run_id")
     if not run_id:
@@ -277,11 +350,36 @@ def _save_output(state: CausalAnalysisState) -> Optional[str]:
         "metadata": meta,
         "analysis": state.get("analysis"),
     }
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=4)
+    get_run_store().save_stage(run_id, "causality", payload)
+    if not state.get("errors"):
+        _update_risk_index(run_id, payload)
+    if not json_export_enabled():
+        return None
+    CAUSALITY_DIR.mkdir(parents=True, exist_ok=True)
+    write_artifact(path, payload)
     return str(path)
 
 
+def _update_risk_index(run_id: str, payload: Dict[str, Any]) -> None:
+    """
+    Add the risks of the run to the cross-run search index.
+
+    A failure is logged only: the index can be rebuilt from the run store.
+
+    Args:
+        run_id: The run identifier.
+        payload: The saved causality output (metadata and analysis).
+    """
+    try:
+        get_risk_index().index_run(
+            run_id, payload.get("analysis"), payload["metadata"].get("language")
+        )
+    except sqlite3.Error as e:
+        _logger.warning(
+            "Risk index not updated", step="save", run_id=run_id, error=str(e)
+        )
+
+
 # ================================
 # NODE 4 - Save Output
 # ================================
@@ -301,6 +399,7 @@ def node_save(state: CausalAnalysisState) -> CausalAnalysisState:
         _logger.info(
             "Causality analysis saved",
             step="save",
+            run_id=(state.get("metadata") or {}).get("run_id"),
             output_path=out_path,
             domains=len(state.get("analysis", {})),
             risks_total=sum(
@@ -347,7 +446,7 @@ if __name__ == "__main__":
     )
     parser.add_argument(
         "filename",
-        help="Name of the domain analysis JSON file.",
+        help="Name of the domain analysis JSON file, or a run_id in the run store.",
     )
     args = parser.parse_args()
 
@@ -355,18 +454,19 @@ if __name__ == "__main__":
     domain_dir = "/home/stingom/Scrivania/Git/area/files/analysis/domain"
     input_file = os.path.join(domain_dir, args.filename)
 
-    # Verify that the file exists
-    if not os.path.isfile(input_file):
-        _logger.error(f"Input file not found: {input_file}")
-        sys.exit(2)
-
-    # Load the domain analysis file
-    try:
-        with open(input_file, "r", encoding="utf-8") as f:
-            domain_analysis = json.load(f)
-    except Exception as e:
-        _logger.error(f"Failed to load input file: {e}")
-        sys.exit(2)
+    # Load the domain analysis file, or the stored domain stage of the run
+    if os.path.isfile(input_file):
+        try:
+            with open(input_file, "r", encoding="utf-8") as f:
+                domain_analysis = json.load(f)
+        except Exception as e:
+            _logger.error(f"Failed to load input file: {e}")
+            sys.exit(2)
+    else:
+        domain_analysis = get_run_store().load_stage(args.filename, "domain")
+        if domain_analysis is None:
+            _logger.error(f"Input file or run not found: {args.filename}")
+            sys.exit(2)
 
     # Create the graph for causality analysis
     graph = create_causality_analyzer_graph()
@@ -141,3 +141,69 @@ CAUSALITY_JSON_SCHEMA = {
         "required": ["risks"],
     },
 }
+
+
+# Compact variant (AREA_COMPACT_PROMPTS): the risks are sent as minified JSON
+# with only the fields needed for the classification, and the model returns the
+# causality fields by risk id. Title, explanation, severity and mitigation are
+# re-attached locally from the domain analysis.
+COMPACT_CAUSALITY_USER_PROMPT = """
+Input: risks per subdomain 'x.y' as minified JSON, {"x.y":[{"id":int,"title":str,"explanation":str,"severity":"low|medium|high"}]} (explanations may be truncated with "…"):
+{{domain_analysis_json}}
+
+Language for the output: {{language}}
+
+Task: for every risk, return ONLY a valid JSON object with the same keys 'x.y' and, for each input risk, one object referencing it by 'id':
+{"x.y":{"risks":[{"id":int,"severity_rationale":str,"entity":"ai|human|other","entity_rationale":str,"intent":"intentional|unintentional|other","intent_rationale":str,"timing":"pre-deployment|post-deployment|other","timing_rationale":str}]}}
+
+Requirements:
+- Alignment: same subdomains, one object per input risk, same ids; empty lists stay empty.
+- Allowed values are lowercase and exact, as listed above.
+- Rationales are mandatory, brief and specific, grounded on the title, explanation and severity of the risk.
+- Output: respond ONLY with valid JSON, without additional text or delimiters (no ```). If information is indeterminable, use 'other' and briefly justify.
+"""
+
+COMPACT_CAUSALITY_JSON_SCHEMA = {
+    "type": "object",
+    "additionalProperties": {
+        "type": "object",
+        "properties": {
+            "risks": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "integer"},
+                        "severity_rationale": {"type": "string"},
+                        "entity": {
+                            "type": "string",
+                            "enum": ["ai", "human", "other"],
+                        },
+                        "entity_rationale": {"type": "string"},
+                        "intent": {
+                            "type": "string",
+                            "enum": ["intentional", "unintentional", "other"],
+                        },
+                        "intent_rationale": {"type": "string"},
+                        "timing": {
+                            "type": "string",
+                            "enum": ["pre-deployment", "post-deployment", "other"],
+                        },
+                        "timing_rationale": {"type": "string"},
+                    },
+                    "required": [
+                        "id",
+                        "severity_rationale",
+                        "entity",
+                        "entity_rationale",
+                        "intent",
+                        "intent_rationale",
+                        "timing",
+                        "timing_rationale",
+                    ],
+                },
+            }
+        },
+        "required": ["risks"],
+    },
+}
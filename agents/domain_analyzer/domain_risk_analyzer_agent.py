@@ -1,12 +1,13 @@
 import argparse
 import json
 import os
+import sqlite3
 import sys
 import uuid
 from datetime import datetime
 from operator import add
 from pathlib import Path
-from typing import Annotated, Any, Dict, List
+from typing import Annotated, Any, Dict, List, Optional, Tuple
 
 from jinja2 import Template
 from langchain.messages import AnyMessage
@@ -19,8 +20,28 @@ from agents.domain_analyzer.prompts import (
     DOMAIN_ANALYSIS_SYSTEM_PROMPT,
     DOMAIN_ANALYSIS_USER_PROMPT,
 )
-from utils.models import DomainAnalysisAdapter, DomainItem
-from utils.utils import create_logger, get_llm_instance
+from utils.answers_validator import validate_answers
+from utils.models import DomainAnalysisAdapter, DomainItemAdapter, RawAnalysisAdapter
+from utils.question_catalog import get_question_catalog
+from utils.run_store import (
+    content_hash,
+    content_run_enabled,
+    get_run_store,
+    json_export_enabled,
+)
+from utils.semantic_cache import (
+    CacheHit,
+    get_semantic_cache,
+    prompt_digest,
+    semantic_cache_enabled,
+)
+from utils.serialization import write_artifact
+from utils.utils import (
+    STAGE_TEMPERATURES,
+    bind_json_schema,
+    create_logger,
+    get_llm_instance,
+)
 
 _logger = create_logger("domain_analyzer")
 
@@ -28,6 +49,18 @@ _logger = create_logger("domain_analyzer")
 CURRENT_DIR = Path(__file__).parent
 DOMAIN_DIR = Path(__file__).parent.parent.parent / "files" / "analysis" / "domain"
 
+# Extra LLM calls allowed to re-request the subdomains that fail validation
+SUBDOMAIN_RETRY_BUDGET = 2
+
+# Version of the prompts, output schema and temperature in the semantic cache key
+_PROMPT_DIGEST = prompt_digest(
+    DOMAIN_ANALYSIS_SYSTEM_PROMPT,
+    DOMAIN_ANALYSIS_USER_PROMPT,
+    DOMAIN_ANALYSIS_JSON_SCHEMA,
+    DomainItemAdapter.json_schema(),
+    STAGE_TEMPERATURES["domain"],
+)
+
 
 # ================================
 # State definition
@@ -49,6 +82,9 @@ def node_load(state: DomainAnalysisState, file_path: str) -> DomainAnalysisState
     """
     Load questionnaire JSON file into state.
 
+    A questionnaire already in the state (e.g. a resumed run, loaded from the
+    run store) is kept and the file is not read.
+
     Args:
         state (DomainAnalysisState): Current state of the analysis.
         file_path (str): Path to the questionnaire JSON file.
@@ -57,11 +93,18 @@ def node_load(state: DomainAnalysisState, file_path: str) -> DomainAnalysisState
         DomainAnalysisState: Updated state with loaded questionnaire or errors.
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            state["questionnaire"] = json.load(f)
+        if not state.get("questionnaire"):
+            with open(file_path, "r", encoding="utf-8") as f:
+                state["questionnaire"] = json.load(f)
         # Ensure a unique run identifier exists for this analysis flow.
         meta = state.get("questionnaire", {}).get("metadata", {}) or {}
-        run_id = meta.get("run_id") or uuid.uuid4().hex
+        run_id = (state.get("metadata") or {}).get("run_id") or meta.get("run_id")
+        if not run_id:
+            run_id = (
+                content_hash(state["questionnaire"])
+                if content_run_enabled()
+                else uuid.uuid4().hex
+            )
         # store run_id into state metadata for downstream agents
         state.setdefault("metadata", {})
         state["metadata"]["run_id"] = run_id
@@ -98,7 +141,11 @@ def node_load(state: DomainAnalysisState, file_path: str) -> DomainAnalysisState
 # ================================
 def node_validate(state: DomainAnalysisState) -> DomainAnalysisState:
     """
-    Validate the loaded questionnaire structure.
+    Validate the loaded questionnaire structure and its answers.
+
+    The answers are checked against the questions catalog of the questionnaire
+    language (see ``utils.answers_validator``), so malformed inputs are
+    rejected before the LLM call.
 
     Args:
         state (DomainAnalysisState): Current state of the analysis.
@@ -133,6 +180,21 @@ def node_validate(state: DomainAnalysisState) -> DomainAnalysisState:
                 errs.append(msg)
             return state
 
+    # Check the answers against the questions catalog before any LLM call
+    answer_errors = validate_answers(data)
+    if answer_errors:
+        msg = f"[DOMAIN][FATAL] invalid_answers: {'; '.join(answer_errors)}"
+        _logger.error(
+            "Validation failed",
+            step="validate",
+            error="invalid_answers",
+            details=answer_errors,
+        )
+        errs = state.setdefault("errors", [])
+        if msg not in errs:
+            errs.append(msg)
+        return state
+
     # Preserve existing run_id if present
     existing_run = (state.get("metadata") or {}).get("run_id")
     state["metadata"] = dict(data.get("metadata") or {})
@@ -177,6 +239,157 @@ def _build_messages(questions_and_answers: str, language: str) -> List[Any]:
     return [system_msg, user_msg]
 
 
+# ================================
+# Helpers for the salvage of partial results
+# ================================
+def _format_questions_and_answers(responses: Dict[str, Any]) -> str:
+    """
+    Format the questionnaire responses for the analysis prompt.
+
+    Args:
+        responses (Dict[str, Any]): Responses keyed by subdomain id.
+
+    Returns:
+        str: One block per response (subdomain, question and answer).
+    """
+    return "\n".join(
+        f"- Domain and sub-domain: {qid}\n"
+        f"  Question: {resp.get('question')}\n"
+        f"  Answer: {resp.get('answer')}"
+        for qid, resp in responses.items()
+    )
+
+
+def _validate_subdomains(
+    text: str,
+) -> Tuple[Dict[str, Any], Dict[str, ValidationError]]:
+    """
+    Validate the model response, keeping every subdomain that is valid.
+
+    The whole response is validated in one step; only if that fails is it
+    validated again subdomain by subdomain.
+
+    Args:
+        text (str): The raw JSON text of the model response.
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, ValidationError]]: The valid subdomains
+            and the validation error of each invalid one.
+
+    Raises:
+        ValidationError: If the response is not a JSON object.
+    """
+    try:
+        return DomainAnalysisAdapter.validate_json(text), {}
+    except ValidationError:
+        pass
+
+    valid, failed = {}, {}
+    for subdomain, content in RawAnalysisAdapter.validate_json(text).items():
+        try:
+            valid[subdomain] = DomainItemAdapter.validate_python(content)
+        except ValidationError as ve:
+            failed[subdomain] = ve
+    return valid, failed
+
+
+# ================================
+# Semantic cache helpers
+# ================================
+def _question_options(language: str) -> Dict[str, Any]:
+    """
+    Return the options of each question, to match choices exactly.
+
+    Args:
+        language (str): The questionnaire language.
+
+    Returns:
+        Dict[str, Any]: Question id -> option text -> position (empty if
+            there is no questions file for the language).
+    """
+    try:
+        return get_question_catalog(language).option_index
+    except FileNotFoundError:
+        return {}
+
+
+def _lookup_cached_subdomains(
+    responses: Dict[str, Any], language: str
+) -> Dict[str, CacheHit]:
+    """
+    Find the subdomains whose answer matches a cached analysis.
+
+    Args:
+        responses (Dict[str, Any]): Responses keyed by subdomain id.
+        language (str): The questionnaire language.
+
+    Returns:
+        Dict[str, CacheHit]: The cache hits by subdomain (empty if the
+            semantic cache is disabled or unavailable).
+    """
+    if not semantic_cache_enabled():
+        return {}
+    hits = {}
+    options = _question_options(language)
+    try:
+        cache = get_semantic_cache()
+        for qid, resp in responses.items():
+            hit = cache.lookup(
+                qid,
+                resp.get("answer"),
+                language,
+                prompt=_PROMPT_DIGEST,
+                options=options.get(qid, ()),
+            )
+            if hit is not None:
+                hits[qid] = hit
+    except sqlite3.Error as e:
+        _logger.warning("Semantic cache unavailable", step="analyze", error=str(e))
+        return {}
+    if hits:
+        _logger.info(
+            "Reusing cached subdomain analyses",
+            step="analyze",
+            subdomains=sorted(hits),
+        )
+    return hits
+
+
+def _cache_subdomains(
+    analysis: Dict[str, Any],
+    responses: Dict[str, Any],
+    language: str,
+    run_id: Optional[str],
+) -> None:
+    """
+    Store the validated subdomain analyses of this run in the semantic cache.
+
+    Args:
+        analysis (Dict[str, Any]): Validated analyses produced by the LLM.
+        responses (Dict[str, Any]): Responses keyed by subdomain id.
+        language (str): The questionnaire language.
+        run_id (Optional[str]): The run producing the analyses (provenance).
+    """
+    if not semantic_cache_enabled() or not analysis:
+        return
+    options = _question_options(language)
+    try:
+        cache = get_semantic_cache()
+        for qid, result in analysis.items():
+            if qid in responses:
+                cache.store(
+                    qid,
+                    responses[qid].get("answer"),
+                    language,
+                    result,
+                    run_id,
+                    prompt=_PROMPT_DIGEST,
+                    options=options.get(qid, ()),
+                )
+    except sqlite3.Error as e:
+        _logger.warning("Semantic cache not updated", step="analyze", error=str(e))
+
+
 # ================================
 # NODE 3 – Analyze with LLM
 # ================================
@@ -184,13 +397,23 @@ def node_analyze(state: DomainAnalysisState) -> DomainAnalysisState:
     """
     Analyze the questionnaire responses using an LLM and structured output.
 
+    Subdomains that fail validation are salvaged: the valid ones are kept and
+    only the invalid ones are requested again, within
+    ``SUBDOMAIN_RETRY_BUDGET`` extra calls. The retried subdomains are
+    recorded in ``metadata["retried_subdomains"]``.
+
+    With ``AREA_SEMANTIC_CACHE=1``, subdomains whose answer is near-identical
+    to an already analysed one reuse that analysis instead of calling the
+    LLM; their source run and similarity are recorded in
+    ``metadata["semantic_cache_hits"]``.
+
     Args:
         state (DomainAnalysisState): Current state of the analysis.
 
     Returns:
         DomainAnalysisState: Updated state with analysis results.
     """
-    llm = get_llm_instance(t=0)
+    llm = get_llm_instance(t=STAGE_TEMPERATURES["domain"])
     data = state.get("questionnaire")
     if not data:
         msg = "analyze_responses: no_questionnaire"
@@ -208,74 +431,68 @@ def node_analyze(state: DomainAnalysisState) -> DomainAnalysisState:
     # Determine language for prompts. Default to 'en' if not specified.
     language = (data.get("metadata") or {}).get("language", "en")
 
-    questions_and_answers = "\n".join(
-        f"- Domain and sub-domain: {qid}\n"
-        f"  Question: {resp.get('question')}\n"
-        f"  Answer: {resp.get('answer')}"
-        for qid, resp in responses.items()
-    )
-
-    state["messages"] = _build_messages(questions_and_answers, language)
-
-    _logger.debug(
-        "Messages prepared",
-        step="analyze",
-        roles=[m.get("role") for m in state["messages"]],
-        language=language,
-    )
+    # Subdomains answered (almost) like an already analysed one are reused
+    cache_hits = _lookup_cached_subdomains(responses, language)
+    analysis: Dict[str, Any] = {qid: hit.result for qid, hit in cache_hits.items()}
+    failed: Dict[str, ValidationError] = {}
+    retried: List[str] = []
+    pending = {qid: resp for qid, resp in responses.items() if qid not in cache_hits}
 
+    json_llm = bind_json_schema(llm, DOMAIN_ANALYSIS_JSON_SCHEMA)
     try:
-        structured_llm = llm.with_structured_output(
-            schema=DOMAIN_ANALYSIS_JSON_SCHEMA, method="json_schema"
-        )
-        _logger.info(
-            "Invoking structured LLM",
-            step="analyze",
-            method="json_schema",
-            language=language,
-        )
-        structured_resp = structured_llm.invoke(state["messages"])
-        _logger.info("Structured response received", step="analyze")
-        # Normalize to dict for TypeAdapter validation
-        if hasattr(structured_resp, "parsed"):
-            parsed = structured_resp.parsed
-        elif isinstance(structured_resp, dict):
-            parsed = structured_resp
-        else:
-            raise RuntimeError(
-                f"Unexpected structured response type: {type(structured_resp)!r}"
-            )
-
-        # Validate the parsed output using Pydantic and convert to Python dict
-        try:
-            validated: Dict[str, DomainItem] = DomainAnalysisAdapter.validate_python(
-                parsed
-            )
-            #  Convert Pydantic models to pure dicts for JSON serialization
-            state["analysis"] = {k: v.model_dump() for k, v in validated.items()}
+        # The first call covers every subdomain; each retry re-requests only
+        # the subdomains whose risks failed validation
+        for attempt in range(SUBDOMAIN_RETRY_BUDGET + 1):
+            if not pending:
+                break
+            messages = _build_messages(_format_questions_and_answers(pending), language)
+            if attempt == 0:
+                state["messages"] = messages
+                _logger.debug(
+                    "Messages prepared",
+                    step="analyze",
+                    roles=[m.get("role") for m in messages],
+                    language=language,
+                )
             _logger.info(
-                "Domain analysis completed",
+                "Invoking structured LLM",
                 step="analyze",
-                domains=len(state["analysis"]),
-                risks_total=sum(
-                    len(v.get("risks", [])) for v in state["analysis"].values()
-                ),
+                method="json_schema",
                 language=language,
+                attempt=attempt,
+                subdomains=len(pending),
             )
-            _logger.info("Domain analysis end", step="analyze")
-            return state
-        except ValidationError as ve:
-            _logger.error(
-                "Validation error on structured output",
+            response = json_llm.invoke(messages)
+            _logger.info("Structured response received", step="analyze")
+
+            try:
+                valid, failed = _validate_subdomains(response.text)
+            except ValidationError as ve:
+                # Not a JSON object at all: every requested subdomain failed
+                valid, failed = {}, {qid: ve for qid in pending}
+            analysis.update(valid)
+
+            unknown = [subdomain for subdomain in failed if subdomain not in responses]
+            if unknown:
+                _logger.warning(
+                    "Discarding invalid subdomains not in the questionnaire",
+                    step="analyze",
+                    subdomains=unknown,
+                )
+                for subdomain in unknown:
+                    del failed[subdomain]
+            if not failed or attempt == SUBDOMAIN_RETRY_BUDGET:
+                break
+
+            _logger.warning(
+                "Subdomains failed validation, retrying them",
                 step="analyze",
-                exc_info=True,
-                errors=ve.errors(),
+                subdomains=sorted(failed),
+                attempt=attempt + 1,
+                budget=SUBDOMAIN_RETRY_BUDGET,
             )
-            errs = state.setdefault("errors", [])
-            err_msg = f"[DOMAIN][FATAL] validation_error: {ve.errors()}"
-            if err_msg not in errs:
-                errs.append(err_msg)
-            return state
+            pending = {qid: responses[qid] for qid in responses if qid in failed}
+            retried.extend(qid for qid in pending if qid not in retried)
 
     except Exception as e:
         _logger.error(
@@ -289,21 +506,64 @@ def node_analyze(state: DomainAnalysisState) -> DomainAnalysisState:
             errs.append(err_msg)
         return state
 
+    # Keep the questionnaire order, whatever the order of the retries
+    order = {qid: index for index, qid in enumerate(responses)}
+    state["analysis"] = dict(
+        sorted(analysis.items(), key=lambda item: order.get(item[0], len(order)))
+    )
+    if retried:
+        state.setdefault("metadata", {})["retried_subdomains"] = retried
+    if cache_hits:
+        state.setdefault("metadata", {})["semantic_cache_hits"] = {
+            qid: hit.provenance() for qid, hit in cache_hits.items()
+        }
+    _cache_subdomains(
+        {k: v for k, v in analysis.items() if k not in cache_hits},
+        responses,
+        language,
+        (state.get("metadata") or {}).get("run_id"),
+    )
+
+    if failed:
+        errors = {subdomain: ve.errors() for subdomain, ve in failed.items()}
+        _logger.error(
+            "Validation error on structured output",
+            step="analyze",
+            subdomains=sorted(failed),
+            errors=errors,
+        )
+        errs = state.setdefault("errors", [])
+        err_msg = f"[DOMAIN][FATAL] validation_error: {errors}"
+        if err_msg not in errs:
+            errs.append(err_msg)
+        return state
+
+    _logger.info(
+        "Domain analysis completed",
+        step="analyze",
+        domains=len(state["analysis"]),
+        risks_total=sum(len(v.get("risks", [])) for v in state["analysis"].values()),
+        retried_subdomains=retried,
+        cached_subdomains=sorted(cache_hits),
+        language=language,
+    )
+    _logger.info("Domain analysis end", step="analyze")
+    return state
+
 
 # ================================
 # _save_output helper function
 # ================================
-def _save_output(state: DomainAnalysisState) -> str:
+def _save_output(state: DomainAnalysisState) -> Optional[str]:
     """
-    Save the complete output in JSON.
+    Save the complete output in the run store (and as JSON if exports are enabled).
 
     Args:
         state (DomainAnalysisState): Current state of the analysis.
 
     Returns:
-        str: Path to the saved JSON file.
+        Optional[str]: Path to the exported JSON file, None if not exported.
     """
-    DOMAIN_DIR.mkdir(parents=True, exist_ok=True)
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     run_id = state.get("metadata", {}).get("run_id")
     if not run_id:
@@ -325,8 +585,14 @@ def _save_output(state: DomainAnalysisState) -> str:
         "metadata": meta,
         "analysis": state.get("analysis"),
     }
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=4)
+    store = get_run_store()
+    if state.get("questionnaire"):
+        store.save_answers(run_id, state["questionnaire"])
+    store.save_stage(run_id, "domain", payload)
+    if not json_export_enabled():
+        return None
+    DOMAIN_DIR.mkdir(parents=True, exist_ok=True)
+    write_artifact(path, payload)
     return str(path)
 
 
@@ -348,6 +614,7 @@ def node_save(state: DomainAnalysisState) -> DomainAnalysisState:
         _logger.info(
             "Domain analysis saved",
             step="save",
+            run_id=state.get("metadata", {}).get("run_id"),
             output_path=out_path,
             domains=len(state.get("analysis", {})),
             risks_total=sum(
@@ -363,6 +630,22 @@ def node_save(state: DomainAnalysisState) -> DomainAnalysisState:
     return state
 
 
+# ================================
+# Routing
+# ================================
+def _route_after_validate(state: DomainAnalysisState) -> str:
+    """
+    Skip the LLM analysis when the questionnaire failed validation.
+
+    Args:
+        state (DomainAnalysisState): Current state of the analysis.
+
+    Returns:
+        str: "save" if there are errors, "analyze" otherwise.
+    """
+    return "save" if state.get("errors") else "analyze"
+
+
 # ================================
 # Graph construction
 # ================================
@@ -387,7 +670,9 @@ def create_domain_analyzer_graph(file_path: str):
     # Execution order
     graph.set_entry_point("load_file")
     graph.add_edge("load_file", "validate")
-    graph.add_edge("validate", "analyze")
+    graph.add_conditional_edges(
+        "validate", _route_after_validate, {"analyze": "analyze", "save": "save"}
+    )
     graph.add_edge("analyze", "save")
 
     return graph.compile()
@@ -397,7 +682,6 @@ def create_domain_analyzer_graph(file_path: str):
 # Standalone execution
 # ================================
 if __name__ == "__main__":
-
     parser = argparse.ArgumentParser(
         description="Run analysis on a questionnaire JSON file (by run_id or filename)"
     )
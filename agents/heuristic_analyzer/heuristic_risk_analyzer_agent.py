@@ -1,24 +1,38 @@
 import argparse
 import json
+from functools import lru_cache
 from operator import add
 import os
 from pathlib import Path
 import sys
 import time
-from typing import Annotated, Any, Dict, List, TypedDict
+from typing import TYPE_CHECKING, Annotated, Any, Dict, List, TypedDict
 
 from langchain.messages import AnyMessage
 from langgraph.graph import StateGraph
-from pyswip import Prolog
 
+from utils.run_store import get_run_store, json_export_enabled
+from utils.serialization import write_artifact
 from utils.utils import create_logger
 
+if TYPE_CHECKING:
+    from pyswip import Prolog
+
 
 _logger = create_logger("heuristic_analyzer")
 
 # Setup paths
 CURRENT_DIR = Path(__file__).parent
 RULES_FILE = CURRENT_DIR / "rules.pl"
+# Facts asserted for each run (see node_generate_prolog_facts), as name/arity
+FACT_PREDICATES = (
+    "domain/2",
+    "subdomain/3",
+    "risk/5",
+    "causality_entity/4",
+    "causality_intent/4",
+    "causality_timing/4",
+)
 HEURISTIC_DIR = Path(__file__).parent.parent.parent / "files" / "analysis" / "heuristic"
 
 
@@ -40,6 +54,45 @@ class HeuristicAnalysisState(TypedDict, total=False):
 # ================================
 # Utility functions
 # ================================
+@lru_cache(maxsize=1)
+def load_prolog_rules():
+    """
+    Start SWI-Prolog and consult the rules file, once per process.
+
+    Long-running workers call this at startup so that runs reuse the loaded
+    rules; the per-run facts are cleared by ``_reset_prolog_facts``.
+
+    Returns:
+        Prolog: The Prolog engine with the rules loaded.
+    """
+    if not RULES_FILE.exists():
+        raise FileNotFoundError(f"Rules file not found: {RULES_FILE}")
+
+    # Imported here: loading pyswip starts the SWI-Prolog runtime
+    from pyswip import Prolog
+
+    prolog = Prolog()
+    prolog.consult(str(RULES_FILE))
+    return prolog
+
+
+def _reset_prolog_facts(prolog) -> None:
+    """
+    Retract the facts asserted by a previous run in this process.
+
+    Only the fact predicates asserted by ``node_initialize_prolog`` are
+    cleared: the other dynamic predicates of rules.pl are rules, consulted
+    once per process, and must survive between runs.
+
+    Args:
+        prolog (Prolog): The Prolog engine.
+    """
+    for predicate in FACT_PREDICATES:
+        name, arity = predicate.split("/")
+        args = ", ".join(["_"] * int(arity))
+        list(prolog.query(f"retractall({name}({args}))"))
+
+
 def _escape_prolog_string(s: str) -> str:
     """
     Escapes special characters in a string for Prolog.
@@ -135,6 +188,14 @@ def node_load(state: HeuristicAnalysisState) -> HeuristicAnalysisState:
     state["messages"] = []
     state["errors"] = []
 
+    # Fall back to the run store when only the run_id is provided
+    run_id = (state.get("metadata") or {}).get("run_id")
+    if state.get("analysis") is None and run_id:
+        stored = get_run_store().load_stage(run_id, "causality")
+        if stored:
+            state["metadata"] = {**stored.get("metadata", {}), **state["metadata"]}
+            state["analysis"] = stored.get("analysis")
+
     if state.get("analysis") is None:
         err = "No analysis data present in initial state"
         _logger.error(err)
@@ -269,11 +330,8 @@ def node_initialize_prolog(state: HeuristicAnalysisState) -> HeuristicAnalysisSt
         HeuristicAnalysisState: The updated state after initializing Prolog.
     """
     try:
-        if not RULES_FILE.exists():
-            raise FileNotFoundError(f"Rules file not found: {RULES_FILE}")
-
-        prolog = Prolog()
-        prolog.consult(str(RULES_FILE))
+        prolog = load_prolog_rules()
+        _reset_prolog_facts(prolog)
 
         facts = state.get("prolog_facts", [])
         for fact in facts:
@@ -363,7 +421,7 @@ def node_execute_heuristic_analysis(
     return state
 
 
-def _run_executive_summary(prolog: Prolog) -> Dict[str, Any]:
+def _run_executive_summary(prolog: "Prolog") -> Dict[str, Any]:
     """
     Run executive summary queries.
 
@@ -462,7 +520,7 @@ def _run_executive_summary(prolog: Prolog) -> Dict[str, Any]:
     return results
 
 
-def _run_basic_counting_analysis(prolog: Prolog) -> Dict[str, Any]:
+def _run_basic_counting_analysis(prolog: "Prolog") -> Dict[str, Any]:
     """
     Runs basic counting analysis queries.
 
@@ -539,7 +597,7 @@ def _run_basic_counting_analysis(prolog: Prolog) -> Dict[str, Any]:
     return results
 
 
-def _run_pattern_analysis(prolog: Prolog) -> Dict[str, Any]:
+def _run_pattern_analysis(prolog: "Prolog") -> Dict[str, Any]:
     """
     Runs analysis of critical patterns and combinations.
 
@@ -859,7 +917,7 @@ def _run_pattern_analysis(prolog: Prolog) -> Dict[str, Any]:
     return results
 
 
-def _run_context_analysis(prolog: Prolog) -> Dict[str, Any]:
+def _run_context_analysis(prolog: "Prolog") -> Dict[str, Any]:
     """
     Runs analysis of context and comparison queries.
 
@@ -935,8 +993,6 @@ def node_save(state: HeuristicAnalysisState) -> HeuristicAnalysisState:
         HeuristicAnalysisState: The updated state after saving output.
     """
     try:
-        os.makedirs(HEURISTIC_DIR, exist_ok=True)
-
         ts = time.strftime("%Y%m%d_%H%M%S")
         run_id = (state.get("metadata") or {}).get("run_id")
         if not run_id:
@@ -962,13 +1018,17 @@ def node_save(state: HeuristicAnalysisState) -> HeuristicAnalysisState:
             "heuristic": state.get("heuristic"),
         }
 
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+        get_run_store().save_stage(run_id, "heuristic", payload)
+        exported = json_export_enabled()
+        if exported:
+            os.makedirs(HEURISTIC_DIR, exist_ok=True)
+            write_artifact(path, payload)
 
         _logger.info(
             "Heuristic analysis saved",
             step="save",
-            output_path=str(path),
+            run_id=run_id,
+            output_path=str(path) if exported else None,
             total_risks=state.get("heuristic", {})
             .get("counting", {})
             .get("total_risks"),
@@ -1018,13 +1078,13 @@ def create_heuristic_analyzer_graph():
 # Standalone execution
 # ================================
 if __name__ == "__main__":
-
     parser = argparse.ArgumentParser(
         description="Generate heuristic analysis from causality analysis file"
     )
     parser.add_argument(
         "filename",
-        help="Causality analysis JSON file name (without path) or absolute path",
+        help="Causality analysis JSON file name (without path), absolute path, "
+        "or a run_id in the run store",
     )
     args = parser.parse_args()
 
@@ -1038,20 +1098,25 @@ if __name__ == "__main__":
         causality_dir = repo_root / "files" / "analysis" / "causality"
         input_file = causality_dir / filename
 
-    if not input_file.exists():
-        _logger.error(
-            f"Input file not found: {input_file}",
-            step="standalone",
-        )
-        sys.exit(2)
+    if input_file.exists():
+        data = None
+    else:
+        data = get_run_store().load_stage(filename, "causality")
+        if data is None:
+            _logger.error(
+                f"Input file or run not found: {input_file}",
+                step="standalone",
+            )
+            sys.exit(2)
 
     # Load causality analysis file
     try:
-        with open(input_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if data is None:
+            with open(input_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
 
         _logger.info(
-            "Causality analysis file loaded",
+            "Causality analysis loaded",
             step="standalone",
             input_file=str(input_file),
         )
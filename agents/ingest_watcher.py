@@ -0,0 +1,439 @@
+"""
+Watch-folder ingestion for answers files.
+
+Watches ``files/inbox/`` for new or changed ``answers_*.json`` files. It uses
+inotify through ``watchdog`` when that package is installed and falls back to
+polling otherwise. A file is enqueued only after its size and modification time
+have been stable for a settle period and it parses as JSON, so partially
+written files are never picked up. Each enqueued file runs the pipeline on the
+bounded process pool of the background job queue.
+
+The inbox is kept apart from ``files/answers/``, where the questionnaire UI
+saves the answers it submits itself; watching that folder would run the
+pipeline a second time for every UI submission.
+
+Queue depth and lag metrics are logged and written to
+``files/jobs/ingest_metrics.json``.
+
+Usage:
+    python -m agents.ingest_watcher --workers 4
+    python -m agents.ingest_watcher --polling --settle 5
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+from agents.job_queue import (
+    JOBS_DB,
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+    JobQueue,
+)
+from utils.serialization import write_artifact
+from utils.utils import create_logger
+
+try:  # watchdog is optional: inotify events when installed, polling otherwise
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - depends on the environment
+    FileSystemEventHandler = object
+    Observer = None
+
+_logger = create_logger("ingest_watcher")
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+INBOX_DIR = PROJECT_ROOT / "files" / "inbox"
+METRICS_FILE = PROJECT_ROOT / "files" / "jobs" / "ingest_metrics.json"
+ANSWERS_PATTERN = "answers_*.json"
+
+_INGEST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested_files (
+    path TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    detected_at REAL NOT NULL,
+    enqueued_at REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class _Candidate:
+    """A file seen on disk that has not been enqueued yet."""
+
+    signature: Tuple[int, int]
+    changed_at: float
+    detected_at: float
+
+
+@dataclass
+class _Pending:
+    """A settled file waiting for, or running on, a worker."""
+
+    path: str
+    content_hash: str
+    detected_at: float
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Forward inotify events on answers files to the watcher."""
+
+    def __init__(self, watcher: "IngestWatcher"):
+        super().__init__()
+        self._watcher = watcher
+
+    def on_created(self, event) -> None:
+        if not event.is_directory:
+            self._watcher.notify(event.src_path)
+
+    def on_modified(self, event) -> None:
+        if not event.is_directory:
+            self._watcher.notify(event.src_path)
+
+    def on_closed(self, event) -> None:
+        if not event.is_directory:
+            self._watcher.notify(event.src_path)
+
+    def on_moved(self, event) -> None:
+        # Atomic writes show up as a move of a temporary file onto the target
+        if not event.is_directory:
+            self._watcher.notify(event.dest_path)
+
+
+class IngestWatcher:
+    """
+    Turn answers files dropped into a folder into background pipeline runs.
+
+    Args:
+        watch_dir (Path, optional): Folder to watch. Defaults to ``files/inbox``.
+        workers (int, optional): Size of the worker pool. Defaults to 2.
+        max_in_flight (int, optional): Jobs handed to the pool at once; the
+            rest wait in the backlog. Defaults to twice the number of workers.
+        settle (float, optional): Seconds a file must stay unchanged before it
+            is enqueued. Defaults to 2.
+        poll_interval (float, optional): Seconds between two ticks. Defaults to 1.
+        rescan_interval (float, optional): Seconds between full rescans when
+            inotify is active, to catch missed events. Defaults to 60.
+        use_inotify (bool, optional): Force inotify on/off. Defaults to using
+            it when ``watchdog`` is installed.
+        db_path (Path, optional): Job database, also holding the ingested files.
+    """
+
+    def __init__(
+        self,
+        watch_dir: Path = INBOX_DIR,
+        workers: int = 2,
+        max_in_flight: Optional[int] = None,
+        settle: float = 2.0,
+        poll_interval: float = 1.0,
+        rescan_interval: float = 60.0,
+        use_inotify: Optional[bool] = None,
+        db_path: Path = JOBS_DB,
+    ):
+        self.watch_dir = Path(watch_dir)
+        self.workers = workers
+        self.max_in_flight = max_in_flight or 2 * workers
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self.rescan_interval = rescan_interval
+        self.use_inotify = Observer is not None if use_inotify is None else use_inotify
+        if self.use_inotify and Observer is None:
+            raise RuntimeError("inotify mode requires the watchdog package")
+        self.db_path = Path(db_path)
+
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+        self._candidates: Dict[str, _Candidate] = {}
+        self._known: Dict[str, Tuple[int, int]] = {}
+        self._backlog: Deque[_Pending] = deque()
+        self._in_flight: Dict[str, _Pending] = {}
+        self._counters = {"enqueued": 0, "completed": 0, "failed": 0, "skipped": 0}
+        self._last_latency: Optional[float] = None
+        self._last_rescan = 0.0
+        self._stop = threading.Event()
+        self._observer = None
+        self._queue: Optional[JobQueue] = None
+
+        with self._connect() as conn:
+            conn.execute(_INGEST_SCHEMA)
+
+    # ================================
+    # Persistence
+    # ================================
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a committed-on-exit connection to the job database."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _ingested_hash(self, path: str) -> Optional[str]:
+        """Return the content hash last enqueued for a file, if any."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT content_hash FROM ingested_files WHERE path = ?", (path,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _record_ingested(self, pending: _Pending, job_id: str) -> None:
+        """Remember that this version of the file has been enqueued."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ingested_files "
+                "(path, content_hash, job_id, detected_at, enqueued_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    pending.path,
+                    pending.content_hash,
+                    job_id,
+                    pending.detected_at,
+                    time.time(),
+                ),
+            )
+
+    # ================================
+    # Detection
+    # ================================
+    def notify(self, path: str) -> None:
+        """
+        Record a filesystem event (called from the watchdog thread).
+
+        Args:
+            path (str): Path of the created, modified or moved file.
+        """
+        if fnmatch.fnmatch(Path(path).name, ANSWERS_PATTERN):
+            with self._lock:
+                self._touched[str(Path(path).resolve())] = time.time()
+
+    def _rescan(self, now: float) -> None:
+        """Mark every answers file whose size or mtime changed as touched."""
+        with self._lock:
+            for path in self.watch_dir.glob(ANSWERS_PATTERN):
+                key = str(path.resolve())
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if self._known.get(key) != (stat.st_mtime_ns, stat.st_size):
+                    self._touched.setdefault(key, now)
+        self._last_rescan = now
+
+    def _settle_candidates(self, now: float) -> None:
+        """Move files that stopped changing and hold valid JSON to the backlog."""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        for path, seen_at in touched.items():
+            if path not in self._candidates:
+                self._candidates[path] = _Candidate((-1, -1), seen_at, seen_at)
+
+        for path, candidate in list(self._candidates.items()):
+            try:
+                stat = Path(path).stat()
+            except FileNotFoundError:
+                del self._candidates[path]
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature != candidate.signature:
+                candidate.signature = signature
+                candidate.changed_at = now
+                continue
+            if now - candidate.changed_at < self.settle:
+                continue
+
+            del self._candidates[path]
+            if self._known.get(path) == signature:
+                continue
+            try:
+                data = Path(path).read_bytes()
+            except OSError as e:
+                # Deleted or renamed since the stat: a new event brings it back
+                _logger.warning("Answers file not readable", path=path, error=str(e))
+                continue
+            self._known[path] = signature
+            try:
+                json.loads(data)
+            except ValueError as e:
+                # Left alone until the file changes again
+                _logger.warning(
+                    "Skipping invalid answers file", path=path, error=str(e)
+                )
+                self._counters["skipped"] += 1
+                continue
+            digest = hashlib.sha256(data).hexdigest()
+            if digest == self._ingested_hash(path):
+                continue
+            self._backlog.append(_Pending(path, digest, candidate.detected_at))
+
+    # ================================
+    # Dispatch
+    # ================================
+    def _reap(self, now: float) -> None:
+        """Drop finished jobs from the in-flight set and update the counters."""
+        for job_id, pending in list(self._in_flight.items()):
+            job = self._queue.get(job_id)
+            status = job["status"] if job else STATUS_FAILED
+            if status not in (STATUS_COMPLETED, STATUS_FAILED):
+                continue
+            del self._in_flight[job_id]
+            self._last_latency = now - pending.detected_at
+            if status == STATUS_COMPLETED:
+                self._counters["completed"] += 1
+                _logger.info("Ingested answers file", path=pending.path, job_id=job_id)
+            else:
+                self._counters["failed"] += 1
+                _logger.error(
+                    "Ingestion job failed",
+                    path=pending.path,
+                    job_id=job_id,
+                    error=job.get("error") if job else "unknown job",
+                )
+
+    def _dispatch(self) -> None:
+        """Hand backlog entries to the pool while it has room."""
+        while self._backlog and len(self._in_flight) < self.max_in_flight:
+            pending = self._backlog.popleft()
+            job_id = self._queue.submit(pending.path)
+            self._record_ingested(pending, job_id)
+            self._in_flight[job_id] = pending
+            self._counters["enqueued"] += 1
+
+    def tick(self) -> None:
+        """Run one detection/dispatch cycle."""
+        now = time.time()
+        if not self.use_inotify or now - self._last_rescan >= self.rescan_interval:
+            self._rescan(now)
+        self._settle_candidates(now)
+        self._reap(now)
+        self._dispatch()
+
+    # ================================
+    # Metrics
+    # ================================
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Return the current queue depth and lag figures.
+
+        Returns:
+            Dict[str, Any]: Files settling, waiting and running, counters, the
+                age of the oldest unfinished file (``lag_seconds``) and the
+                detect-to-done time of the last finished one.
+        """
+        now = time.time()
+        unfinished = [p.detected_at for p in self._backlog]
+        unfinished += [p.detected_at for p in self._in_flight.values()]
+        return {
+            "mode": "inotify" if self.use_inotify else "polling",
+            "settling": len(self._candidates),
+            "queue_depth": len(self._backlog),
+            "in_flight": len(self._in_flight),
+            "max_in_flight": self.max_in_flight,
+            "lag_seconds": round(now - min(unfinished), 2) if unfinished else 0.0,
+            "last_latency_seconds": (
+                round(self._last_latency, 2) if self._last_latency is not None else None
+            ),
+            **self._counters,
+            "updated_at": now,
+        }
+
+    # ================================
+    # Lifecycle
+    # ================================
+    def start(self) -> None:
+        """Start the worker pool and, in inotify mode, the watchdog observer."""
+        self.watch_dir.mkdir(parents=True, exist_ok=True)
+        self._queue = JobQueue(self.db_path, max_workers=self.workers)
+        if self.use_inotify:
+            self._observer = Observer()
+            self._observer.schedule(_EventHandler(self), str(self.watch_dir))
+            self._observer.start()
+        _logger.info(
+            "Watching for answers files",
+            folder=str(self.watch_dir),
+            mode="inotify" if self.use_inotify else "polling",
+            workers=self.workers,
+        )
+
+    def stop(self) -> None:
+        """Stop watching and wait for the running jobs to finish."""
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+        if self._queue is not None:
+            self._queue.shutdown()
+
+    def run_forever(self, metrics_interval: float = 10.0) -> None:
+        """
+        Tick until ``stop`` is called, publishing metrics periodically.
+
+        Args:
+            metrics_interval (float, optional): Seconds between two metrics
+                snapshots. Defaults to 10.
+        """
+        last_metrics = 0.0
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                # One bad file or a transient database error must not stop the daemon
+                _logger.error("Ingestion tick failed", error=str(e), exc_info=True)
+            if time.time() - last_metrics >= metrics_interval:
+                snapshot = self.metrics()
+                write_artifact(METRICS_FILE, snapshot)
+                _logger.info("Ingestion metrics", **snapshot)
+                last_metrics = time.time()
+            self._stop.wait(self.poll_interval)
+
+
+# ================================
+# Standalone execution
+# ================================
+def _standaloneExecution():
+    """Watch the inbox folder until interrupted."""
+    parser = argparse.ArgumentParser(description="AREA answers folder ingestion")
+    parser.add_argument("--folder", default=str(INBOX_DIR), help="Folder to watch")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes")
+    parser.add_argument(
+        "--max-in-flight", type=int, help="Jobs handed to the pool at once"
+    )
+    parser.add_argument(
+        "--settle", type=float, default=2.0, help="Seconds a file must stay unchanged"
+    )
+    parser.add_argument(
+        "--polling", action="store_true", help="Poll instead of using inotify"
+    )
+    args = parser.parse_args()
+
+    watcher = IngestWatcher(
+        Path(args.folder),
+        workers=args.workers,
+        max_in_flight=args.max_in_flight,
+        settle=args.settle,
+        use_inotify=False if args.polling else None,
+    )
+    watcher.start()
+    try:
+        watcher.run_forever()
+    except KeyboardInterrupt:
+        _logger.info("Stopping ingestion")
+    finally:
+        watcher.stop()
+
+
+if __name__ == "__main__":
+    _standaloneExecution()
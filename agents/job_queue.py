@@ -0,0 +1,290 @@
+"""
+Local background job queue for the risk analysis pipeline.
+
+Jobs are recorded in a SQLite table and executed by a process pool, so the
+Streamlit script thread only submits work and polls for its progress.
+"""
+
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+JOBS_DB = PROJECT_ROOT / "files" / "jobs" / "jobs.sqlite"
+
+# Pipeline steps, in execution order, as reported by the orchestrator
+PIPELINE_STEPS = ["domain", "causality", "heuristic", "report"]
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    input_file TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stage TEXT,
+    stages_done INTEGER NOT NULL DEFAULT 0,
+    progress TEXT,
+    html_path TEXT,
+    error TEXT,
+    owner_host TEXT,
+    owner_pid INTEGER,
+    owner_boot TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+# Columns added after the first release of the table
+_MIGRATIONS = {
+    "progress": "TEXT",
+    "owner_host": "TEXT",
+    "owner_pid": "INTEGER",
+    "owner_boot": "TEXT",
+}
+
+
+def _boot_id() -> str:
+    """Return an identifier of the current boot of the machine ("" if unknown)."""
+    try:
+        return Path("/proc/sys/kernel/random/boot_id").read_text().strip()
+    except OSError:
+        return ""
+
+
+def _owner_alive(host: Optional[str], pid: Optional[int], boot: Optional[str]) -> bool:
+    """
+    Tell whether the process that submitted a job may still be running.
+
+    Processes on another host cannot be checked and are assumed alive.
+
+    Args:
+        host (str, optional): Hostname of the submitting process.
+        pid (int, optional): Its process id.
+        boot (str, optional): Boot identifier of its machine.
+
+    Returns:
+        bool: False only if the owner is known to be gone.
+    """
+    if host != socket.gethostname():
+        return True
+    if boot and boot != _boot_id():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+@contextmanager
+def _connect(db_path: Path) -> Iterator[sqlite3.Connection]:
+    """
+    Open a connection to the job table, creating it if needed.
+
+    The transaction is committed and the connection closed on exit.
+
+    Args:
+        db_path (Path): Path to the SQLite database.
+
+    Yields:
+        sqlite3.Connection: An open connection with row access by name.
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    try:
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for name, column_type in _MIGRATIONS.items():
+            if name not in columns:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {column_type}")
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _update_job(db_path: Path, job_id: str, **fields: Any) -> None:
+    """
+    Update the given columns of a job row.
+
+    Args:
+        db_path (Path): Path to the SQLite database.
+        job_id (str): The job identifier.
+        **fields: Column values to set.
+    """
+    fields["updated_at"] = time.time()
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    with _connect(db_path) as conn:
+        conn.execute(
+            f"UPDATE jobs SET {assignments} WHERE job_id = ?",
+            [*fields.values(), job_id],
+        )
+
+
+def _run_job(db_path: str, job_id: str, input_file: str) -> None:
+    """
+    Execute the pipeline for a job inside a worker process.
+
+    Args:
+        db_path (str): Path to the SQLite database.
+        job_id (str): The job identifier.
+        input_file (str): Path to the answers JSON file.
+    """
+    db_path = Path(db_path)
+    _update_job(db_path, job_id, status=STATUS_RUNNING, stage=PIPELINE_STEPS[0])
+    try:
+        # Imported here so the heavy pipeline modules load only in workers
+        from agents import orchestrator
+
+        done = []
+
+        def on_event(progress) -> None:
+            if progress.kind == "stage_finished":
+                done.append(progress.stage)
+            _update_job(
+                db_path,
+                job_id,
+                stage=progress.stage,
+                stages_done=len(done),
+                progress=json.dumps(progress.to_dict()),
+            )
+
+        final_state = orchestrator.run_orchestrator(input_file, on_event=on_event)
+        html_path = final_state["context"].html_path
+        _update_job(db_path, job_id, status=STATUS_COMPLETED, html_path=html_path)
+    except Exception as e:
+        _update_job(db_path, job_id, status=STATUS_FAILED, error=str(e))
+
+
+class JobQueue:
+    """Submits pipeline runs to a process pool and tracks them in SQLite."""
+
+    def __init__(self, db_path: Path = JOBS_DB, max_workers: int = 2):
+        self.db_path = Path(db_path)
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._fail_interrupted_jobs()
+
+    def _fail_interrupted_jobs(self) -> None:
+        """
+        Mark as failed the unfinished jobs whose submitting process is gone.
+
+        The table is shared by every process using the queue (UI sessions,
+        the watcher), so jobs owned by a live process are left untouched.
+        """
+        with _connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT job_id, owner_host, owner_pid, owner_boot FROM jobs "
+                "WHERE status IN (?, ?) AND owner_pid IS NOT NULL",
+                (STATUS_QUEUED, STATUS_RUNNING),
+            ).fetchall()
+            now = time.time()
+            conn.executemany(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? "
+                "WHERE job_id = ?",
+                [
+                    (
+                        STATUS_FAILED,
+                        "Interrupted by application restart",
+                        now,
+                        row["job_id"],
+                    )
+                    for row in rows
+                    if not _owner_alive(
+                        row["owner_host"], row["owner_pid"], row["owner_boot"]
+                    )
+                ],
+            )
+
+    def submit(self, input_file: str) -> str:
+        """
+        Enqueue a pipeline run for the given answers file.
+
+        Args:
+            input_file (str): Path to the answers JSON file.
+
+        Returns:
+            str: The identifier of the new job.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with _connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, input_file, status, owner_host, owner_pid, "
+                "owner_boot, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    str(input_file),
+                    STATUS_QUEUED,
+                    socket.gethostname(),
+                    os.getpid(),
+                    _boot_id(),
+                    now,
+                    now,
+                ),
+            )
+        future = self._executor.submit(
+            _run_job, str(self.db_path), job_id, str(input_file)
+        )
+        future.add_done_callback(lambda f: self._on_done(job_id, f))
+        return job_id
+
+    def _on_done(self, job_id: str, future) -> None:
+        """Record failures that happened outside the job body (e.g. a crashed worker)."""
+        exc = future.exception()
+        if exc is not None:
+            _update_job(self.db_path, job_id, status=STATUS_FAILED, error=str(exc))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the current record of a job.
+
+        Args:
+            job_id (str): The job identifier.
+
+        Returns:
+            Optional[Dict[str, Any]]: The job record, or None if unknown.
+        """
+        with _connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def list_jobs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Return the most recent jobs, newest first.
+
+        Args:
+            limit (int, optional): Maximum number of jobs. Defaults to 20.
+
+        Returns:
+            List[Dict[str, Any]]: The job records.
+        """
+        with _connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def shutdown(self) -> None:
+        """Stop accepting jobs and wait for running ones to finish."""
+        self._executor.shutdown(wait=True)
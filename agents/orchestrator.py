@@ -1,36 +1,135 @@
 import argparse
+import json
 import os
+import sqlite3
 import sys
-from typing import TypedDict, Dict, Any
+import time
+from dataclasses import asdict, dataclass, field, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, TypedDict
 
-from langgraph.graph import StateGraph, END
+from utils.run_store import content_hash, content_run_enabled, get_run_store
+from utils.utils import CONSOLE, create_logger
 
-from agents.causality_analyzer.causality_risk_analyzer_agent import (
-    create_causality_analyzer_graph,
-)
-from agents.domain_analyzer.domain_risk_analyzer_agent import (
-    create_domain_analyzer_graph,
-)
-from agents.heuristic_analyzer.heuristic_risk_analyzer_agent import (
-    create_heuristic_analyzer_graph,
-)
-from agents.report_generator.report_generator_agent import (
-    create_report_generator_graph,
-)
-from utils.utils import create_logger
+# The agents, LangGraph and the LLM SDKs are imported inside the functions
+# that use them, so `--help` and idle workers do not pay for loading them.
 
 
 _logger = create_logger("orchestrator")
 
+FILES_DIR = Path(__file__).parent.parent / "files"
+ANSWERS_DIR = FILES_DIR / "answers"
+# LangGraph checkpoints (used when langgraph-checkpoint-sqlite is installed)
+CHECKPOINT_DB = FILES_DIR / "checkpoints.sqlite"
+
+
+@dataclass(frozen=True)
+class RunContext:
+    """
+    Immutable context shared by the pipeline steps.
+
+    Each step reads the analysis, questionnaire and heuristic by reference
+    and returns a new context holding only its own changes (see ``evolve``),
+    so a run keeps a single copy of the analysis in memory.
+
+    Attributes:
+        metadata (Dict[str, Any]): Run metadata (run_id, language, ...).
+        questionnaire (Dict[str, Any]): The questionnaire answers.
+        analysis (Dict[str, Any]): The domain/causality analysis.
+        heuristic (Dict[str, Any]): The heuristic results.
+        html_path (Optional[str]): Path to the generated HTML report.
+    """
+
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    questionnaire: Dict[str, Any] = field(default_factory=dict)
+    analysis: Dict[str, Any] = field(default_factory=dict)
+    heuristic: Dict[str, Any] = field(default_factory=dict)
+    html_path: Optional[str] = None
+
+    def evolve(self, **delta: Any) -> "RunContext":
+        """Return a new context with the given fields replaced."""
+        return replace(self, **delta)
+
 
 class OrchestratorState(TypedDict, total=False):
     """State structure for the orchestrator graph."""
 
     input_file: str
-    domain_state: Dict[str, Any]
-    causality_state: Dict[str, Any]
-    heuristic_state: Dict[str, Any]
-    report_state: Dict[str, Any]
+    context: RunContext
+    resume_from: Optional[str]
+
+
+@lru_cache(maxsize=None)
+def _compiled(factory: Callable[[], Any]) -> Any:
+    """
+    Compile a graph once per process; compiled graphs are reusable across runs.
+
+    Args:
+        factory (Callable[[], Any]): A graph factory taking no arguments.
+
+    Returns:
+        Any: The compiled graph.
+    """
+    return factory()
+
+
+def warm_up(llm_sdk: bool = True) -> None:
+    """
+    Import the agents and compile the reusable graphs ahead of the first run.
+
+    Used by long-running workers (see ``agents.worker_daemon``) so that runs
+    pay no import or compilation cost.
+
+    Args:
+        llm_sdk (bool, optional): Also import the LLM SDK. A process that forks
+            workers afterwards should pass False and let each worker import it,
+            so that no SDK (gRPC) state is shared across the fork. Defaults to True.
+    """
+    if llm_sdk:
+        import langchain_google_genai
+
+    # The domain agent is only imported: its graph depends on the input file
+    import agents.domain_analyzer.domain_risk_analyzer_agent
+
+    from agents.causality_analyzer.causality_risk_analyzer_agent import (
+        create_causality_analyzer_graph,
+    )
+    from agents.heuristic_analyzer.heuristic_risk_analyzer_agent import (
+        create_heuristic_analyzer_graph,
+    )
+    from agents.report_generator.report_generator_agent import (
+        create_report_generator_graph,
+    )
+
+    for factory in (
+        create_causality_analyzer_graph,
+        create_heuristic_analyzer_graph,
+        create_report_generator_graph,
+        build_orchestrator_graph,
+    ):
+        _compiled(factory)
+
+
+def _run_subgraph(graph, sub_state: Dict[str, Any], label: str) -> Dict[str, Any]:
+    """
+    Invoke a sub-graph and raise if it reported errors.
+
+    Args:
+        graph: The compiled sub-graph.
+        sub_state (Dict[str, Any]): The sub-graph input state.
+        label (str): Step label used in the error message.
+
+    Returns:
+        Dict[str, Any]: The sub-graph final state.
+
+    Raises:
+        Exception: If the sub-graph reported errors.
+    """
+    result = graph.invoke(sub_state)
+    if result.get("errors"):
+        raise Exception(f"{label} failed: {result['errors']}")
+    return result
 
 
 def domain_step(state: OrchestratorState) -> OrchestratorState:
@@ -41,17 +140,36 @@ def domain_step(state: OrchestratorState) -> OrchestratorState:
         state (OrchestratorState): The current state of the orchestrator.
 
     Returns:
-        OrchestratorState: The updated state after domain analysis.
+        OrchestratorState: The updated run context after domain analysis.
     """
+    from agents.domain_analyzer.domain_risk_analyzer_agent import (
+        create_domain_analyzer_graph,
+    )
+
     _logger.info(
         "Domain analysis start", step="orchestrator", input_file=state["input_file"]
     )
+    context = state["context"]
+
+    # A resumed run carries its stored questionnaire: the file is not read again
     graph = create_domain_analyzer_graph(state["input_file"])
-    result = graph.invoke(state["domain_state"])
-    if result.get("errors"):
-        raise Exception(f"Domain analysis failed: {result['errors']}")
-    state["domain_state"] = result
-    return state
+    result = _run_subgraph(
+        graph,
+        {
+            "metadata": dict(context.metadata),
+            "questionnaire": context.questionnaire,
+            "analysis": {},
+            "messages": [],
+            "errors": [],
+        },
+        "Domain analysis",
+    )
+    context = context.evolve(
+        metadata=result.get("metadata", {}),
+        questionnaire=result.get("questionnaire", {}),
+        analysis=result.get("analysis", {}),
+    )
+    return {"context": context}
 
 
 def causality_step(state: OrchestratorState) -> OrchestratorState:
@@ -62,22 +180,31 @@ def causality_step(state: OrchestratorState) -> OrchestratorState:
         state (OrchestratorState): The current state of the orchestrator.
 
     Returns:
-        OrchestratorState: The updated state after causality analysis.
+        OrchestratorState: The updated run context after causality analysis.
     """
+    from agents.causality_analyzer.causality_risk_analyzer_agent import (
+        create_causality_analyzer_graph,
+    )
+
     _logger.info("Causality analysis start", step="orchestrator")
-    graph = create_causality_analyzer_graph()
-    causality_state = {
-        "metadata": state["domain_state"].get("metadata", {}),
-        "questionnaire": state["domain_state"].get("questionnaire", {}),
-        "analysis": state["domain_state"].get("analysis", {}),
-        "messages": [],
-        "errors": [],
-    }
-    result = graph.invoke(causality_state)
-    if result.get("errors"):
-        raise Exception(f"Causality analysis failed: {result['errors']}")
-    state["causality_state"] = result
-    return state
+    context = state["context"]
+    graph = _compiled(create_causality_analyzer_graph)
+    result = _run_subgraph(
+        graph,
+        {
+            "metadata": dict(context.metadata),
+            "questionnaire": context.questionnaire,
+            "analysis": context.analysis,
+            "messages": [],
+            "errors": [],
+        },
+        "Causality analysis",
+    )
+    context = context.evolve(
+        metadata=result.get("metadata", {}),
+        analysis=result.get("analysis", {}),
+    )
+    return {"context": context}
 
 
 def heuristic_step(state: OrchestratorState) -> OrchestratorState:
@@ -88,24 +215,33 @@ def heuristic_step(state: OrchestratorState) -> OrchestratorState:
         state (OrchestratorState): The current state of the orchestrator.
 
     Returns:
-        OrchestratorState: The updated state after heuristic analysis.
+        OrchestratorState: The updated run context after heuristic analysis.
     """
+    from agents.heuristic_analyzer.heuristic_risk_analyzer_agent import (
+        create_heuristic_analyzer_graph,
+    )
+
     _logger.info("Heuristic analysis start", step="orchestrator")
-    graph = create_heuristic_analyzer_graph()
-    heuristic_state = {
-        "metadata": state["causality_state"].get("metadata", {}),
-        "analysis": state["causality_state"].get("analysis", {}),
-        "heuristic": {},
-        "prolog_facts": [],
-        "prolog": None,
-        "messages": [],
-        "errors": [],
-    }
-    result = graph.invoke(heuristic_state)
-    if result.get("errors"):
-        raise Exception(f"Heuristic analysis failed: {result['errors']}")
-    state["heuristic_state"] = result
-    return state
+    context = state["context"]
+    graph = _compiled(create_heuristic_analyzer_graph)
+    result = _run_subgraph(
+        graph,
+        {
+            "metadata": dict(context.metadata),
+            "analysis": context.analysis,
+            "heuristic": {},
+            "prolog_facts": [],
+            "prolog": None,
+            "messages": [],
+            "errors": [],
+        },
+        "Heuristic analysis",
+    )
+    context = context.evolve(
+        metadata=result.get("metadata", {}),
+        heuristic=result.get("heuristic", {}),
+    )
+    return {"context": context}
 
 
 def report_step(state: OrchestratorState) -> OrchestratorState:
@@ -116,34 +252,62 @@ def report_step(state: OrchestratorState) -> OrchestratorState:
         state (OrchestratorState): The current state of the orchestrator.
 
     Returns:
-        OrchestratorState: The updated state after report generation.
+        OrchestratorState: The updated run context after report generation.
     """
+    from agents.report_generator.report_generator_agent import (
+        create_report_generator_graph,
+    )
+
     _logger.info("Report generation start", step="orchestrator")
-    graph = create_report_generator_graph()
-    report_state = {
-        "metadata": state["heuristic_state"].get("metadata", {}),
-        "analysis": state["heuristic_state"].get("analysis", {}),
-        "heuristic": state["heuristic_state"].get("heuristic", {}),
-        "questionnaire": state["causality_state"].get("questionnaire", {}),
-        "visualizations": {},
-        "html_path": "",
-        "messages": [],
-        "errors": [],
-    }
-    result = graph.invoke(report_state)
-    if result.get("errors"):
-        raise Exception(f"Report generation failed: {result['errors']}")
-    state["report_state"] = result
-    return state
+    context = state["context"]
+    graph = _compiled(create_report_generator_graph)
+    result = _run_subgraph(
+        graph,
+        {
+            "metadata": dict(context.metadata),
+            "analysis": context.analysis,
+            "heuristic": context.heuristic,
+            "questionnaire": context.questionnaire,
+            "visualizations": {},
+            "html_path": "",
+            "messages": [],
+            "errors": [],
+        },
+        "Report generation",
+    )
+    context = context.evolve(
+        metadata=result.get("metadata", {}),
+        html_path=result.get("html_path"),
+    )
+    return {"context": context}
+
+
+def _route_entry(state: OrchestratorState) -> str:
+    """
+    Pick the first step to run (the first incomplete one when resuming).
 
+    Args:
+        state (OrchestratorState): The initial orchestrator state.
 
-def build_orchestrator_graph():
+    Returns:
+        str: The name of the entry step.
+    """
+    return state.get("resume_from") or "domain"
+
+
+def build_orchestrator_graph(checkpointer=None):
     """
     Build the orchestrator graph connecting all analysis steps.
 
+    Args:
+        checkpointer (optional): LangGraph checkpointer saving the state after
+            every step (see ``_sqlite_checkpointer``).
+
     Returns:
         StateGraph: The compiled orchestrator graph.
     """
+    from langgraph.graph import END, StateGraph
+
     graph = StateGraph(OrchestratorState)
     graph.add_node("domain", domain_step)
     graph.add_node("causality", causality_step)
@@ -153,52 +317,430 @@ def build_orchestrator_graph():
     graph.add_edge("causality", "heuristic")
     graph.add_edge("heuristic", "report")
     graph.add_edge("report", END)
-    graph.set_entry_point("domain")
-    return graph.compile()
+    graph.set_conditional_entry_point(
+        _route_entry, {step: step for step in PIPELINE_STEPS}
+    )
+    return graph.compile(checkpointer=checkpointer)
 
 
-def run_orchestrator(input_file: str):
+def _sqlite_checkpointer():
     """
-    Run the orchestrator pipeline on the given input file.
+    Return a SQLite checkpointer, if langgraph-checkpoint-sqlite is installed.
+
+    Returns:
+        Optional[SqliteSaver]: The checkpointer, or None if unavailable.
+    """
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError:
+        _logger.warning(
+            "langgraph-checkpoint-sqlite not installed; checkpointing disabled",
+            step="orchestrator",
+        )
+        return None
+    CHECKPOINT_DB.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(CHECKPOINT_DB), check_same_thread=False)
+    return SqliteSaver(conn)
+
+
+def _peek_run_id(input_file: str) -> Optional[str]:
+    """
+    Read the run_id from the metadata of an answers file, if present.
 
     Args:
         input_file (str): Path to the questionnaire JSON file.
 
     Returns:
-        Dict: The final orchestrator state (including report path).
+        Optional[str]: The run_id, or None.
+    """
+    try:
+        with open(input_file, "r", encoding="utf-8") as f:
+            return (json.load(f).get("metadata") or {}).get("run_id")
+    except (OSError, ValueError):
+        return None
 
-    Raises:
-        Exception: If any step fails.
+
+def _find_duplicate_run(input_file: str) -> Optional[str]:
     """
-    if not os.path.isfile(input_file):
-        _logger.error(
-            "Input file not found",
+    Find a stored run that analysed the same answers as the input file.
+
+    Args:
+        input_file (str): Path to the questionnaire JSON file.
+
+    Returns:
+        Optional[str]: The run_id of the duplicate run, or None.
+    """
+    try:
+        with open(input_file, "r", encoding="utf-8") as f:
+            questionnaire = json.load(f)
+    except (OSError, ValueError):
+        return None
+    run_id = get_run_store().find_run_by_content(content_hash(questionnaire))
+    if run_id:
+        _logger.info(
+            "Duplicate submission, reusing run",
             step="orchestrator",
             input_file=input_file,
+            run_id=run_id,
+        )
+    return run_id
+
+
+def _initial_state(input_file: str) -> OrchestratorState:
+    """
+    Build the initial orchestrator state for the given input file.
+
+    Args:
+        input_file (str): Path to the questionnaire JSON file.
+
+    Returns:
+        OrchestratorState: The initial state of the orchestrator graph.
+    """
+    return {"input_file": input_file, "context": RunContext()}
+
+
+def _resume_state(run_id: str, input_file: Optional[str] = None) -> OrchestratorState:
+    """
+    Rebuild the orchestrator state of a saved run from the run store.
+
+    The run restarts from the first stage that is missing, saved with errors,
+    or saved before the stage it depends on (i.e. invalidated by a rerun).
+    ``resume_from`` is None when every stage is complete.
+
+    Args:
+        run_id (str): The run to resume.
+        input_file (str, optional): Answers file, read only if the domain stage
+            must run again and the run store has no questionnaire for the run.
+            Defaults to ``files/answers/answers_{run_id}.json``.
+
+    Returns:
+        OrchestratorState: The state to resume from.
+
+    Raises:
+        ValueError: If the run is unknown.
+    """
+    store = get_run_store()
+    status = store.stage_status(run_id)
+    if not status:
+        raise ValueError(f"Unknown run_id: {run_id}")
+
+    resume_from, last_saved = None, 0.0
+    for step in PIPELINE_STEPS:
+        info = status.get(step)
+        html_report = (info or {}).get("html_report")
+        if (
+            not info
+            or info["has_errors"]
+            or info["saved_at"] < last_saved
+            or (step == "report" and not os.path.isfile(html_report))
+        ):
+            resume_from = step
+            break
+        last_saved = info["saved_at"]
+
+    done = (
+        PIPELINE_STEPS[: PIPELINE_STEPS.index(resume_from)]
+        if resume_from
+        else PIPELINE_STEPS
+    )
+    context = RunContext(
+        metadata={"run_id": run_id}, questionnaire=store.load_answers(run_id) or {}
+    )
+    analysed = [step for step in done if step != "report"]
+    if analysed:
+        payload = store.load_stage(run_id, analysed[-1]) or {}
+        context = context.evolve(
+            metadata=payload.get("metadata") or {},
+            analysis=payload.get("analysis") or {},
+            heuristic=payload.get("heuristic") or {},
+        )
+    if "report" in done:
+        report_meta = store.load_report_metadata(run_id) or {}
+        context = context.evolve(
+            metadata=report_meta, html_path=report_meta.get("html_report")
         )
-        raise FileNotFoundError(f"Input file not found: {input_file}")
 
-    state = {
-        "input_file": input_file,
-        "domain_state": {
-            "metadata": {},
-            "questionnaire": {},
-            "analysis": {},
-            "messages": [],
-            "errors": [],
-        },
-    }
-    orchestrator = build_orchestrator_graph()
-    final_state = orchestrator.invoke(state)
-    _logger.info("Orchestrator completed successfully", step="orchestrator")
     _logger.info(
-        "Report generation end",
+        "Resuming run",
         step="orchestrator",
-        html_report=final_state["report_state"].get("html_path"),
+        run_id=run_id,
+        resume_from=resume_from,
+        completed=done,
     )
+    return {
+        "input_file": input_file or os.path.join(ANSWERS_DIR, f"answers_{run_id}.json"),
+        "context": context,
+        "resume_from": resume_from,
+    }
+
+
+# Rough share of the total run time spent in each step, used for the ETA
+STAGE_WEIGHTS = {"domain": 0.4, "causality": 0.35, "heuristic": 0.05, "report": 0.2}
+PIPELINE_STEPS = list(STAGE_WEIGHTS)
+
+# Steps producing a per-subdomain analysis (reported as subdomain events)
+_SUBDOMAIN_STEPS = ("domain", "causality")
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """
+    A progress event emitted while the pipeline runs.
+
+    Attributes:
+        kind (str): "stage_started", "stage_finished", "subdomain_completed"
+            or "pipeline_finished".
+        stage (str): The pipeline step the event refers to.
+        elapsed (float): Seconds since the pipeline started.
+        eta (Optional[float]): Estimated seconds to completion, once known.
+        tokens (Dict[str, int]): Cumulative input/output/total LLM tokens.
+        run_id (Optional[str]): The run identifier, once assigned.
+        subdomain (Optional[str]): Subdomain id for "subdomain_completed" events.
+        risks (Optional[int]): Number of risks in the subdomain.
+        result (Optional[Dict[str, Any]]): Final state for "pipeline_finished".
+    """
+
+    kind: str
+    stage: str
+    elapsed: float
+    eta: Optional[float] = None
+    tokens: Dict[str, int] = field(default_factory=dict)
+    run_id: Optional[str] = None
+    subdomain: Optional[str] = None
+    risks: Optional[int] = None
+    result: Optional[Dict[str, Any]] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the event as a JSON-serializable dict (without the final state)."""
+        data = asdict(self)
+        data.pop("result")
+        return data
+
+
+def _token_totals(usage: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Sum the usage metadata of every model used so far.
+
+    Args:
+        usage (Dict[str, Dict[str, Any]]): Usage metadata keyed by model name.
+
+    Returns:
+        Dict[str, int]: Cumulative input, output and total tokens.
+    """
+    totals = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+    for model_usage in usage.values():
+        for key in totals:
+            totals[key] += model_usage.get(key, 0) or 0
+    return totals
+
+
+def stream_orchestrator(
+    input_file: Optional[str] = None,
+    resume_run_id: Optional[str] = None,
+    checkpoint: bool = False,
+    dedupe: Optional[bool] = None,
+) -> Iterator[ProgressEvent]:
+    """
+    Run the orchestrator pipeline, yielding progress events as it goes.
+
+    The last event has kind "pipeline_finished" and carries the final
+    orchestrator state in ``result``.
+
+    Args:
+        input_file (str, optional): Path to the questionnaire JSON file.
+            Required unless ``resume_run_id`` is given.
+        resume_run_id (str, optional): Resume this run from its first
+            incomplete stage instead of starting from scratch.
+        checkpoint (bool, optional): Save a LangGraph checkpoint after every
+            step (requires langgraph-checkpoint-sqlite). Defaults to False.
+        dedupe (bool, optional): Reuse the run that already analysed identical
+            answers (same responses, language and model), returning its
+            artifacts when complete. Defaults to the ``AREA_CONTENT_RUN_ID`` setting.
+
+    Yields:
+        ProgressEvent: Stage, subdomain and completion events.
+
+    Raises:
+        Exception: If any step fails.
+    """
+    from langchain_core.callbacks import get_usage_metadata_callback
+
+    if not resume_run_id:
+        if not input_file or not os.path.isfile(input_file):
+            _logger.error(
+                "Input file not found",
+                step="orchestrator",
+                input_file=input_file,
+            )
+            raise FileNotFoundError(f"Input file not found: {input_file}")
+        if content_run_enabled() if dedupe is None else dedupe:
+            # Identical answers: reuse (or finish) the run that analysed them
+            resume_run_id = _find_duplicate_run(input_file)
+    thread_id = resume_run_id or _peek_run_id(input_file)
+    if checkpoint and not thread_id:
+        _logger.warning(
+            "Checkpointing disabled: the answers file has no run_id",
+            step="orchestrator",
+            input_file=input_file,
+        )
+
+    # Checkpoints are keyed by run_id, so they need one known up front
+    checkpointer = (
+        _sqlite_checkpointer() if (checkpoint or resume_run_id) and thread_id else None
+    )
+    config = {"configurable": {"thread_id": thread_id}} if checkpointer else None
+    orchestrator = (
+        build_orchestrator_graph(checkpointer)
+        if checkpointer is not None
+        else _compiled(build_orchestrator_graph)
+    )
+
+    snapshot = orchestrator.get_state(config) if resume_run_id and config else None
+    if snapshot is not None and snapshot.next:
+        # Continue the checkpointed run from the step that failed
+        final_state = dict(snapshot.values)
+        final_state["resume_from"] = snapshot.next[0]
+        stream_input = None
+    elif resume_run_id:
+        final_state = _resume_state(resume_run_id, input_file)
+        stream_input = final_state
+    else:
+        final_state = _initial_state(input_file)
+        stream_input = final_state
+
+    first_step = final_state.get("resume_from", PIPELINE_STEPS[0])
+    skipped = (
+        PIPELINE_STEPS[: PIPELINE_STEPS.index(first_step)]
+        if first_step
+        else PIPELINE_STEPS
+    )
+    skipped_weight = sum(STAGE_WEIGHTS[step] for step in skipped)
+    started = time.monotonic()
+    done_weight = skipped_weight
+    run_id = final_state["context"].metadata.get("run_id") or resume_run_id
+
+    try:
+        with get_usage_metadata_callback() as usage:
+
+            def event(kind: str, stage: str, **extra: Any) -> ProgressEvent:
+                elapsed = time.monotonic() - started
+                ran = done_weight - skipped_weight
+                eta = elapsed * (1 - done_weight) / ran if ran else None
+                return ProgressEvent(
+                    kind=kind,
+                    stage=stage,
+                    elapsed=round(elapsed, 2),
+                    eta=round(eta, 2) if eta is not None else None,
+                    tokens=_token_totals(usage.usage_metadata),
+                    run_id=run_id,
+                    **extra,
+                )
+
+            if first_step is None:
+                _logger.info("Run already complete", step="orchestrator", run_id=run_id)
+                yield event("pipeline_finished", PIPELINE_STEPS[-1], result=final_state)
+                return
+
+            yield event("stage_started", first_step)
+            for update in orchestrator.stream(
+                stream_input, config=config, stream_mode="updates"
+            ):
+                for step_name, step_state in update.items():
+                    final_state.update(step_state or {})
+                    context = final_state["context"]
+                    done_weight += STAGE_WEIGHTS.get(step_name, 0.0)
+                    run_id = run_id or context.metadata.get("run_id")
+
+                    # The LLM steps analyse every subdomain in one call, so
+                    # subdomain completions are reported when the step returns.
+                    analysed = context.analysis if step_name in _SUBDOMAIN_STEPS else {}
+                    for subdomain, content in analysed.items():
+                        yield event(
+                            "subdomain_completed",
+                            step_name,
+                            subdomain=subdomain,
+                            risks=len(content.get("risks", [])),
+                        )
+                    yield event("stage_finished", step_name)
+
+                    next_idx = PIPELINE_STEPS.index(step_name) + 1
+                    if next_idx < len(PIPELINE_STEPS):
+                        yield event("stage_started", PIPELINE_STEPS[next_idx])
+
+            _logger.info("Orchestrator completed successfully", step="orchestrator")
+            _logger.info(
+                "Report generation end",
+                step="orchestrator",
+                html_report=final_state["context"].html_path,
+            )
+            yield event("pipeline_finished", PIPELINE_STEPS[-1], result=final_state)
+    finally:
+        if checkpointer is not None:
+            checkpointer.conn.close()
+
+
+def run_orchestrator(
+    input_file: Optional[str] = None,
+    on_step: Optional[Callable[[str], None]] = None,
+    on_event: Optional[Callable[[ProgressEvent], None]] = None,
+    resume_run_id: Optional[str] = None,
+    checkpoint: bool = False,
+    dedupe: Optional[bool] = None,
+):
+    """
+    Run the orchestrator pipeline on the given input file.
+
+    Args:
+        input_file (str, optional): Path to the questionnaire JSON file.
+            Required unless ``resume_run_id`` is given.
+        on_step (Callable[[str], None], optional): Called with the step name
+            ("domain", "causality", "heuristic", "report") each time a step completes.
+        on_event (Callable[[ProgressEvent], None], optional): Called with every
+            progress event (see ``stream_orchestrator``).
+        resume_run_id (str, optional): Resume this run from its first
+            incomplete stage.
+        checkpoint (bool, optional): Save a LangGraph checkpoint after every step.
+        dedupe (bool, optional): Reuse the run that already analysed identical
+            answers (see ``stream_orchestrator``).
+
+    Returns:
+        Dict: The final orchestrator state; its ``context`` holds the report path.
+
+    Raises:
+        Exception: If any step fails.
+    """
+    final_state = None
+    for progress in stream_orchestrator(input_file, resume_run_id, checkpoint, dedupe):
+        if on_event is not None:
+            on_event(progress)
+        if progress.kind == "stage_finished" and on_step is not None:
+            on_step(progress.stage)
+        if progress.kind == "pipeline_finished":
+            final_state = progress.result
     return final_state
 
 
+def _print_progress(progress: ProgressEvent) -> None:
+    """
+    Print a progress event on the console (used by ``--progress``).
+
+    Args:
+        progress (ProgressEvent): The event to print.
+    """
+    eta = f"{progress.eta:.0f}s" if progress.eta is not None else "n/a"
+    tokens = progress.tokens.get("total_tokens", 0)
+    if progress.kind == "subdomain_completed":
+        CONSOLE.print(
+            f"  [cyan]{progress.stage}[/cyan] subdomain {progress.subdomain}: "
+            f"{progress.risks} risks"
+        )
+    else:
+        CONSOLE.print(
+            f"[{progress.elapsed:7.1f}s] [bold]{progress.stage}[/bold] "
+            f"{progress.kind.replace('_', ' ')} | tokens={tokens} | eta={eta}"
+        )
+
+
 def _standaloneExecution():
     """
     Main function to run the orchestrator in standalone mode.
@@ -206,8 +748,47 @@ def _standaloneExecution():
     parser = argparse.ArgumentParser(
         description="Run analysis on a questionnaire JSON file (specify only the file name)"
     )
-    parser.add_argument("filename", help="Questionnaire JSON file name (no path)")
+    parser.add_argument(
+        "filename", nargs="?", help="Questionnaire JSON file name (no path)"
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Print per-stage progress, token counts and ETA while running",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Resume a run from its first incomplete or invalidated stage",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Save a LangGraph checkpoint after every step (langgraph-checkpoint-sqlite)",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        default=None,
+        help="Reuse the run that already analysed identical answers",
+    )
     args = parser.parse_args()
+    if not args.filename and not args.resume:
+        parser.error("a filename or --resume RUN_ID is required")
+
+    on_event = _print_progress if args.progress else None
+    if args.resume:
+        try:
+            run_orchestrator(
+                args.filename,
+                on_event=on_event,
+                resume_run_id=args.resume,
+                checkpoint=args.checkpoint,
+            )
+            sys.exit(0)
+        except Exception as e:
+            _logger.error(str(e), step="orchestrator")
+            sys.exit(1)
 
     filename = args.filename
     repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -225,26 +806,12 @@ def _standaloneExecution():
         )
         sys.exit(2)
 
-    # Stato iniziale
-    state = {
-        "input_file": input_file,
-        "domain_state": {
-            "metadata": {},
-            "questionnaire": {},
-            "analysis": {},
-            "messages": [],
-            "errors": [],
-        },
-    }
-
-    orchestrator = build_orchestrator_graph()
     try:
-        final_state = orchestrator.invoke(state)
-        _logger.info("Orchestrator completed successfully", step="orchestrator")
-        _logger.info(
-            "Report generation end",
-            step="orchestrator",
-            html_report=final_state["report_state"].get("html_path"),
+        run_orchestrator(
+            input_file,
+            on_event=on_event,
+            checkpoint=args.checkpoint,
+            dedupe=args.dedupe,
         )
         sys.exit(0)
     except Exception as e:
@@ -0,0 +1,265 @@
+"""
+Batch generation of synthetic questionnaires.
+
+Runs the questionnaire generator over a matrix of profiles x languages x seeds
+with a thread pool (the generations are network bound), under a request rate
+shared by all the workers. Each generation is written to its own answers file
+with a unique run_id.
+
+Usage:
+    python -m agents.questionnaire_generator.batch_generator \
+        --profiles expert intermediate beginner --languages en it \
+        --seed-count 50 --workers 8 --rps 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.rate_limiters import InMemoryRateLimiter
+
+from utils.utils import create_logger
+
+from .question_generator_agent import (
+    DEFAULT_PROFILE_TEMPS,
+    generate_responses,
+    generate_responses_chunked,
+    load_questions,
+    save_answers_file,
+    save_responses_with_metadata,
+)
+
+_logger = create_logger("questionnaire_batch_generator")
+
+QUESTIONS_DIR = Path("files")
+ANSWERS_DIR = "files/answers/"
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    """One cell of the generation matrix."""
+
+    profile: str
+    language: str
+    seed: int
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one generation."""
+
+    item: BatchItem
+    run_id: Optional[str] = None
+    file_name: Optional[str] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+
+def build_matrix(
+    profiles: Sequence[str], languages: Sequence[str], seeds: Sequence[int]
+) -> List[BatchItem]:
+    """
+    Expand profiles, languages and seeds into the list of generations.
+
+    Args:
+        profiles (Sequence[str]): Simulated profiles.
+        languages (Sequence[str]): Questionnaire languages.
+        seeds (Sequence[int]): Sampling seeds.
+
+    Returns:
+        List[BatchItem]: One item per combination.
+    """
+    return [
+        BatchItem(profile, language, seed)
+        for profile, language, seed in itertools.product(profiles, languages, seeds)
+    ]
+
+
+def _generate_one(
+    item: BatchItem,
+    questions: List[Dict[str, Any]],
+    rate_limiter: Any,
+    chunked: bool = False,
+) -> BatchResult:
+    """
+    Generate and save one questionnaire.
+
+    Args:
+        item (BatchItem): The profile, language and seed to generate.
+        questions (List[Dict[str, Any]]): The questions for the item language.
+        rate_limiter (BaseRateLimiter): Limiter shared by all the workers.
+        chunked (bool, optional): Generate one domain per prompt.
+
+    Returns:
+        BatchResult: The run_id and file name, or the error.
+    """
+    started = time.monotonic()
+    try:
+        if chunked:
+            run_id, file_name = save_answers_file(
+                generate_responses_chunked(
+                    questions,
+                    item.profile,
+                    item.language,
+                    seed=item.seed,
+                    rate_limiter=rate_limiter,
+                ),
+                item.profile,
+                item.language,
+                run_id=uuid.uuid4().hex,
+                seed=item.seed,
+            )
+        else:
+            response = generate_responses(
+                questions,
+                item.profile,
+                item.language,
+                seed=item.seed,
+                rate_limiter=rate_limiter,
+            )
+            run_id, file_name = save_responses_with_metadata(
+                response,
+                item.profile,
+                item.language,
+                ANSWERS_DIR,
+                run_id=uuid.uuid4().hex,
+                seed=item.seed,
+            )
+        return BatchResult(item, run_id, file_name, elapsed=time.monotonic() - started)
+    except Exception as e:
+        _logger.error(
+            "Generation failed: profile=%s, language=%s, seed=%s: %s",
+            item.profile,
+            item.language,
+            item.seed,
+            e,
+        )
+        return BatchResult(item, error=str(e), elapsed=time.monotonic() - started)
+
+
+def run_batch(
+    items: Sequence[BatchItem],
+    max_workers: int = 4,
+    requests_per_second: float = 1.0,
+    questions_dir: Path = QUESTIONS_DIR,
+    chunked: bool = False,
+) -> List[BatchResult]:
+    """
+    Run the generations concurrently under a shared request rate.
+
+    Args:
+        items (Sequence[BatchItem]): The generations to run.
+        max_workers (int, optional): Concurrent generations. Defaults to 4.
+        requests_per_second (float, optional): Maximum LLM requests per second
+            across all workers. Defaults to 1.
+        questions_dir (Path, optional): Folder holding ``questions_<language>.json``.
+        chunked (bool, optional): Generate one domain per prompt (see
+            ``generate_responses_chunked``).
+
+    Returns:
+        List[BatchResult]: One result per item, in completion order.
+    """
+    # Each questions file is loaded once and shared read-only by the workers
+    questions_by_language = {
+        language: load_questions(
+            str(Path(questions_dir) / f"questions_{language}.json")
+        )
+        for language in sorted({item.language for item in items})
+    }
+    rate_limiter = InMemoryRateLimiter(
+        requests_per_second=requests_per_second,
+        check_every_n_seconds=0.1,
+        max_bucket_size=1,
+    )
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                _generate_one,
+                item,
+                questions_by_language[item.language],
+                rate_limiter,
+                chunked,
+            )
+            for item in items
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            results.append(result)
+            _logger.info(
+                "Batch progress: %d/%d (%s, %s, seed=%s) %s",
+                done,
+                len(futures),
+                result.item.profile,
+                result.item.language,
+                result.item.seed,
+                result.file_name or "failed",
+            )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic questionnaires over profiles, languages and seeds."
+    )
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        choices=list(DEFAULT_PROFILE_TEMPS),
+        default=list(DEFAULT_PROFILE_TEMPS),
+        help="Profiles to simulate (default: all).",
+    )
+    parser.add_argument(
+        "--languages",
+        nargs="+",
+        default=["en"],
+        help="Languages, read from files/questions_<language>.json (default: en).",
+    )
+    seeds = parser.add_mutually_exclusive_group()
+    seeds.add_argument("--seeds", nargs="+", type=int, help="Explicit seeds.")
+    seeds.add_argument(
+        "--seed-count", type=int, default=1, help="Use seeds 0..N-1 (default: 1)."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Concurrent generations (default: 4)."
+    )
+    parser.add_argument(
+        "--rps",
+        type=float,
+        default=1.0,
+        help="Maximum LLM requests per second across workers (default: 1).",
+    )
+    parser.add_argument(
+        "--chunked",
+        action="store_true",
+        help="Generate one domain per prompt, retrying only invalid chunks.",
+    )
+    args = parser.parse_args()
+
+    batch = build_matrix(
+        args.profiles, args.languages, args.seeds or range(args.seed_count)
+    )
+    started = time.monotonic()
+    batch_results = run_batch(
+        batch,
+        max_workers=args.workers,
+        requests_per_second=args.rps,
+        chunked=args.chunked,
+    )
+    failed = [r for r in batch_results if r.error]
+    _logger.info(
+        "Batch completed: %d generated, %d failed in %.1fs",
+        len(batch_results) - len(failed),
+        len(failed),
+        time.monotonic() - started,
+    )
+    sys.exit(1 if failed else 0)
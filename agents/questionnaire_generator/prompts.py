@@ -43,3 +43,16 @@ Return ONLY a valid JSON object with this exact structure:
 
 Begin the completion. Decide autonomously which type of AI solution to describe, based on the questions and general context.
 """
+
+# Chunked mode: a short description of the simulated system is generated first
+# and shared by the per-domain prompts, so all chunks describe the same system.
+QUESTIONNAIRE_SYSTEM_BRIEF_PROMPT = """
+You are about to fill out an AI risk assessment questionnaire, simulating the profile: {{ profile }}.
+Decide which AI system you will describe and write a brief description of it in 3-4 sentences: purpose, users, data used, deployment context.
+Return ONLY the plain text of the description, in the language specified by the parameter {{ language }}.
+"""
+
+QUESTIONNAIRE_CHUNK_CONTEXT = """
+REFERENCE SYSTEM: the questions are one section of a larger questionnaire. Answer consistently with this description of the system:
+{{ system_brief }}
+"""
@@ -2,15 +2,18 @@ from __future__ import annotations
 
 import argparse
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from jinja2 import Template
 from langchain.agents import create_agent
-from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 from langchain_core.prompts.chat import ChatPromptTemplate, SystemMessagePromptTemplate
 
 from . import prompts as qprompt
+from utils.answers_validator import AnswersValidator
+from utils.question_catalog import QuestionCatalog, load_catalog
 from utils.utils import get_llm_instance, create_logger
 
 DEFAULT_PROFILE_TEMPS: Dict[str, float] = {
@@ -26,6 +29,9 @@ def load_questions(path: str = "files/") -> List[Dict[str, Any]]:
     """
     Load and return the list of questions from the JSON file.
 
+    The file is parsed once per process through the shared question catalog;
+    the returned questions are read-only.
+
     Args:
         path (str): The file path to the JSON file containing questions.
 
@@ -37,13 +43,7 @@ def load_questions(path: str = "files/") -> List[Dict[str, Any]]:
         json.JSONDecodeError: If the file is not a valid JSON.
     """
     try:
-        with open(path, "r", encoding="utf-8") as fh:
-            data = json.load(fh)
-
-        questions = data.get("questions", [])
-        if not isinstance(questions, list):
-            _logger.error("The 'questions' field is not a list in the file %s", path)
-            raise ValueError("'questions' must be a list in the JSON file")
+        questions = list(load_catalog(path).questions)
 
         _logger.info(
             "Questions file loaded successfully: number of questions=%d, path=%s",
@@ -59,6 +59,9 @@ def load_questions(path: str = "files/") -> List[Dict[str, Any]]:
     except json.JSONDecodeError as e:
         _logger.error("JSON decoding error in %s: %s", path, e)
         raise
+    except ValueError:
+        _logger.error("The 'questions' field is not a list in the file %s", path)
+        raise
 
 
 def configure_model_context_template(
@@ -135,7 +138,11 @@ def build_chat_messages(
 
 
 def generate_responses(
-    questions: List[Dict[str, Any]], profile: str, language: str
+    questions: List[Dict[str, Any]],
+    profile: str,
+    language: str,
+    seed: Optional[int] = None,
+    rate_limiter: Any = None,
 ) -> Any:
     """
     Builds the LLM with the temperature for the profile, creates the agent, invokes it, and returns the response.
@@ -144,12 +151,14 @@ def generate_responses(
         questions (List[Dict[str, Any]]): The list of questions for the questionnaire.
         profile (str): The simulated profile (e.g., "Expert", "Intermediate", "Beginner").
         language (str): The language for the questionnaire.
+        seed (int, optional): Sampling seed passed to the model.
+        rate_limiter (BaseRateLimiter, optional): Limiter shared between concurrent generations.
 
     Returns:
         Any: The complete response generated by the agent.
     """
     temp = DEFAULT_PROFILE_TEMPS.get(profile, 0.5)
-    llm = get_llm_instance(t=temp)
+    llm = get_llm_instance(t=temp, seed=seed, rate_limiter=rate_limiter)
 
     agent = create_agent(model=llm)
     messages = build_chat_messages(questions, profile, language)
@@ -162,7 +171,92 @@ def generate_responses(
     return response
 
 
-def save_responses_with_metadata(response, profile, language, output_path, run_id=None):
+def _parse_json_content(content: str) -> Dict[str, Any]:
+    """
+    Parse the JSON answers of an AI message, removing code fences if present.
+
+    Args:
+        content (str): The message content.
+
+    Returns:
+        Dict[str, Any]: The parsed answers.
+
+    Raises:
+        json.JSONDecodeError: If the content is not valid JSON.
+    """
+    content = content.strip()
+    if content.startswith("```json"):
+        content = content[7:]
+    elif content.startswith("```"):
+        content = content[3:]
+    if content.endswith("```"):
+        content = content[:-3]
+    return json.loads(content)
+
+
+def extract_responses(response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine the answers of all the AI messages of an agent response.
+
+    Args:
+        response (dict): The complete response generated by the agent.
+
+    Returns:
+        Dict[str, Any]: The answers keyed by question id.
+    """
+    all_responses = {}
+    for msg in response["messages"]:
+        if isinstance(msg, AIMessage):
+            all_responses.update(_parse_json_content(msg.content))
+    return all_responses
+
+
+def save_answers_file(all_responses, profile, language, run_id=None, seed=None):
+    """
+    Saves the answers to ``files/answers/answers_<run_id>.json``, including metadata.
+
+    Args:
+        all_responses (dict): The answers keyed by question id.
+        profile (str): The simulated profile (e.g., "Expert", "Intermediate", "Beginner").
+        language (str): The language of the questionnaire.
+        run_id (str, optional): The run identifier; a new one is generated if omitted.
+        seed (int, optional): The sampling seed, recorded in the metadata when given.
+
+    Returns:
+        Tuple[str, str]: The run_id and the file name where responses are saved.
+    """
+    import uuid
+
+    if run_id is None:
+        run_id = uuid.uuid4().hex
+
+    # Generate the file name with run_id
+    file_name = f"files/answers/answers_{run_id}.json"
+
+    # Prepare the data to save with metadata
+    data_to_save = {
+        "metadata": {
+            "profile": profile,
+            "language": language,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "run_id": run_id,
+        },
+        "responses": all_responses,
+    }
+    if seed is not None:
+        data_to_save["metadata"]["seed"] = seed
+
+    # Save the data to the file
+    with open(file_name, "w", encoding="utf-8") as f:
+        json.dump(data_to_save, f, ensure_ascii=False, indent=4)
+
+    _logger.info("Responses saved successfully: %s", file_name)
+    return run_id, file_name
+
+
+def save_responses_with_metadata(
+    response, profile, language, output_path, run_id=None, seed=None
+):
     """
     Saves the generated responses to a JSON file, including metadata.
 
@@ -170,60 +264,226 @@ def save_responses_with_metadata(response, profile, language, output_path, run_i
         response (dict): The complete response generated by the agent.
         profile (str): The simulated profile (e.g., "Expert", "Intermediate", "Beginner").
         output_path (str): The file path where the responses will be saved.
+        run_id (str, optional): The run identifier; a new one is generated if omitted.
+        seed (int, optional): The sampling seed, recorded in the metadata when given.
 
     Returns:
         Tuple[str, str]: The run_id and the file name where responses are saved.
     """
     try:
-        # Filter all messages of type AIMessage
-        ai_messages = [m for m in response["messages"] if isinstance(m, AIMessage)]
-
-        # Combine all responses into a single dictionary
-        all_responses = {}
-        for msg in ai_messages:
-            content = msg.content
-            # Clean the content: remove "```json" delimiters if present
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.endswith("```"):
-                content = content[:-3]
-
-            # Convert the JSON content to a dictionary and update the overall responses
-            parsed_content = json.loads(content)
-            all_responses.update(parsed_content)
-
-        # Handle run_id: if not provided, generate a new one
-        import uuid
-
-        if run_id is None:
-            run_id = uuid.uuid4().hex
-
-        # Generate the file name with run_id
-        file_name = f"files/answers/answers_{run_id}.json"
-
-        # Prepare the data to save with metadata
-        data_to_save = {
-            "metadata": {
-                "profile": profile,
-                "language": language,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "run_id": run_id,
-            },
-            "responses": all_responses,
-        }
-
-        # Save the data to the file
-        with open(file_name, "w", encoding="utf-8") as f:
-            json.dump(data_to_save, f, ensure_ascii=False, indent=4)
-
-        _logger.info("Responses saved successfully: %s", file_name)
-        return run_id, file_name
-
+        return save_answers_file(
+            extract_responses(response), profile, language, run_id=run_id, seed=seed
+        )
     except Exception as e:
         _logger.error("Error saving responses to %s: %s", output_path, e)
         raise
 
 
+# ================================
+# Chunked generation
+# ================================
+def group_questions_by_domain(
+    questions: List[Dict[str, Any]],
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Split the questions into one chunk per domain (id prefix before the dot).
+
+    Args:
+        questions (List[Dict[str, Any]]): The list of questions for the questionnaire.
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: Domain id -> its questions, in file order.
+    """
+    chunks: Dict[str, List[Dict[str, Any]]] = {}
+    for question in questions:
+        chunks.setdefault(str(question["id"]).split(".")[0], []).append(question)
+    return chunks
+
+
+def validate_chunk(
+    answers: Dict[str, Any],
+    questions: List[Dict[str, Any]],
+    validator: Optional[AnswersValidator] = None,
+) -> List[str]:
+    """
+    Check generated answers against the question definitions.
+
+    Every question of the chunk must be answered; the answers are then checked
+    with the models of the server-side answers validator, so a valid chunk is
+    never rejected when the domain stage validates the answers file.
+
+    Args:
+        answers (Dict[str, Any]): The generated answers keyed by question id.
+        questions (List[Dict[str, Any]]): The questions of the chunk.
+        validator (AnswersValidator, optional): The validator of the whole
+            questionnaire. Built from ``questions`` if omitted.
+
+    Returns:
+        List[str]: The validation errors (empty if the chunk is valid).
+    """
+    if validator is None:
+        validator = AnswersValidator(
+            QuestionCatalog.from_document({"questions": questions})
+        )
+    question_ids = [str(question["id"]) for question in questions]
+    missing = [
+        qid
+        for qid in question_ids
+        if not isinstance(answers.get(qid), dict) or answers[qid].get("answer") is None
+    ]
+    errors = [f"{qid}: missing answer" for qid in missing]
+    return errors + validator.validate_responses(
+        answers, [qid for qid in question_ids if qid not in missing]
+    )
+
+
+def generate_system_brief(
+    profile: str,
+    language: str,
+    seed: Optional[int] = None,
+    rate_limiter: Any = None,
+) -> str:
+    """
+    Generate the short description of the simulated system shared by all chunks.
+
+    Args:
+        profile (str): The simulated profile.
+        language (str): The language for the questionnaire.
+        seed (int, optional): Sampling seed passed to the model.
+        rate_limiter (BaseRateLimiter, optional): Limiter shared between concurrent generations.
+
+    Returns:
+        str: The system description.
+    """
+    llm = get_llm_instance(
+        t=DEFAULT_PROFILE_TEMPS.get(profile, 0.5),
+        seed=seed,
+        rate_limiter=rate_limiter,
+    )
+    prompt = Template(qprompt.QUESTIONNAIRE_SYSTEM_BRIEF_PROMPT).render(
+        profile=profile, language=language
+    )
+    return str(llm.invoke(prompt).content).strip()
+
+
+def _generate_chunk(
+    questions: List[Dict[str, Any]],
+    profile: str,
+    language: str,
+    system_brief: str,
+    seed: Optional[int],
+    rate_limiter: Any,
+    validator: AnswersValidator,
+) -> Dict[str, Any]:
+    """
+    Generate and validate the answers of one chunk.
+
+    Returns:
+        Dict[str, Any]: The answers of the chunk questions.
+
+    Raises:
+        ValueError: If the answers are not valid JSON or fail validation.
+    """
+    temp = DEFAULT_PROFILE_TEMPS.get(profile, 0.5)
+    llm = get_llm_instance(t=temp, seed=seed, rate_limiter=rate_limiter)
+    agent = create_agent(model=llm)
+    messages = build_chat_messages(questions, profile, language)
+    context = Template(qprompt.QUESTIONNAIRE_CHUNK_CONTEXT).render(
+        system_brief=system_brief
+    )
+    messages.append(HumanMessage(content=context))
+
+    response = agent.invoke({"messages": messages})
+    try:
+        answers = extract_responses(response)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"invalid JSON: {e}") from e
+    errors = validate_chunk(answers, questions, validator)
+    if errors:
+        raise ValueError("; ".join(errors))
+    # Keep only the questions of this chunk
+    return {str(q["id"]): answers[str(q["id"])] for q in questions}
+
+
+def generate_responses_chunked(
+    questions: List[Dict[str, Any]],
+    profile: str,
+    language: str,
+    max_workers: Optional[int] = None,
+    max_retries: int = 2,
+    seed: Optional[int] = None,
+    rate_limiter: Any = None,
+) -> Dict[str, Any]:
+    """
+    Generate the answers one domain at a time, in parallel, retrying only failed chunks.
+
+    Args:
+        questions (List[Dict[str, Any]]): The list of questions for the questionnaire.
+        profile (str): The simulated profile (e.g., "Expert", "Intermediate", "Beginner").
+        language (str): The language for the questionnaire.
+        max_workers (int, optional): Concurrent chunks. Defaults to one per domain.
+        max_retries (int, optional): Extra attempts for a failed chunk. Defaults to 2.
+        seed (int, optional): Sampling seed passed to the model.
+        rate_limiter (BaseRateLimiter, optional): Limiter shared between concurrent generations.
+
+    Returns:
+        Dict[str, Any]: The answers keyed by question id, in questionnaire order
+            (empty, without any LLM call, if there are no questions).
+
+    Raises:
+        RuntimeError: If some chunks are still invalid after the retries.
+    """
+    chunks = group_questions_by_domain(questions)
+    if not chunks:
+        return {}
+    validator = AnswersValidator(
+        QuestionCatalog.from_document({"questions": questions})
+    )
+    system_brief = generate_system_brief(profile, language, seed, rate_limiter)
+
+    answers: Dict[str, Dict[str, Any]] = {}
+    pending = list(chunks)
+    last_errors: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(chunks)) as executor:
+        for attempt in range(max_retries + 1):
+            futures = {
+                domain: executor.submit(
+                    _generate_chunk,
+                    chunks[domain],
+                    profile,
+                    language,
+                    system_brief,
+                    seed,
+                    rate_limiter,
+                    validator,
+                )
+                for domain in pending
+            }
+            pending = []
+            for domain, future in futures.items():
+                try:
+                    answers[domain] = future.result()
+                except Exception as e:
+                    _logger.warning(
+                        "Chunk for domain %s failed (attempt %d): %s",
+                        domain,
+                        attempt + 1,
+                        e,
+                    )
+                    last_errors[domain] = str(e)
+                    pending.append(domain)
+            if not pending:
+                break
+
+    if pending:
+        raise RuntimeError(
+            "Chunks failed after retries: "
+            + "; ".join(f"domain {d}: {last_errors[d]}" for d in pending)
+        )
+    _logger.info("Questionnaire generated successfully in %d chunks.", len(chunks))
+    return {qid: answer for domain in chunks for qid, answer in answers[domain].items()}
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Generate responses for the AI questionnaire."
@@ -240,24 +500,34 @@ if __name__ == "__main__":
         required=True,
         help="Specify the user profile for the questionnaire.",
     )
+    parser.add_argument(
+        "--chunked",
+        action="store_true",
+        help="Generate one domain per prompt, in parallel, retrying only invalid chunks.",
+    )
     args = parser.parse_args()
 
     try:
         input_path = f"files/{args.questions_filename}"
-        with open(input_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        metadata = data.get("metadata", {})
+        metadata = load_catalog(input_path).metadata
         language = metadata.get("language")
         if not language:
             raise ValueError("Missing 'language' in metadata of input file.")
         questions = load_questions(input_path)
         profile = args.profile
-        response = generate_responses(questions, profile, language)
-
-        # Save responses and get run_id and file_name
-        run_id, file_name = save_responses_with_metadata(
-            response, profile, language, "files/answers/"
-        )
+        if args.chunked:
+            run_id, file_name = save_answers_file(
+                generate_responses_chunked(questions, profile, language),
+                profile,
+                language,
+            )
+        else:
+            response = generate_responses(questions, profile, language)
+
+            # Save responses and get run_id and file_name
+            run_id, file_name = save_responses_with_metadata(
+                response, profile, language, "files/answers/"
+            )
         _logger.info(f"Responses saved in {file_name} with run_id: {run_id}")
 
     except Exception as e:
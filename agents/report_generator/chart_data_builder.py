@@ -5,6 +5,8 @@ Prepares data structures for Plotly visualizations
 
 from typing import Dict, Any
 
+from utils.question_catalog import QuestionCatalog
+
 
 def prepare_chart_data(
     heuristic: Dict[str, Any], analysis: Dict[str, Any]
@@ -320,13 +322,18 @@ def build_risk_table_data(
     analysis: Dict[str, Any],
     answers: Dict[str, Any] = None,
     questions: Dict[str, Any] = None,
+    catalog: QuestionCatalog = None,
 ) -> Dict[str, Any]:
     """Build data for Risk Table with enriched questionnaire data.
 
+    Questionnaire data (question, answer, followups) is attached to each
+    subdomain entry; the risks themselves are not copied.
+
     Args:
         analysis (Dict[str, Any]): The detailed risk analysis data.
         answers (Dict[str, Any], optional): The generated answers from the questionnaire. Defaults to None.
         questions (Dict[str, Any], optional): The original questions from the questionnaire. Defaults to None.
+        catalog (QuestionCatalog, optional): The pre-indexed questions; takes precedence over ``questions``.
 
     Returns:
         Dict[str, Any]: The risk table data structure with enriched questionnaire data.
@@ -368,14 +375,11 @@ def build_risk_table_data(
         "7.6": "Multi-agent risks",
     }
 
-    # Prepare map of questions and followups: {id: {question, follow_ups: [..]}}
-    question_map = {}
-    if questions and "questions" in questions:
-        for q in questions["questions"]:
-            question_map[q["id"]] = {
-                "question": q.get("question"),
-                "follow_ups": q.get("follow_ups", []),
-            }
+    # Questions and followups by id come pre-indexed from the question catalog
+    if catalog is None and questions and "questions" in questions:
+        catalog = QuestionCatalog.from_document(questions)
+    by_id = catalog.by_id if catalog else {}
+    follow_ups = catalog.follow_ups if catalog else {}
 
     # Build hierarchical structure: {domain_id: {subdomain_id: subdomain_data}}
     domains_structure = {}
@@ -385,57 +389,53 @@ def build_risk_table_data(
     )  # supports both structure with "responses" and flat
     for subdomain_id, subdomain_data in analysis.items():
         domain_id = subdomain_id.split(".")[0]
-        # enrich each risk with question/answer/followup
         risks = subdomain_data.get("risks", [])
-        enriched_risks = []
-        for risk in risks:
-            enriched = dict(risk)
-            answer_info = responses.get(subdomain_id, {})
-            # prefer the question present in the answers, otherwise take from the questionnaire
-            enriched["questionnaire_question"] = answer_info.get(
-                "question"
-            ) or question_map.get(subdomain_id, {}).get("question")
-            enriched["questionnaire_answer"] = answer_info.get("answer")
-            # Map followup: [{question, answer}]
-            followup_answers = answer_info.get("followups")
-            followup_struct = []
-            if followup_answers and subdomain_id in question_map:
-                followup_defs = question_map[subdomain_id]["follow_ups"]
-                # If followup_answers is dict: {idx: answer}
-                if isinstance(followup_answers, dict):
-                    for idx, ans in followup_answers.items():
-                        try:
-                            idx_int = int(idx)
-                        except Exception:
-                            continue
-                        if 0 <= idx_int < len(followup_defs):
-                            followup_struct.append(
-                                {
-                                    "question": followup_defs[idx_int].get("text"),
-                                    "answer": ans,
-                                }
-                            )
-                # If it is a list: [answer1, answer2, ...] (fallback)
-                elif isinstance(followup_answers, list):
-                    for i, ans in enumerate(followup_answers):
-                        if i < len(followup_defs):
-                            followup_struct.append(
-                                {
-                                    "question": followup_defs[i].get("text"),
-                                    "answer": ans,
-                                }
-                            )
-            enriched["questionnaire_followups_struct"] = (
-                followup_struct if followup_struct else None
-            )
-            enriched_risks.append(enriched)
-        # Only include subdomain if there are any enriched risks
-        if enriched_risks:
-            if domain_id not in domains_structure:
-                domains_structure[domain_id] = {}
-            subdomain_entry = dict(subdomain_data)
-            subdomain_entry["risks"] = enriched_risks
-            domains_structure[domain_id][subdomain_id] = subdomain_entry
+        # Only include subdomain if there are any risks
+        if not risks:
+            continue
+        # The question/answer/followups are the same for every risk of the
+        # subdomain: compute them once and share the risks by reference.
+        answer_info = responses.get(subdomain_id, {})
+        # prefer the question present in the answers, otherwise take from the questionnaire
+        question = answer_info.get("question") or by_id.get(subdomain_id, {}).get(
+            "question"
+        )
+        # Map followup: [{question, answer}]
+        followup_answers = answer_info.get("followups")
+        followup_struct = []
+        if followup_answers and subdomain_id in follow_ups:
+            followup_defs = follow_ups[subdomain_id]
+            # If followup_answers is dict: {idx: answer}
+            if isinstance(followup_answers, dict):
+                for idx, ans in followup_answers.items():
+                    try:
+                        idx_int = int(idx)
+                    except Exception:
+                        continue
+                    if 0 <= idx_int < len(followup_defs):
+                        followup_struct.append(
+                            {
+                                "question": followup_defs[idx_int].get("text"),
+                                "answer": ans,
+                            }
+                        )
+            # If it is a list: [answer1, answer2, ...] (fallback)
+            elif isinstance(followup_answers, list):
+                for i, ans in enumerate(followup_answers):
+                    if i < len(followup_defs):
+                        followup_struct.append(
+                            {
+                                "question": followup_defs[i].get("text"),
+                                "answer": ans,
+                            }
+                        )
+        subdomain_entry = dict(subdomain_data)
+        subdomain_entry["questionnaire_question"] = question
+        subdomain_entry["questionnaire_answer"] = answer_info.get("answer")
+        subdomain_entry["questionnaire_followups_struct"] = (
+            followup_struct if followup_struct else None
+        )
+        domains_structure.setdefault(domain_id, {})[subdomain_id] = subdomain_entry
 
     return {
         "domain_names": domain_names,
@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Dict, Any
 from jinja2 import Environment, FileSystemLoader
 
+from utils.question_catalog import get_question_catalog
+
 from .chart_data_builder import prepare_chart_data, build_risk_table_data
 
 
@@ -73,6 +75,45 @@ def load_translations(language: str) -> dict:
     return {}
 
 
+def localize_patterns_heatmap(chart_data: Dict[str, Any], translations: dict) -> None:
+    """
+    Localize patterns heatmap labels in place, mapping pattern and category ids.
+
+    Args:
+        chart_data (Dict[str, Any]): Chart data containing ``patterns_heatmap``.
+        translations (dict): The translations for the selected language.
+    """
+    try:
+        ph = chart_data.get("patterns_heatmap", {})
+        # Patterns
+        pattern_ids = ph.get("pattern_ids") or []
+        pattern_labels = ph.get("patterns") or []
+        if pattern_ids:
+            localized_patterns = [
+                translations.get(
+                    "pattern_" + pid,
+                    pattern_labels[i] if i < len(pattern_labels) else pid,
+                )
+                for i, pid in enumerate(pattern_ids)
+            ]
+            ph["patterns"] = localized_patterns
+
+        # Categories
+        category_ids = ph.get("category_ids") or []
+        category_labels = ph.get("categories") or []
+        if category_ids:
+            localized_cats = [
+                translations.get(
+                    "pattern_category_" + cid.lower(),
+                    category_labels[i] if i < len(category_labels) else cid,
+                )
+                for i, cid in enumerate(category_ids)
+            ]
+            ph["categories"] = localized_cats
+    except Exception:
+        pass
+
+
 def generate_html_report(
     metadata: Dict[str, Any],
     heuristic: Dict[str, Any],
@@ -115,46 +156,15 @@ def generate_html_report(
     # Load questions dynamically based on language
     language = metadata.get("language", "en")
     translations = load_translations(language)
-    questions_path = (
-        Path(__file__).parent.parent.parent / "files" / f"questions_{language}.json"
-    )
-    questions = {}
-    if questions_path.exists():
-        with open(questions_path, "r", encoding="utf-8") as f:
-            questions = json.load(f)
-
-    risk_table_data = build_risk_table_data(analysis, answers, questions)
-
-    # Localize patterns heatmap labels (server-side): map pattern ids and category ids
     try:
-        ph = chart_data.get("patterns_heatmap", {})
-        # Patterns
-        pattern_ids = ph.get("pattern_ids") or []
-        pattern_labels = ph.get("patterns") or []
-        if pattern_ids:
-            localized_patterns = [
-                translations.get(
-                    "pattern_" + pid,
-                    pattern_labels[i] if i < len(pattern_labels) else pid,
-                )
-                for i, pid in enumerate(pattern_ids)
-            ]
-            ph["patterns"] = localized_patterns
+        catalog = get_question_catalog(language)
+    except FileNotFoundError:
+        catalog = None
 
-        # Categories
-        category_ids = ph.get("category_ids") or []
-        category_labels = ph.get("categories") or []
-        if category_ids:
-            localized_cats = [
-                translations.get(
-                    "pattern_category_" + cid.lower(),
-                    category_labels[i] if i < len(category_labels) else cid,
-                )
-                for i, cid in enumerate(category_ids)
-            ]
-            ph["categories"] = localized_cats
-    except Exception:
-        pass
+    risk_table_data = build_risk_table_data(analysis, answers, catalog=catalog)
+
+    # Localize patterns heatmap labels (server-side)
+    localize_patterns_heatmap(chart_data, translations)
 
     # Render template with inline CSS and JS
     html_content = template.render(
@@ -0,0 +1,373 @@
+"""
+Portfolio Report Generator
+Aggregates every analysed run into a single fleet-level dashboard
+"""
+
+import argparse
+import heapq
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader
+
+from utils.run_store import ANALYSIS_DIR, RunStore, get_run_store
+
+from .chart_data_builder import (
+    build_alert_criticality_data,
+    build_causality_sankey_data,
+    build_patterns_heatmap_data,
+    build_risk_distribution_data,
+)
+from .html_generator import (
+    REPORT_DIR,
+    TEMPLATE_DIR,
+    load_css,
+    load_translations,
+    localize_patterns_heatmap,
+)
+
+
+PORTFOLIO_SCRIPTS = ["charts.js", "navigation.js", "portfolio.js"]
+
+RISK_LEVELS = ["critical", "high", "medium", "low", "unknown"]
+COUNTING_KEYS = {
+    "by_severity": ["high", "medium", "low"],
+    "by_entity": ["ai", "human", "other"],
+    "by_intent": ["intentional", "unintentional", "other"],
+    "by_timing": ["pre-deployment", "post-deployment", "other"],
+}
+
+
+class PortfolioAggregator:
+    """
+    Incrementally aggregates runs into fleet-level chart data.
+
+    Only counters and a bounded heap of the top N systems are kept, so memory
+    does not grow with the size of the individual analyses.
+    """
+
+    def __init__(self, top_n: int = 10):
+        if top_n < 1:
+            raise ValueError(f"top_n must be at least 1, got {top_n}")
+        self.top_n = top_n
+        self.systems = 0
+        self.systems_by_level = {level: 0 for level in RISK_LEVELS}
+        self.counting = {
+            group: {key: 0 for key in keys} for group, keys in COUNTING_KEYS.items()
+        }
+        self.counting["total_risks"] = 0
+        self.risk_distribution: Optional[Dict[str, Any]] = None
+        self.sankey_nodes: List[str] = []
+        self.sankey_links: Dict[Tuple[int, int], int] = {}
+        self.pattern_values: Dict[Tuple[str, str], int] = {}
+        self.pattern_labels: Dict[str, str] = {}
+        self.score_total = 0.0
+        self.scored_systems = 0
+        self._top: List[Tuple[float, int, str, Dict[str, Any]]] = []
+
+    def add_run(
+        self,
+        run_id: str,
+        metadata: Dict[str, Any],
+        analysis: Dict[str, Any],
+        heuristic: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Fold a single run into the aggregate.
+
+        Args:
+            run_id (str): The run identifier.
+            metadata (Dict[str, Any]): Metadata of the run.
+            analysis (Dict[str, Any]): The causality analysis of the run.
+            heuristic (Dict[str, Any], optional): The heuristic analysis, if any.
+        """
+        heuristic = heuristic or {}
+        analysis = analysis or {}
+        self.systems += 1
+
+        # Severity by domain (stacked bar)
+        distribution = build_risk_distribution_data(analysis)
+        if self.risk_distribution is None:
+            self.risk_distribution = distribution
+        else:
+            for severity in ("high", "medium", "low"):
+                self.risk_distribution[severity] = [
+                    a + b
+                    for a, b in zip(
+                        self.risk_distribution[severity], distribution[severity]
+                    )
+                ]
+
+        # Causality flows (Sankey)
+        sankey = build_causality_sankey_data(heuristic, analysis)
+        self.sankey_nodes = sankey["nodes"]
+        for source, target, value in zip(
+            sankey["sources"], sankey["targets"], sankey["values"]
+        ):
+            key = (source, target)
+            self.sankey_links[key] = self.sankey_links.get(key, 0) + value
+
+        # Pattern matrix
+        heatmap = build_patterns_heatmap_data(heuristic)
+        for pid, label in zip(heatmap["pattern_ids"], heatmap["patterns"]):
+            self.pattern_labels[pid] = label
+        for category, row in zip(heatmap["category_ids"], heatmap["values"]):
+            for pid, value in zip(heatmap["pattern_ids"], row):
+                key = (category, pid)
+                self.pattern_values[key] = self.pattern_values.get(key, 0) + (
+                    value or 0
+                )
+
+        # Counting, recomputed from the analysis when the heuristic is missing
+        counting = heuristic.get("counting") or _count_risks(analysis)
+        self.counting["total_risks"] += counting.get("total_risks", 0) or 0
+        for group, keys in COUNTING_KEYS.items():
+            values = counting.get(group, {}) or {}
+            for key in keys:
+                self.counting[group][key] += values.get(key, 0) or 0
+        high_count = (counting.get("by_severity", {}) or {}).get("high", 0) or 0
+
+        # Executive summary: level and score
+        summary = heuristic.get("executive_summary", {}) or {}
+        level = summary.get("overall_risk_level") or "unknown"
+        if level not in self.systems_by_level:
+            level = "unknown"
+        self.systems_by_level[level] += 1
+
+        score = summary.get("global_risk_score")
+        if score is not None:
+            self.score_total += score
+            self.scored_systems += 1
+
+        most_critical = summary.get("most_critical_domain") or {}
+        entry = {
+            "run_id": run_id,
+            "timestamp": metadata.get("timestamp"),
+            "language": metadata.get("language"),
+            "global_risk_score": score,
+            "overall_risk_level": level,
+            "total_risks": counting.get("total_risks", 0),
+            "high_risks": high_count,
+            "most_critical_domain": most_critical.get("domain_name"),
+            "primary_concern": summary.get("primary_concern"),
+        }
+        rank = (score if score is not None else -1.0, high_count)
+        item = (rank[0], rank[1], run_id, entry)
+        if len(self._top) < self.top_n:
+            heapq.heappush(self._top, item)
+        elif item[:3] > self._top[0][:3]:
+            heapq.heapreplace(self._top, item)
+
+    def top_systems(self) -> List[Dict[str, Any]]:
+        """
+        Return the top N most critical systems, most critical first.
+
+        Returns:
+            List[Dict[str, Any]]: Summary entries for the top systems.
+        """
+        ordered = sorted(self._top, key=lambda item: item[:3], reverse=True)
+        return [
+            dict(entry, rank=idx) for idx, (_, _, _, entry) in enumerate(ordered, 1)
+        ]
+
+    def to_heuristic(self) -> Dict[str, Any]:
+        """
+        Build a heuristic-shaped summary of the whole portfolio.
+
+        Returns:
+            Dict[str, Any]: Aggregated counting and average score.
+        """
+        average = (
+            round(self.score_total / self.scored_systems, 2)
+            if self.scored_systems
+            else None
+        )
+        return {
+            "counting": self.counting,
+            "executive_summary": {"global_risk_score": average},
+        }
+
+    def to_chart_data(self) -> Dict[str, Any]:
+        """
+        Build the chart data consumed by the dashboard scripts.
+
+        Returns:
+            Dict[str, Any]: Data for every portfolio chart.
+        """
+        distribution = self.risk_distribution or build_risk_distribution_data({})
+
+        links = sorted(self.sankey_links.items())
+        sankey = {
+            "nodes": self.sankey_nodes or build_causality_sankey_data({}, {})["nodes"],
+            "sources": [source for (source, _), _ in links],
+            "targets": [target for (_, target), _ in links],
+            "values": [value for _, value in links],
+        }
+
+        pattern_ids = sorted(self.pattern_labels)
+        category_ids = build_patterns_heatmap_data({})["category_ids"]
+        heatmap = {
+            "category_ids": category_ids,
+            "categories": list(category_ids),
+            "pattern_ids": pattern_ids,
+            "patterns": [self.pattern_labels[pid] for pid in pattern_ids],
+            "values": [
+                [self.pattern_values.get((cat, pid), 0) for pid in pattern_ids]
+                for cat in category_ids
+            ],
+        }
+
+        return {
+            "risk_distribution": distribution,
+            "alert_criticality": build_alert_criticality_data(self.to_heuristic()),
+            "causality_sankey": sankey,
+            "patterns_heatmap": heatmap,
+            "systems_by_level": {
+                "levels": RISK_LEVELS,
+                "values": [self.systems_by_level[level] for level in RISK_LEVELS],
+            },
+        }
+
+
+def _count_risks(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compute heuristic-style counters directly from a causality analysis.
+
+    Args:
+        analysis (Dict[str, Any]): The causality analysis.
+
+    Returns:
+        Dict[str, Any]: Counters shaped like ``heuristic["counting"]``.
+    """
+    counting = {
+        group: {key: 0 for key in keys} for group, keys in COUNTING_KEYS.items()
+    }
+    total = 0
+    for subdomain_data in analysis.values():
+        for risk in subdomain_data.get("risks", []):
+            total += 1
+            causality = risk.get("causality", {}) or {}
+            values = {
+                "by_severity": (risk.get("severity") or "").lower(),
+                "by_entity": (causality.get("entity") or {}).get("value"),
+                "by_intent": (causality.get("intent") or {}).get("value"),
+                "by_timing": (causality.get("timing") or {}).get("value"),
+            }
+            for group, value in values.items():
+                if value in counting[group]:
+                    counting[group][value] += 1
+    counting["total_risks"] = total
+    return counting
+
+
+def load_portfolio_js() -> str:
+    """
+    Load and concatenate the JavaScript files used by the portfolio dashboard.
+
+    Returns:
+        str: The combined JavaScript content.
+    """
+    scripts_dir = Path(__file__).parent / "scripts"
+    js_content = []
+    for js_file in PORTFOLIO_SCRIPTS:
+        js_path = scripts_dir / js_file
+        if js_path.exists():
+            js_content.append(js_path.read_text(encoding="utf-8"))
+    return "\n".join(js_content)
+
+
+def generate_portfolio_report(
+    language: str = "en",
+    top_n: int = 10,
+    store: Optional[RunStore] = None,
+) -> Path:
+    """
+    Generate the fleet-level HTML dashboard over every analysed run.
+
+    Runs are streamed from the run store; the heuristic output is preferred
+    because it carries the causality analysis as well, and the causality
+    output is used for runs that never reached the heuristic step.
+
+    Args:
+        language (str, optional): Report language. Defaults to "en".
+        top_n (int, optional): Number of most critical systems to list. Defaults to 10.
+        store (RunStore, optional): The run store. Defaults to the shared one.
+
+    Returns:
+        Path: The path to the generated HTML dashboard.
+    """
+    REPORT_DIR.mkdir(parents=True, exist_ok=True)
+
+    aggregator = PortfolioAggregator(top_n=top_n)
+    store = store or get_run_store()
+    for run_id, data in store.iter_analyses(("heuristic", "causality")):
+        aggregator.add_run(
+            run_id,
+            metadata=data.get("metadata", {}) or {},
+            analysis=data.get("analysis", {}) or {},
+            heuristic=data.get("heuristic"),
+        )
+
+    translations = load_translations(language)
+    chart_data = aggregator.to_chart_data()
+    localize_patterns_heatmap(chart_data, translations)
+
+    env = Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)))
+    template = env.get_template("portfolio_template.html")
+    html_content = template.render(
+        metadata={
+            "timestamp": time.strftime("%Y%m%d_%H%M%S"),
+            "language": language,
+            "systems": aggregator.systems,
+        },
+        heuristic=aggregator.to_heuristic(),
+        translations=translations,
+        chart_data=chart_data,
+        top_systems=aggregator.top_systems(),
+        css_content=load_css(),
+        js_content=load_portfolio_js(),
+        language=language,
+    )
+
+    html_path = REPORT_DIR / "ai_risk_portfolio.html"
+    try:
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write(html_content)
+    except Exception as e:
+        raise RuntimeError(f"Portfolio report generation failed: {str(e)}")
+    return html_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate a portfolio dashboard aggregating all analysed runs"
+    )
+    parser.add_argument("--lang", choices=["it", "en"], default="en")
+    parser.add_argument(
+        "--top", type=int, default=10, help="Number of most critical systems to list"
+    )
+    parser.add_argument(
+        "--import-json",
+        nargs="?",
+        const=ANALYSIS_DIR,
+        type=Path,
+        metavar="FOLDER",
+        help="First import the JSON analyses exported under FOLDER into the run "
+        "store (default: files/analysis)",
+    )
+    args = parser.parse_args()
+    if args.top < 1:
+        parser.error("--top must be at least 1")
+
+    try:
+        if args.import_json is not None:
+            imported = get_run_store().import_folder(args.import_json)
+            print(f"Imported {imported} stage outputs from {args.import_json}")
+        path = generate_portfolio_report(language=args.lang, top_n=args.top)
+    except Exception as e:
+        print(f"Portfolio report generation failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Portfolio report: {path}")
+    sys.exit(0)
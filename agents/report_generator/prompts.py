@@ -30,3 +30,12 @@ Language for the output: {{language}}
 
 Generate the Executive Summary according to the system prompt instructions.
 """
+
+EXECUTIVE_SUMMARY_DIGEST_USER_PROMPT = """
+These are the AI risk analysis data to summarize, condensed into a digest (minified JSON): the heuristic executive summary, the risk distributions, the triggered alerts with their values, the non-zero critical patterns, the analysis context and the most severe risks of each domain:
+{{digest}}
+
+Language for the output: {{language}}
+
+Generate the Executive Summary according to the system prompt instructions.
+"""
@@ -11,10 +11,15 @@ from langgraph.graph import StateGraph
 
 from agents.report_generator.html_generator import generate_html_report
 from agents.report_generator.prompts import (
+    EXECUTIVE_SUMMARY_DIGEST_USER_PROMPT,
     EXECUTIVE_SUMMARY_SYSTEM_PROMPT,
     EXECUTIVE_SUMMARY_USER_PROMPT,
 )
-from utils.utils import create_logger, get_llm_instance
+from agents.report_generator.summary_digest import build_summary_digest, summary_mode
+from utils.prompt_encoding import compact_prompts_enabled, compact_risks, minify
+from utils.run_store import get_run_store, json_export_enabled
+from utils.serialization import write_artifact
+from utils.utils import STAGE_TEMPERATURES, create_logger, get_llm_instance
 
 
 # ================================
@@ -34,8 +39,29 @@ def _build_messages(heuristic, analysis, language):
         "role": "system",
         "content": EXECUTIVE_SUMMARY_SYSTEM_PROMPT,
     }
-    heuristic_str = json.dumps(heuristic, ensure_ascii=False, indent=2)
-    analysis_str = json.dumps(analysis, ensure_ascii=False, indent=2)
+    if summary_mode() == "digest":
+        # Bounded input: the prompt size does not grow with the number of risks
+        digest_str = minify(build_summary_digest(heuristic, analysis))
+        usr_msg = {
+            "role": "user",
+            "content": EXECUTIVE_SUMMARY_DIGEST_USER_PROMPT.replace(
+                "{{digest}}", digest_str
+            ).replace("{{language}}", language),
+        }
+        return [system_msg, usr_msg]
+
+    if compact_prompts_enabled():
+        # Short risk descriptions and causality values are enough for the summary
+        heuristic_str = minify(heuristic)
+        analysis_str = minify(
+            compact_risks(
+                analysis,
+                ["title", "explanation", "severity", "entity", "intent", "timing"],
+            )
+        )
+    else:
+        heuristic_str = json.dumps(heuristic, ensure_ascii=False, indent=2)
+        analysis_str = json.dumps(analysis, ensure_ascii=False, indent=2)
     usr_msg = {
         "role": "user",
         "content": EXECUTIVE_SUMMARY_USER_PROMPT.replace("{{heuristic}}", heuristic_str)
@@ -57,7 +83,7 @@ def generate_executive_summary_text(heuristic, analysis, language) -> str:
     Returns:
         str: The generated executive summary text.
     """
-    llm = get_llm_instance(t=0.2)
+    llm = get_llm_instance(t=STAGE_TEMPERATURES["report"])
     messages = _build_messages(heuristic, analysis, language)
     try:
         response = llm.invoke(messages)
@@ -105,6 +131,15 @@ def node_load(state: ReportGenerationState) -> ReportGenerationState:
     state["messages"] = []
     state["errors"] = []
 
+    # Fall back to the run store when only the run_id is provided
+    run_id = (state.get("metadata") or {}).get("run_id")
+    if (state.get("analysis") is None or state.get("heuristic") is None) and run_id:
+        stored = get_run_store().load_stage(run_id, "heuristic")
+        if stored:
+            state["metadata"] = {**stored.get("metadata", {}), **state["metadata"]}
+            state["analysis"] = stored.get("analysis")
+            state["heuristic"] = stored.get("heuristic")
+
     if state.get("analysis") is None or state.get("heuristic") is None:
         err = "Missing analysis or heuristic data in initial state"
         _logger.error(err)
@@ -169,9 +204,11 @@ def node_generate_html_report(state: ReportGenerationState) -> ReportGenerationS
                 "Questionnaire not found in state; attempting to load from file."
             )
             run_id = meta.get("run_id")
-            if run_id:
-                import os
-
+            stored = get_run_store().load_answers(run_id) if run_id else None
+            if stored:
+                state["questionnaire"] = stored
+                _logger.info("Answers loaded from run store", run_id=run_id)
+            elif run_id:
                 answers_path = os.path.join(
                     os.path.dirname(__file__),
                     "..",
@@ -257,14 +294,17 @@ def node_save(state: ReportGenerationState) -> ReportGenerationState:
             }
         )
 
-        metadata_file = REPORT_DIR / f"report_metadata_{run_id}.json"
-        with open(metadata_file, "w", encoding="utf-8") as f:
-            json.dump(meta, f, ensure_ascii=False, indent=2)
+        get_run_store().save_report_metadata(run_id, meta)
+        metadata_file = None
+        if json_export_enabled():
+            metadata_file = REPORT_DIR / f"report_metadata_{run_id}.json"
+            write_artifact(metadata_file, meta)
 
         _logger.info(
             "Report metadata saved",
             step="save",
-            metadata_file=str(metadata_file),
+            run_id=run_id,
+            metadata_file=str(metadata_file) if metadata_file else None,
             html_report=state.get("html_path"),
         )
 
@@ -312,7 +352,8 @@ if __name__ == "__main__":
         description="Generate report from heuristic analysis file (specify only the file name)"
     )
     parser.add_argument(
-        "filename", help="Heuristic analysis JSON file name (without path)"
+        "filename",
+        help="Heuristic analysis JSON file name (without path) or a stored run_id",
     )
     args = parser.parse_args()
 
@@ -327,20 +368,26 @@ if __name__ == "__main__":
         filename if os.path.isabs(filename) else os.path.join(heuristic_dir, filename)
     )
 
-    if not os.path.isfile(input_file):
-        _logger.error(
-            f"Input file not found: {input_file}. "
-            f"Ensure it exists in {heuristic_dir} or provide an absolute path."
-        )
-        sys.exit(2)
+    if os.path.isfile(input_file):
+        data = None
+    else:
+        data = get_run_store().load_stage(filename, "heuristic")
+        if data is None:
+            _logger.error(
+                f"Input file not found: {input_file}. "
+                f"Ensure it exists in {heuristic_dir}, provide an absolute path "
+                "or the run_id of a stored run."
+            )
+            sys.exit(2)
 
     # Load the heuristic analysis file
     try:
-        with open(input_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if data is None:
+            with open(input_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
 
         _logger.info(
-            "Heuristic analysis file loaded",
+            "Heuristic analysis loaded",
             step="standalone",
             input_file=input_file,
         )
@@ -0,0 +1,46 @@
+// Portfolio Charts - Fleet-level visualizations
+
+// Systems by Overall Risk Level (Bar Chart)
+const levelColors = {
+    'critical': '#7F1D1D',
+    'high': '#DC2626',
+    'medium': '#F59E0B',
+    'low': '#10B981',
+    'unknown': '#94A3B8'
+};
+
+const levelLabels = chartData.systems_by_level.levels.map(level => {
+    const map = {
+        'critical': translations.portfolio_level_critical || 'Critical',
+        'high': translations.high || 'High',
+        'medium': translations.medium || 'Medium',
+        'low': translations.low || 'Low',
+        'unknown': translations.unknown_label || 'Unknown'
+    };
+    return map[level] || level;
+});
+
+const systemsByLevelData = [{
+    x: levelLabels,
+    y: chartData.systems_by_level.values,
+    type: 'bar',
+    marker: {color: chartData.systems_by_level.levels.map(l => levelColors[l] || '#94A3B8')},
+    hovertemplate: '<b>%{x}</b><br>' + (translations.portfolio_systems_label || 'Systems') + ': %{y}<extra></extra>'
+}];
+
+const systemsByLevelLayout = {
+    xaxis: {
+        title: translations.risk_severity || 'Risk Level'
+    },
+    yaxis: {
+        title: translations.portfolio_systems_label || 'Systems',
+        gridcolor: '#E5E7EB'
+    },
+    margin: {l: 60, r: 40, t: 60, b: 80},
+    plot_bgcolor: '#FAFAFA',
+    paper_bgcolor: 'white',
+    font: {family: 'inherit', size: 12},
+    showlegend: false
+};
+
+Plotly.newPlot('systems-by-level-chart', systemsByLevelData, systemsByLevelLayout, {responsive: true});
@@ -0,0 +1,132 @@
+"""
+Summary Digest Builder
+Condenses the heuristic and analysis data into the bounded input of the
+executive summary prompt
+"""
+
+import os
+from typing import Any, Dict, List
+
+from utils.prompt_encoding import shorten
+
+# "digest" summarizes from the digest, "full" (default) from the whole analysis
+SUMMARY_MODE_ENV = "AREA_SUMMARY_MODE"
+
+# Risks kept per domain in the digest
+DIGEST_TOP_RISKS = 3
+
+# Characters of a risk explanation kept in the digest
+DIGEST_EXPLANATION_LIMIT = 160
+
+_SEVERITY_RANK = {"high": 0, "medium": 1, "low": 2}
+
+
+def summary_mode() -> str:
+    """
+    Return the executive summary mode.
+
+    Returns:
+        str: "digest" if ``AREA_SUMMARY_MODE`` is set to it, "full" otherwise.
+    """
+    mode = os.getenv(SUMMARY_MODE_ENV, "").strip().lower()
+    return "digest" if mode == "digest" else "full"
+
+
+def select_top_risks(
+    analysis: Dict[str, Any], top_n: int = DIGEST_TOP_RISKS
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Select the most severe risks of each domain.
+
+    Risks are ranked by severity (high first); ties keep the analysis order.
+
+    Args:
+        analysis (Dict[str, Any]): The detailed risk analysis data.
+        top_n (int, optional): Risks kept per domain. Defaults to 3.
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: Domain id -> condensed risks
+            (subdomain, title, short explanation, severity and causality values).
+    """
+    by_domain: Dict[str, List[Dict[str, Any]]] = {}
+    for subdomain_id, subdomain_data in analysis.items():
+        domain_id = subdomain_id.split(".")[0]
+        for risk in (subdomain_data or {}).get("risks", []):
+            by_domain.setdefault(domain_id, []).append(
+                {"subdomain": subdomain_id, **risk}
+            )
+
+    top_risks = {}
+    for domain_id in sorted(by_domain, key=lambda d: (len(d), d)):
+        ranked = sorted(
+            by_domain[domain_id],
+            key=lambda r: _SEVERITY_RANK.get(str(r.get("severity", "")).lower(), 3),
+        )
+        top_risks[domain_id] = [
+            {
+                "subdomain": risk["subdomain"],
+                "title": risk.get("title", ""),
+                "explanation": shorten(
+                    risk.get("explanation", ""), DIGEST_EXPLANATION_LIMIT
+                ),
+                "severity": risk.get("severity"),
+                **{
+                    dimension: value.get("value")
+                    for dimension, value in (risk.get("causality") or {}).items()
+                },
+            }
+            for risk in ranked[:top_n]
+        ]
+    return top_risks
+
+
+def build_summary_digest(
+    heuristic: Dict[str, Any],
+    analysis: Dict[str, Any],
+    top_n: int = DIGEST_TOP_RISKS,
+) -> Dict[str, Any]:
+    """
+    Build the bounded-size digest used to write the executive summary.
+
+    The digest size depends on the number of domains and ``top_n`` only, not
+    on the number of risks produced by the domain analyzer.
+
+    Args:
+        heuristic (Dict[str, Any]): The heuristic analysis data.
+        analysis (Dict[str, Any]): The detailed risk analysis data.
+        top_n (int, optional): Risks kept per domain. Defaults to 3.
+
+    Returns:
+        Dict[str, Any]: Heuristic executive summary, distributions, triggered
+            alerts, non-zero critical patterns, context and top risks per domain.
+    """
+    counting = heuristic.get("counting", {}) or {}
+    patterns = heuristic.get("patterns", {}) or {}
+
+    alerts = {
+        name: alert.get("value")
+        for name, alert in (patterns.get("alerts", {}) or {}).items()
+        if isinstance(alert, dict) and alert.get("alert")
+    }
+    critical_patterns = {
+        name: count
+        for name, count in (patterns.get("critical_patterns", {}) or {}).items()
+        if count
+    }
+
+    return {
+        "executive_summary": heuristic.get("executive_summary", {}),
+        "distributions": {
+            "total_risks": counting.get("total_risks", 0),
+            "by_severity": counting.get("by_severity", {}),
+            "by_entity": counting.get("by_entity", {}),
+            "by_intent": counting.get("by_intent", {}),
+            "by_timing": counting.get("by_timing", {}),
+            "by_domain": counting.get("by_domain", {}),
+            **(patterns.get("distribution_metrics", {}) or {}),
+        },
+        "alerts": alerts,
+        "critical_patterns": critical_patterns,
+        "context": heuristic.get("context", {}),
+        "top_risks_by_domain": select_top_risks(analysis, top_n),
+    }
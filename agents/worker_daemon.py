@@ -0,0 +1,264 @@
+"""
+Long-running local worker daemon for the risk analysis pipeline.
+
+The daemon imports the agents and compiles their graphs once, then pre-forks
+N worker processes that each start SWI-Prolog and load the rules once. Jobs
+arrive as JSON lines over a Unix socket, so a run pays neither interpreter
+startup, imports, Prolog initialization nor graph compilation.
+
+Usage:
+    python -m agents.worker_daemon serve --workers 4
+    python -m agents.worker_daemon submit /abs/path/answers_12345.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import socketserver
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from utils.utils import configure_logging, create_logger
+
+_logger = create_logger("worker_daemon")
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SOCKET_PATH = PROJECT_ROOT / "files" / "jobs" / "worker.sock"
+
+
+# ================================
+# Worker side
+# ================================
+def _init_worker() -> None:
+    """
+    Per-worker warm-up: set up logging, import the LLM SDK, then start
+    SWI-Prolog and consult the rules once.
+
+    Logging is configured again because the background log listener of the
+    production profile is a thread, and threads do not survive the fork.
+    """
+    configure_logging()
+
+    import langchain_google_genai
+
+    from agents.heuristic_analyzer.heuristic_risk_analyzer_agent import (
+        load_prolog_rules,
+    )
+
+    try:
+        load_prolog_rules()
+    except Exception as e:
+        # The heuristic step will report the error when a job reaches it
+        _logger.warning("Prolog warm-up failed", pid=os.getpid(), error=str(e))
+
+
+def _run_job(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the pipeline for one request inside a warm worker.
+
+    Args:
+        request (Dict[str, Any]): {"input_file", "resume_run_id", "checkpoint", "dedupe"}.
+
+    Returns:
+        Dict[str, Any]: {"ok", "run_id", "html_path", "elapsed"} or {"ok": False, "error"}.
+    """
+    from agents.orchestrator import run_orchestrator
+
+    started = time.monotonic()
+    try:
+        final_state = run_orchestrator(
+            request.get("input_file"),
+            resume_run_id=request.get("resume_run_id"),
+            checkpoint=bool(request.get("checkpoint")),
+            dedupe=request.get("dedupe"),
+        )
+    except Exception as e:
+        _logger.error("Job failed", pid=os.getpid(), error=str(e))
+        return {"ok": False, "error": str(e)}
+    context = final_state["context"]
+    return {
+        "ok": True,
+        "run_id": context.metadata.get("run_id"),
+        "html_path": context.html_path,
+        "elapsed": round(time.monotonic() - started, 2),
+    }
+
+
+# ================================
+# Server side
+# ================================
+def _daemon_running(socket_path: Path) -> bool:
+    """
+    Tell whether a daemon answers on the socket (a stale socket file refuses).
+
+    Args:
+        socket_path (Path): Path of the Unix socket.
+
+    Returns:
+        bool: True if something accepts connections on the socket.
+    """
+    try:
+        submit(socket_path=socket_path, timeout=5, op="ping")
+    except (ConnectionRefusedError, FileNotFoundError):
+        return False
+    except (OSError, ValueError):
+        # Accepted the connection but did not answer like a daemon
+        return True
+    return True
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handle one JSON-line request per connection."""
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+        except ValueError as e:
+            response = {"ok": False, "error": f"Invalid request: {e}"}
+        else:
+            if request.get("op") == "ping":
+                response = {"ok": True, "workers": self.server.workers}
+            elif not request.get("input_file") and not request.get("resume_run_id"):
+                response = {
+                    "ok": False,
+                    "error": "input_file or resume_run_id required",
+                }
+            else:
+                # Blocks this connection thread only; the pool queues extra jobs
+                response = self.server.pool.apply(_run_job, (request,))
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class WorkerDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix-socket server dispatching pipeline runs to pre-forked warm workers.
+
+    Args:
+        socket_path (Path, optional): Path of the Unix socket.
+        workers (int, optional): Number of worker processes. Defaults to 2.
+
+    Raises:
+        RuntimeError: If another daemon is already listening on the socket.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path = SOCKET_PATH, workers: int = 2):
+        from agents.orchestrator import warm_up
+
+        self.socket_path = Path(socket_path)
+        self.workers = workers
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if _daemon_running(self.socket_path):
+                raise RuntimeError(
+                    f"A worker daemon is already running on {self.socket_path}"
+                )
+            # Left behind by a daemon that did not shut down cleanly
+            self.socket_path.unlink()
+
+        # Imports and compiled graphs are inherited by the forked workers; the
+        # LLM SDK is imported by each worker after the fork (see _init_worker)
+        warm_up(llm_sdk=False)
+        self.pool = multiprocessing.get_context("fork").Pool(
+            processes=workers, initializer=_init_worker
+        )
+        super().__init__(str(self.socket_path), _RequestHandler)
+        _logger.info(
+            "Worker daemon ready", socket=str(self.socket_path), workers=workers
+        )
+
+    def server_close(self) -> None:
+        """Stop the workers and remove the socket file."""
+        super().server_close()
+        self.pool.terminate()
+        self.pool.join()
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+
+def submit(
+    input_file: Optional[str] = None,
+    socket_path: Path = SOCKET_PATH,
+    timeout: Optional[float] = None,
+    **options: Any,
+) -> Dict[str, Any]:
+    """
+    Send a pipeline run to the daemon and wait for its result.
+
+    Args:
+        input_file (str, optional): Absolute path to the answers JSON file.
+        socket_path (Path, optional): Path of the daemon socket.
+        timeout (float, optional): Seconds to wait for the run. Defaults to no limit.
+        **options: "resume_run_id", "checkpoint", "dedupe" or "op" (e.g. "ping").
+
+    Returns:
+        Dict[str, Any]: The daemon response.
+    """
+    request = {"input_file": input_file, **options}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            return json.loads(reader.readline())
+
+
+# ================================
+# Standalone execution
+# ================================
+def _standaloneExecution():
+    """Start the daemon (``serve``) or send it a job (``submit``)."""
+    parser = argparse.ArgumentParser(description="AREA pipeline worker daemon")
+    parser.add_argument(
+        "--socket", default=str(SOCKET_PATH), help="Path of the Unix socket"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Start the daemon")
+    serve_parser.add_argument(
+        "--workers", type=int, default=2, help="Number of pre-forked workers"
+    )
+
+    submit_parser = commands.add_parser("submit", help="Run the pipeline on a file")
+    submit_parser.add_argument("filename", nargs="?", help="Absolute path to answers")
+    submit_parser.add_argument("--resume", metavar="RUN_ID", help="Resume a run")
+    submit_parser.add_argument("--dedupe", action="store_true", default=None)
+    submit_parser.add_argument("--checkpoint", action="store_true")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        try:
+            server = WorkerDaemon(Path(args.socket), workers=args.workers)
+        except RuntimeError as e:
+            _logger.error("Worker daemon not started", error=str(e))
+            sys.exit(1)
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        try:
+            server.serve_forever()
+        except (KeyboardInterrupt, SystemExit):
+            _logger.info("Worker daemon stopping")
+        finally:
+            server.server_close()
+        return
+
+    if not args.filename and not args.resume:
+        submit_parser.error("a filename or --resume RUN_ID is required")
+    response = submit(
+        os.path.abspath(args.filename) if args.filename else None,
+        socket_path=Path(args.socket),
+        resume_run_id=args.resume,
+        dedupe=args.dedupe,
+        checkpoint=args.checkpoint,
+    )
+    print(json.dumps(response, indent=2))
+    sys.exit(0 if response.get("ok") else 1)
+
+
+if __name__ == "__main__":
+    _standaloneExecution()
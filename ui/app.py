@@ -2,14 +2,15 @@
 import logging
 
 logging.getLogger("watchdog.observers.inotify_buffer").setLevel(logging.WARNING)
+import hashlib
 import json
 import streamlit as st
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import sys
 import time
-import importlib.util
+import uuid
 import sys
 from pathlib import Path
 import os
@@ -21,16 +22,23 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-# --- Import orchestrator run function ---
-ORCHESTRATOR_PATH = (
-    Path(__file__).resolve().parent.parent / "agents" / "orchestrator.py"
+# --- Import the analysis job queue (the pipeline itself runs in its workers) ---
+from agents.job_queue import (
+    PIPELINE_STEPS,
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+    STATUS_RUNNING,
+    JobQueue,
 )
-spec = importlib.util.spec_from_file_location("orchestrator", str(ORCHESTRATOR_PATH))
-orchestrator = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(orchestrator)
-
 from ui.styles import GLOBAL_CSS
 from ui.localization import TRANSLATIONS
+from utils.question_catalog import load_catalog
+
+
+@st.cache_resource
+def get_job_queue() -> JobQueue:
+    """Return the analysis job queue shared by all sessions of this process."""
+    return JobQueue()
 
 
 class StreamlitQuestionnaireApp:
@@ -49,10 +57,9 @@ class StreamlitQuestionnaireApp:
         self.init_session_state()
 
     def load_questions(self) -> None:
-        """Load questions from the JSON file."""
-        with open(self.questions_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            self.questions = data["questions"]
+        """Load questions from the shared question catalog (parsed once per process)."""
+        self.catalog = load_catalog(self.questions_path)
+        self.questions = self.catalog.questions
 
     def init_session_state(self) -> None:
         """Initialize the session state."""
@@ -64,6 +71,9 @@ class StreamlitQuestionnaireApp:
             st.session_state.started = False
         if "followups_shown" not in st.session_state:
             st.session_state.followups_shown = {}
+        if "answers_run_id" not in st.session_state:
+            # Stable for the whole session: every save targets the same file
+            st.session_state.answers_run_id = uuid.uuid4().hex
 
     def show_welcome(self) -> None:
         """Show the welcome screen."""
@@ -243,9 +253,9 @@ class StreamlitQuestionnaireApp:
         return answer
 
     def render_followups(
-        self, question: Dict[str, Any], main_answer: Any
+        self, question: Dict[str, Any], visible_followups: Tuple[int, ...]
     ) -> Dict[str, Any]:
-        """Render the follow-up questions and return the answers."""
+        """Render the visible follow-up questions and return the answers."""
         followup_answers = {}
 
         if "follow_ups" not in question or not question["follow_ups"]:
@@ -256,15 +266,8 @@ class StreamlitQuestionnaireApp:
         followups_shown = st.session_state.followups_shown.get(question_id, False)
 
         for idx, followup in enumerate(question["follow_ups"]):
-            # Inject parent options for condition checks (multiple_choice, checkbox)
-            if question["type"] in ("multiple_choice", "checkbox"):
-                followup["_parent_options"] = question.get("options", [])
-
             # Show the follow-up only if: condition met AND shown flag = True
-            if (
-                self.should_show_followup(followup, main_answer, question["type"])
-                and followups_shown
-            ):
+            if idx in visible_followups and followups_shown:
                 st.markdown("---")
                 st.markdown(f"**➥ {followup['text']}**")
 
@@ -298,57 +301,19 @@ class StreamlitQuestionnaireApp:
 
         return followup_answers
 
-    def should_show_followup(
-        self, followup: Dict, answer: Any, question_type: str
-    ) -> bool:
-        """Determine if a follow-up question should be shown based on the answer."""
-        condition = followup.get("condition", {})
-        condition_type = condition.get("type")
-
-        if condition_type == "always":
-            if question_type == "free_text":
-                return answer and len(str(answer).strip()) >= 10
-            return bool(answer)
-
-        elif condition_type == "option_index":
-            value = condition.get("value")
-            if question_type == "multiple_choice":
-                options = followup.get("_parent_options", [])
-                if options and isinstance(answer, str):
-                    return (
-                        options.index(answer) == value if answer in options else False
-                    )
-
-        elif condition_type == "option_index_in":
-            values = condition.get("value", [])
-            if question_type == "checkbox" and isinstance(answer, dict):
-                selected = answer.get("selected", [])
-                return any(idx in values for idx in range(len(selected)))
-            elif question_type == "multiple_choice":
-                options = followup.get("_parent_options", [])
-                # answer può essere una stringa (opzione selezionata) o lista (se mai supportato)
-                if options:
-                    if isinstance(answer, str):
-                        idx = options.index(answer) if answer in options else -1
-                        return idx in values
-                    elif isinstance(answer, list):
-                        idxs = [options.index(a) for a in answer if a in options]
-                        return any(idx in values for idx in idxs)
-                return False
-
-        elif condition_type == "has_other":
-            if isinstance(answer, dict):
-                return answer.get("other") is not None and answer.get("other") != ""
-
-        return False
-
     def validate_answer(
         self,
         question: Dict[str, Any],
         answer: Any,
         followup_answers: Dict[str, Any] = None,
     ) -> tuple[bool, str]:
-        """Validate the main answer and follow-ups."""
+        """
+        Validate the main answer and follow-ups.
+
+        Follow-ups are checked with ``QuestionCatalog.followup_errors``, the
+        same rule as the server-side answers validator; pass None while the
+        follow-ups are not shown yet.
+        """
         if question.get("required", False):
             if question["type"] == "free_text":
                 if not answer or not str(answer).strip():
@@ -372,31 +337,59 @@ class StreamlitQuestionnaireApp:
                 if total < min_selections:
                     return False, f"Seleziona almeno {min_selections} opzione/i"
 
+        if followup_answers is not None and self.catalog.followup_errors(
+            question["id"], answer, followup_answers
+        ):
+            return False, self.t("followup_is_required")
+
         return True, ""
 
     def save_answers(self) -> Path:
-        """Salva le risposte in un file JSON."""
+        """
+        Save the answers to ``answers_{run_id}.json``.
+
+        The run_id is stable for the whole session and the file is rewritten
+        (atomically) only when the answers actually change.
+        """
+        run_id = st.session_state.answers_run_id
         output_path = (
             Path(__file__).resolve().parent.parent
             / "files"
             / "answers"
-            / f"answers_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            / f"answers_{run_id}.json"
         )
-        output_path.parent.mkdir(parents=True, exist_ok=True)
 
+        canonical = json.dumps(
+            {"language": self.lang, "responses": st.session_state.answers},
+            ensure_ascii=False,
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        content_hash = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        if (
+            st.session_state.get("answers_hash") == content_hash
+            and output_path.exists()
+        ):
+            return output_path
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
         output_data = {
             "metadata": {
                 "timestamp": datetime.now().isoformat(),
                 "language": self.lang,
                 "total_questions": len(self.questions),
                 "answered_questions": len(st.session_state.answers),
+                "run_id": run_id,
             },
             "responses": st.session_state.answers,
         }
 
-        with open(output_path, "w", encoding="utf-8") as f:
+        tmp_path = output_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(output_data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, output_path)
 
+        st.session_state.answers_hash = content_hash
         return output_path
 
     def show_questionnaire(self) -> None:
@@ -416,17 +409,11 @@ class StreamlitQuestionnaireApp:
         # Main question
         answer = self.render_question(question)
 
-        # Follow-up
-        followup_answers = self.render_followups(question, answer)
-
-        # Check if there are visible follow-ups
+        # Follow-up conditions are evaluated once per render (memoized per answer)
         question_id = question["id"]
-        has_visible_followups = False
-        if question.get("follow_ups"):
-            for followup in question["follow_ups"]:
-                if self.should_show_followup(followup, answer, question["type"]):
-                    has_visible_followups = True
-                    break
+        visible_followups = self.catalog.visible_followups(question_id, answer)
+        followup_answers = self.render_followups(question, visible_followups)
+        has_visible_followups = bool(visible_followups)
 
         # Check if follow-ups have already been shown for this question
         followups_already_shown = st.session_state.followups_shown.get(
@@ -452,8 +439,11 @@ class StreamlitQuestionnaireApp:
                     st.rerun()
 
         with col2:
+            # Follow-ups are validated once they have been shown to the user
             is_valid, error_msg = self.validate_answer(
-                question, answer, followup_answers
+                question,
+                answer,
+                followup_answers if followups_already_shown else None,
             )
             # Se non siamo all'ultima domanda, mostra solo Avanti
             if current_idx < len(self.questions) - 1:
@@ -516,28 +506,72 @@ class StreamlitQuestionnaireApp:
 
         # --- Analysis and report generation ---
         answers_path = self.save_answers()
-        if st.button(self.t("run_analysis_button"), type="primary"):
-            st.info(self.t("analysis_launching"))
-            with st.spinner(self.t("analysis_running")):
-                try:
-                    final_state = orchestrator.run_orchestrator(str(answers_path))
-                    html_path = final_state.get("report_state", {}).get("html_path")
-                    if html_path and Path(html_path).exists():
-                        st.success(self.t("analysis_complete"))
-                        st.markdown(
-                            f"[{self.t('open_html_report')}]('file://{html_path}')"
-                        )
-                        st.info(
-                            self.t("copy_html_path_info").format(html_path=html_path)
-                        )
-                    else:
-                        st.error(self.t("report_not_found"))
-                except Exception as e:
-                    st.error(f"{self.t('analysis_error')}: {e}")
+        job_id = st.session_state.get("analysis_job_id")
+        job = get_job_queue().get(job_id) if job_id else None
+        job_active = job is not None and job["status"] not in (
+            STATUS_COMPLETED,
+            STATUS_FAILED,
+        )
+        if st.button(
+            self.t("run_analysis_button"), type="primary", disabled=job_active
+        ):
+            st.session_state.analysis_job_id = get_job_queue().submit(
+                str(answers_path)
+            )
+            st.rerun()
+        if job is not None:
+            if job_active:
+                self.show_analysis_progress(job_id)
+            else:
+                self.show_analysis_result(job)
         if st.button(self.t("restart_button"), type="secondary"):
             st.session_state.clear()
             st.rerun()
 
+    @st.fragment(run_every=2)
+    def show_analysis_progress(self, job_id: str) -> None:
+        """Poll the job queue and show the pipeline progress of a running job."""
+        job = get_job_queue().get(job_id)
+        if job is None or job["status"] in (STATUS_COMPLETED, STATUS_FAILED):
+            # Rerun the whole page so the final result replaces the poller
+            st.rerun()
+            return
+        stages_done = job["stages_done"] or 0
+        stage = job["stage"] or PIPELINE_STEPS[0]
+        st.progress(
+            stages_done / len(PIPELINE_STEPS),
+            text=self.t("analysis_stage").format(
+                stage=self.t(f"stage_{stage}"),
+                current=min(stages_done + 1, len(PIPELINE_STEPS)),
+                total=len(PIPELINE_STEPS),
+            ),
+        )
+        if job["status"] != STATUS_RUNNING:
+            st.caption(self.t("analysis_launching"))
+            return
+        progress = json.loads(job["progress"]) if job.get("progress") else {}
+        eta = progress.get("eta")
+        st.caption(
+            self.t("analysis_progress_details").format(
+                elapsed=progress.get("elapsed", 0),
+                tokens=progress.get("tokens", {}).get("total_tokens", 0),
+                eta=f"{eta:.0f}s" if eta is not None else "…",
+            )
+        )
+
+    def show_analysis_result(self, job: Dict[str, Any]) -> None:
+        """Show the outcome of a finished analysis job."""
+        if job["status"] == STATUS_FAILED:
+            st.error(f"{self.t('analysis_error')}: {job['error']}")
+            return
+        html_path = job.get("html_path")
+        if html_path and Path(html_path).exists():
+            st.success(self.t("analysis_complete"))
+            st.markdown(f"[{self.t('open_html_report')}]('file://{html_path}')")
+            st.info(self.t("copy_html_path_info").format(html_path=html_path))
+        else:
+            st.error(self.t("report_not_found"))
+
     def run(self) -> None:
         """Run the application."""
         st.set_page_config(
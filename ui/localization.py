@@ -43,6 +43,18 @@ TRANSLATIONS = {
         "it": "Avvio della pipeline di analisi rischi... Attendere qualche istante.",
     },
     "analysis_running": {"en": "Running analysis...", "it": "Analisi in corso..."},
+    "analysis_stage": {
+        "en": "Step {current}/{total}: {stage}",
+        "it": "Fase {current}/{total}: {stage}",
+    },
+    "analysis_progress_details": {
+        "en": "Elapsed: {elapsed:.0f}s · Tokens: {tokens} · Estimated time left: {eta}",
+        "it": "Trascorso: {elapsed:.0f}s · Token: {tokens} · Tempo stimato rimanente: {eta}",
+    },
+    "stage_domain": {"en": "Domain analysis", "it": "Analisi dei domini"},
+    "stage_causality": {"en": "Causality analysis", "it": "Analisi della causalità"},
+    "stage_heuristic": {"en": "Heuristic analysis", "it": "Analisi euristica"},
+    "stage_report": {"en": "Report generation", "it": "Generazione del report"},
     "analysis_complete": {
         "en": "Analysis complete! Report generated.",
         "it": "Analisi completata! Report generato.",
@@ -58,6 +70,10 @@ TRANSLATIONS = {
         "en": "The answer must contain at least {min_length} characters",
         "it": "La risposta deve contenere almeno {min_length} caratteri",
     },
+    "followup_is_required": {
+        "en": "Please answer the required follow-up question",
+        "it": "Rispondi alla domanda di follow-up obbligatoria",
+    },
     "copy_html_path_info": {
         "en": "If the link does not open, copy and paste this path into your browser: {html_path}",
         "it": "Se il link non si apre, copia e incolla questo percorso nel browser: {html_path}",
@@ -0,0 +1,490 @@
+"""
+Server-side validation of answers files.
+
+Pydantic models are generated from ``files/questions_<language>.json`` (one
+model per question catalog, built once and cached) and check, before anything
+reaches the LLM, that an answers file only answers known questions, with the
+expected types, the required questions, the free-text lengths, the checkbox
+minimum selections, valid follow-up indexes and, with the same visibility
+rules as the questionnaire UI, the required follow-ups shown for an answer.
+
+Usage:
+    python -m utils.answers_validator files/answers/
+    python -m utils.answers_validator files/answers/answers_<run_id>.json ...
+"""
+
+import argparse
+import json
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Type,
+    Union,
+)
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    StringConstraints,
+    ValidationError,
+    create_model,
+    model_validator,
+)
+from typing_extensions import Annotated
+
+from utils.question_catalog import QuestionCatalog, get_question_catalog
+
+DEFAULT_LANGUAGE = "en"
+
+# Errors reported per file (a broken file would otherwise list every question)
+MAX_ERRORS = 20
+
+
+# ================================
+# Answer models
+# ================================
+class CheckboxAnswer(BaseModel):
+    """
+    Answer to a checkbox question.
+
+    The subclass generated for each question narrows ``selected`` to the
+    question options and sets its selection rules.
+
+    Attributes:
+        selected (List[str]): The selected options.
+        other (Optional[str]): The "other" free text, if any.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    min_selections: ClassVar[int] = 0
+    allow_other: ClassVar[bool] = True
+
+    selected: List[str] = Field(default_factory=list)
+    other: Optional[str] = None
+
+    @model_validator(mode="after")
+    def _check_selections(self) -> "CheckboxAnswer":
+        has_other = bool(self.other and self.other.strip())
+        if has_other and not self.allow_other:
+            raise ValueError("'other' is not allowed for this question")
+        if len(self.selected) + has_other < self.min_selections:
+            raise ValueError(f"select at least {self.min_selections} option(s)")
+        return self
+
+
+def _checkbox_model(question: Mapping[str, Any]) -> Type[CheckboxAnswer]:
+    """Build the checkbox answer model of a question."""
+    options = tuple(question.get("options", ()))
+    # Same rule as the questionnaire UI: minimum selections apply when required
+    minimum = question.get("min_selections", 1) if question.get("required") else 0
+
+    class QuestionCheckboxAnswer(CheckboxAnswer):
+        min_selections: ClassVar[int] = minimum
+        allow_other: ClassVar[bool] = bool(question.get("allow_other"))
+
+        selected: List[Literal[options]] = Field(default_factory=list)
+
+    QuestionCheckboxAnswer.__name__ = f"CheckboxAnswer_{question['id']}"
+    return QuestionCheckboxAnswer
+
+
+def _answer_type(question: Mapping[str, Any]) -> Any:
+    """
+    Return the type of the answer to a question.
+
+    Args:
+        question (Mapping[str, Any]): The question definition.
+
+    Returns:
+        Any: The annotation validating the "answer" value.
+    """
+    question_type = question.get("type")
+    required = bool(question.get("required"))
+
+    if question_type == "free_text":
+        validation = question.get("validation") or {}
+        return Annotated[
+            str,
+            StringConstraints(
+                # The UI enforces the minimum length on required answers only
+                min_length=validation.get("min_length") if required else None,
+                max_length=validation.get("max_length"),
+                pattern=r"\S" if required else None,
+            ),
+        ]
+    if question_type == "multiple_choice":
+        return Literal[tuple(question.get("options", ()))]
+    if question_type == "checkbox":
+        return _checkbox_model(question)
+    return Any
+
+
+def _response_model(
+    question: Mapping[str, Any], followup_count: int
+) -> Type[BaseModel]:
+    """
+    Build the model of one entry of ``responses``.
+
+    Args:
+        question (Mapping[str, Any]): The question definition.
+        followup_count (int): Number of follow-ups defined for the question.
+
+    Returns:
+        Type[BaseModel]: Model with the "question", "answer" and "followups" fields.
+    """
+    answer_type = _answer_type(question)
+    if followup_count:
+        indexes = Literal[tuple(str(index) for index in range(followup_count))]
+        followups_type = Dict[indexes, str]
+    else:
+        followups_type = Annotated[Dict[str, str], Field(max_length=0)]
+
+    return create_model(
+        f"Response_{question['id']}",
+        __config__=ConfigDict(extra="ignore"),
+        question=(Optional[str], None),
+        answer=(
+            (answer_type, ...)
+            if question.get("required")
+            else (Optional[answer_type], None)
+        ),
+        followups=(followups_type, Field(default_factory=dict)),
+    )
+
+
+def build_response_models(catalog: QuestionCatalog) -> Dict[str, Type[BaseModel]]:
+    """
+    Build the model of each entry of ``responses`` for a question catalog.
+
+    Args:
+        catalog (QuestionCatalog): The question catalog.
+
+    Returns:
+        Dict[str, Type[BaseModel]]: Question id -> model of its response.
+    """
+    return {
+        str(question["id"]): _response_model(
+            question, len(catalog.follow_ups.get(str(question["id"]), ()))
+        )
+        for question in catalog.questions
+    }
+
+
+def build_answers_model(
+    catalog: QuestionCatalog,
+    response_models: Optional[Mapping[str, Type[BaseModel]]] = None,
+) -> Type[BaseModel]:
+    """
+    Build the model of an answers file for a question catalog.
+
+    Responses are keyed by question id; required questions must be answered
+    and unknown question ids are rejected.
+
+    Args:
+        catalog (QuestionCatalog): The question catalog.
+        response_models (Mapping[str, Type[BaseModel]], optional): The models
+            from ``build_response_models``. Built from the catalog if omitted.
+
+    Returns:
+        Type[BaseModel]: Model of the whole file ({"metadata", "responses"}).
+    """
+    if response_models is None:
+        response_models = build_response_models(catalog)
+    fields = {}
+    for question in catalog.questions:
+        qid = str(question["id"])
+        model = response_models[qid]
+        if question.get("required"):
+            fields[f"q_{qid.replace('.', '_')}"] = (model, Field(alias=qid))
+        else:
+            fields[f"q_{qid.replace('.', '_')}"] = (
+                Optional[model],
+                Field(None, alias=qid),
+            )
+
+    responses_model = create_model(
+        f"Responses_{catalog.language or 'default'}",
+        __config__=ConfigDict(extra="forbid"),
+        **fields,
+    )
+    return create_model(
+        f"AnswersFile_{catalog.language or 'default'}",
+        metadata=(Dict[str, Any], ...),
+        responses=(responses_model, ...),
+    )
+
+
+def format_errors(error: ValidationError, limit: int = MAX_ERRORS) -> List[str]:
+    """
+    Turn a pydantic ValidationError into readable messages.
+
+    Args:
+        error (ValidationError): The validation error.
+        limit (int, optional): Maximum number of messages. Defaults to 20.
+
+    Returns:
+        List[str]: Messages such as "responses.1.1.answer: <reason>".
+    """
+    details = error.errors(include_url=False, include_input=False)
+    messages = [
+        f"{'.'.join(str(part) for part in detail['loc']) or '<root>'}: {detail['msg']}"
+        for detail in details[:limit]
+    ]
+    if len(details) > limit:
+        messages.append(f"... and {len(details) - limit} more errors")
+    return messages
+
+
+# ================================
+# Validator
+# ================================
+class AnswersValidator:
+    """
+    Validates answers files against the question catalog of one language.
+
+    Attributes:
+        catalog (QuestionCatalog): The question catalog.
+        response_models (Dict[str, Type[BaseModel]]): Question id -> model of
+            its response.
+        model (Type[BaseModel]): The generated answers file model.
+    """
+
+    def __init__(self, catalog: QuestionCatalog):
+        self.catalog = catalog
+        self.response_models = build_response_models(catalog)
+        self.model = build_answers_model(catalog, self.response_models)
+
+    def _response_followup_errors(self, qid: str, response: BaseModel) -> List[str]:
+        """Check the required follow-ups of one validated response."""
+        if not self.catalog.follow_ups.get(qid):
+            return []
+        answer = response.answer
+        if isinstance(answer, BaseModel):
+            answer = answer.model_dump()
+        return self.catalog.followup_errors(qid, answer, response.followups)
+
+    def followup_errors(self, answers: BaseModel) -> List[str]:
+        """
+        Check the required follow-ups of a validated answers file.
+
+        Args:
+            answers (BaseModel): The validated file (an instance of ``model``).
+
+        Returns:
+            List[str]: Required visible follow-ups left empty (an empty list if valid).
+        """
+        errors = []
+        for question in self.catalog.questions:
+            qid = str(question["id"])
+            response = getattr(answers.responses, f"q_{qid.replace('.', '_')}")
+            if response is not None:
+                errors.extend(
+                    f"responses.{error}"
+                    for error in self._response_followup_errors(qid, response)
+                )
+        return errors[:MAX_ERRORS]
+
+    def validate_responses(
+        self, responses: Mapping[str, Any], question_ids: Iterable[str]
+    ) -> List[str]:
+        """
+        Validate some entries of ``responses`` (e.g. one generated chunk).
+
+        The entries are checked with the same models and follow-up rules as a
+        whole answers file; entries of other questions are ignored.
+
+        Args:
+            responses (Mapping[str, Any]): Response entries keyed by question id.
+            question_ids (Iterable[str]): The questions to validate.
+
+        Returns:
+            List[str]: The validation errors (an empty list if valid).
+        """
+        errors = []
+        for qid in question_ids:
+            model = self.response_models.get(qid)
+            if model is None:
+                errors.append(f"{qid}: unknown question")
+                continue
+            try:
+                response = model.model_validate(responses.get(qid))
+            except ValidationError as e:
+                errors.extend(f"{qid}.{message}" for message in format_errors(e))
+                continue
+            errors.extend(self._response_followup_errors(qid, response))
+        return errors
+
+    def validate(self, document: Any) -> List[str]:
+        """
+        Validate a parsed answers file.
+
+        Args:
+            document (Any): The file content.
+
+        Returns:
+            List[str]: The validation errors (an empty list if valid).
+        """
+        try:
+            answers = self.model.model_validate(document)
+        except ValidationError as e:
+            return format_errors(e)
+        return self.followup_errors(answers)
+
+    def validate_json(self, data: Union[str, bytes]) -> List[str]:
+        """
+        Validate an answers file from its raw JSON text, without building a dict.
+
+        Args:
+            data (Union[str, bytes]): The file content.
+
+        Returns:
+            List[str]: The validation errors (an empty list if valid).
+        """
+        try:
+            answers = self.model.model_validate_json(data)
+        except ValidationError as e:
+            return format_errors(e)
+        return self.followup_errors(answers)
+
+
+@lru_cache(maxsize=16)
+def _validator_for(catalog: QuestionCatalog) -> AnswersValidator:
+    """Build the validator of a catalog once (catalogs are cached per file version)."""
+    return AnswersValidator(catalog)
+
+
+def get_answers_validator(language: str = DEFAULT_LANGUAGE) -> AnswersValidator:
+    """
+    Return the validator for ``files/questions_<language>.json``.
+
+    Args:
+        language (str, optional): The questionnaire language. Defaults to "en".
+
+    Returns:
+        AnswersValidator: The shared validator.
+
+    Raises:
+        FileNotFoundError: If there is no questions file for the language.
+    """
+    return _validator_for(get_question_catalog(language))
+
+
+def validate_answers(document: Any) -> List[str]:
+    """
+    Validate a parsed answers file with the catalog of its language.
+
+    The language is read from ``metadata.language`` (default "en").
+
+    Args:
+        document (Any): The file content.
+
+    Returns:
+        List[str]: The validation errors (an empty list if valid).
+    """
+    if not isinstance(document, dict):
+        return ["<root>: the answers file must be a JSON object"]
+    metadata = document.get("metadata")
+    language = (metadata if isinstance(metadata, dict) else {}).get(
+        "language"
+    ) or DEFAULT_LANGUAGE
+    try:
+        validator = get_answers_validator(str(language))
+    except FileNotFoundError:
+        return [f"metadata.language: unsupported language {language!r}"]
+    return validator.validate(document)
+
+
+def validate_answers_file(path: Union[str, Path]) -> List[str]:
+    """
+    Read and validate an answers file.
+
+    Args:
+        path (Union[str, Path]): Path to the answers JSON file.
+
+    Returns:
+        List[str]: The read, JSON and validation errors (an empty list if valid).
+    """
+    try:
+        with open(path, "rb") as f:
+            document = json.loads(f.read())
+    except OSError as e:
+        return [f"<file>: {e.strerror or e}"]
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        return [f"<file>: invalid JSON ({e})"]
+    return validate_answers(document)
+
+
+def _expand(paths: Iterable[str]) -> List[Path]:
+    """Expand folders into the answers files they contain."""
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob("*.json")) if path.is_dir() else [path])
+    return files
+
+
+def validate_batch(paths: Iterable[Union[str, Path]]) -> Dict[str, List[str]]:
+    """
+    Validate many answers files.
+
+    Args:
+        paths (Iterable[Union[str, Path]]): The answers files.
+
+    Returns:
+        Dict[str, List[str]]: File path -> errors, for the invalid files only.
+    """
+    invalid = {}
+    for path in paths:
+        errors = validate_answers_file(path)
+        if errors:
+            invalid[str(path)] = errors
+    return invalid
+
+
+def main() -> None:
+    """Validate the given answers files and folders and print a report."""
+    parser = argparse.ArgumentParser(
+        description="Validate answers files against the questions catalogs"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=["files/answers"],
+        help="Answers files or folders (default: files/answers)",
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="Only print the summary line"
+    )
+    args = parser.parse_args()
+
+    files = _expand(args.paths)
+    started = time.perf_counter()
+    invalid = validate_batch(files)
+    elapsed = time.perf_counter() - started
+
+    if not args.quiet:
+        for path, errors in invalid.items():
+            print(path)
+            for error in errors:
+                print(f"    {error}")
+    rate = len(files) / elapsed if elapsed else 0.0
+    print(
+        f"{len(files)} files, {len(invalid)} invalid in {elapsed * 1000:.0f} ms "
+        f"({rate:.0f} files/s)"
+    )
+    sys.exit(1 if invalid else 0)
+
+
+if __name__ == "__main__":
+    main()
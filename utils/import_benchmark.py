@@ -0,0 +1,104 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Modules whose import cost matters for the CLIs and background workers
+DEFAULT_MODULES = [
+    "utils.utils",
+    "agents.orchestrator",
+    "agents.job_queue",
+    "agents.domain_analyzer.domain_risk_analyzer_agent",
+    "agents.report_generator.report_generator_agent",
+]
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+def measure_import(module: str) -> Tuple[float, Dict[str, int]]:
+    """
+    Import a module in a fresh interpreter with ``-X importtime``.
+
+    Args:
+        module (str): Dotted module name.
+
+    Returns:
+        Tuple[float, Dict[str, int]]: Wall-clock seconds of the interpreter run
+            and the cumulative import time (microseconds) of every imported package.
+
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip()[-2000:]}")
+
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        # Format: "import time: <self us> | <cumulative us> | <package>"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumul, package = line[len("import time:") :].split("|", 2)
+        cumulative[package.strip()] = int(cumul)
+    return wall, cumulative
+
+
+def top_level_packages(cumulative: Dict[str, int], top: int) -> List[Tuple[str, int]]:
+    """
+    Return the most expensive top-level packages.
+
+    Args:
+        cumulative (Dict[str, int]): Cumulative import time per package.
+        top (int): Number of packages to return.
+
+    Returns:
+        List[Tuple[str, int]]: (package, microseconds), most expensive first.
+    """
+    roots = {name: us for name, us in cumulative.items() if "." not in name}
+    return sorted(roots.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main() -> None:
+    """Run the benchmark and print a summary per module."""
+    parser = argparse.ArgumentParser(
+        description="Measure the import time of the AREA entry points"
+    )
+    parser.add_argument(
+        "modules", nargs="*", default=DEFAULT_MODULES, help="Modules to import"
+    )
+    parser.add_argument(
+        "--runs", type=int, default=3, help="Fresh interpreters per module"
+    )
+    parser.add_argument(
+        "--top", type=int, default=8, help="Most expensive packages to list"
+    )
+    args = parser.parse_args()
+
+    for module in args.modules:
+        try:
+            samples = [measure_import(module) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{module}: {e}")
+            continue
+        walls = [wall for wall, _ in samples]
+        cumulative = samples[-1][1]
+        print(
+            f"{module}: median {statistics.median(walls) * 1000:.0f} ms wall, "
+            f"{cumulative.get(module, 0) / 1000:.0f} ms import"
+        )
+        for package, us in top_level_packages(cumulative, args.top):
+            print(f"    {us / 1000:8.1f} ms  {package}")
+
+
+if __name__ == "__main__":
+    main()
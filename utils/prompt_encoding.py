@@ -0,0 +1,85 @@
+import json
+import os
+from typing import Any, Dict, List
+
+# Set to "1" to send the compact encoding of the analysis to the LLM
+COMPACT_PROMPTS_ENV = "AREA_COMPACT_PROMPTS"
+
+# Characters of a risk explanation kept in compact prompts
+EXPLANATION_LIMIT = 240
+
+
+def compact_prompts_enabled() -> bool:
+    """
+    Tell whether prompts should use the compact encoding.
+
+    Returns:
+        bool: True if the ``AREA_COMPACT_PROMPTS`` environment variable is enabled.
+    """
+    return os.getenv(COMPACT_PROMPTS_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def minify(payload: Any) -> str:
+    """
+    Encode a payload as JSON without any insignificant whitespace.
+
+    Args:
+        payload (Any): The JSON-serializable payload.
+
+    Returns:
+        str: The minified JSON text.
+    """
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def shorten(text: str, limit: int = EXPLANATION_LIMIT) -> str:
+    """
+    Truncate a text at a word boundary.
+
+    Args:
+        text (str): The text to shorten.
+        limit (int, optional): Maximum number of characters. Defaults to 240.
+
+    Returns:
+        str: The text itself if short enough, otherwise its prefix followed by "…".
+    """
+    text = " ".join((text or "").split())
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0] or text[:limit]
+    return cut.rstrip(",;:.") + "…"
+
+
+def compact_risks(
+    analysis: Dict[str, Any], fields: List[str]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Reduce an analysis to the given risk fields, numbering the risks.
+
+    Explanations are shortened and nested causality values are flattened
+    (``causality.entity.value`` becomes ``entity``).
+
+    Args:
+        analysis (Dict[str, Any]): Analysis keyed by subdomain, each with a "risks" list.
+        fields (List[str]): Risk fields to keep, e.g. ["title", "severity"].
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: Subdomain -> list of {"id", <fields>},
+            where "id" is the position of the risk in its subdomain.
+    """
+    compact = {}
+    for subdomain, content in analysis.items():
+        rows = []
+        for index, risk in enumerate((content or {}).get("risks", [])):
+            row = {"id": index}
+            causality = risk.get("causality") or {}
+            for name in fields:
+                if name in causality:
+                    row[name] = causality[name].get("value")
+                elif name == "explanation":
+                    row[name] = shorten(risk.get(name, ""))
+                else:
+                    row[name] = risk.get(name)
+            rows.append(row)
+        compact[subdomain] = rows
+    return compact
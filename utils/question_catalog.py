@@ -0,0 +1,354 @@
+import json
+import os
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple, Union
+
+QUESTIONS_DIR = Path(__file__).resolve().parent.parent / "files"
+
+
+class FrozenDict(dict):
+    """A read-only dict (still a dict, so it serializes with ``json.dumps``)."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("The question catalog is read-only")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __hash__(self) -> int:
+        return id(self)
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts into FrozenDicts and lists into tuples."""
+    if isinstance(value, dict):
+        return FrozenDict((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+# ================================
+# Follow-up conditions
+# ================================
+def _answer_key(answer: Any) -> Optional[Hashable]:
+    """Return a hashable memo key for an answer value, or None if it has none."""
+    if answer is None or isinstance(answer, str):
+        return answer
+    if isinstance(answer, (list, tuple)):
+        return ("list", tuple(answer))
+    if isinstance(answer, dict):
+        selected = answer.get("selected") or ()
+        if isinstance(selected, (list, tuple)):
+            return ("checkbox", tuple(selected), answer.get("other"))
+    return None
+
+
+class FollowUpCondition(ABC):
+    """
+    A follow-up ``condition`` compiled against its parent question.
+
+    Calling the predicate with the parent answer tells whether the follow-up
+    is visible. Results are memoized per answer value, so re-rendering the
+    same answer does not evaluate the condition again.
+    """
+
+    _MEMO_SIZE = 256
+
+    def __init__(self):
+        self._memo: Dict[Hashable, bool] = {}
+
+    def __call__(self, answer: Any) -> bool:
+        key = _answer_key(answer)
+        if key is None:
+            return self.evaluate(answer)
+        try:
+            return self._memo[key]
+        except (KeyError, TypeError):
+            pass
+        result = self.evaluate(answer)
+        if len(self._memo) >= self._MEMO_SIZE:
+            self._memo.clear()
+        try:
+            self._memo[key] = result
+        except TypeError:  # unhashable parts (e.g. a dict as "other")
+            pass
+        return result
+
+    @abstractmethod
+    def evaluate(self, answer: Any) -> bool:
+        """Evaluate the condition without memoization."""
+
+
+class AlwaysCondition(FollowUpCondition):
+    """Visible as soon as the parent question is answered."""
+
+    def __init__(self, free_text: bool):
+        super().__init__()
+        self.free_text = free_text
+
+    def __call__(self, answer: Any) -> bool:
+        # Cheaper than memoizing every free-text value typed by the user
+        return self.evaluate(answer)
+
+    def evaluate(self, answer: Any) -> bool:
+        if self.free_text:
+            return bool(answer) and len(str(answer).strip()) >= 10
+        return bool(answer)
+
+
+class OptionIndexCondition(FollowUpCondition):
+    """Visible when one of the chosen options has one of the given positions."""
+
+    def __init__(self, indexes: Iterable[int], option_index: Mapping[str, int]):
+        super().__init__()
+        self.indexes = frozenset(indexes)
+        self.option_index = option_index
+
+    def evaluate(self, answer: Any) -> bool:
+        if isinstance(answer, str):
+            chosen = (answer,)
+        elif isinstance(answer, dict):
+            chosen = answer.get("selected") or ()
+        elif isinstance(answer, (list, tuple)):
+            chosen = answer
+        else:
+            return False
+        return any(
+            self.option_index.get(option, -1) in self.indexes for option in chosen
+        )
+
+
+class HasOtherCondition(FollowUpCondition):
+    """Visible when the "other" field of a checkbox answer is filled in."""
+
+    def evaluate(self, answer: Any) -> bool:
+        return isinstance(answer, dict) and answer.get("other") not in (None, "")
+
+
+class NeverCondition(FollowUpCondition):
+    """Unknown condition types never show the follow-up."""
+
+    def evaluate(self, answer: Any) -> bool:
+        return False
+
+
+def compile_condition(
+    condition: Mapping[str, Any],
+    question_type: str,
+    option_index: Mapping[str, int],
+) -> FollowUpCondition:
+    """
+    Compile a follow-up ``condition`` into a predicate on the parent answer.
+
+    Option positions are resolved through the precomputed ``option_index``
+    map instead of scanning the options list.
+
+    Args:
+        condition (Mapping[str, Any]): The condition definition ({"type", "value"}).
+        question_type (str): Type of the parent question.
+        option_index (Mapping[str, int]): Parent option text -> position.
+
+    Returns:
+        FollowUpCondition: The predicate telling whether the follow-up is visible.
+    """
+    condition_type = (condition or {}).get("type")
+    value = (condition or {}).get("value")
+
+    if condition_type == "always":
+        return AlwaysCondition(free_text=question_type == "free_text")
+    if condition_type in ("option_index", "option_index_in"):
+        indexes = value if isinstance(value, (list, tuple)) else [value]
+        return OptionIndexCondition(indexes, option_index)
+    if condition_type == "has_other":
+        return HasOtherCondition()
+    return NeverCondition()
+
+
+# ================================
+# Catalog
+# ================================
+@dataclass(frozen=True)
+class QuestionCatalog:
+    """
+    Immutable, pre-indexed view of a questions file.
+
+    Attributes:
+        language (str): The questionnaire language.
+        metadata (Mapping[str, Any]): The file metadata.
+        questions (Tuple[Mapping[str, Any], ...]): The questions, in file order.
+        by_id (Mapping[str, Mapping[str, Any]]): Question id -> question.
+        follow_ups (Mapping[str, Tuple[Mapping[str, Any], ...]]): Question id ->
+            its follow-up definitions.
+        option_index (Mapping[str, Mapping[str, int]]): Question id -> option
+            text -> position.
+        conditions (Mapping[str, Tuple[FollowUpCondition, ...]]): Question id ->
+            one compiled condition per follow-up.
+    """
+
+    language: str
+    metadata: Mapping[str, Any]
+    questions: Tuple[Mapping[str, Any], ...]
+    by_id: Mapping[str, Mapping[str, Any]]
+    follow_ups: Mapping[str, Tuple[Mapping[str, Any], ...]]
+    option_index: Mapping[str, Mapping[str, int]]
+    conditions: Mapping[str, Tuple[FollowUpCondition, ...]]
+
+    @classmethod
+    def from_document(cls, document: Mapping[str, Any]) -> "QuestionCatalog":
+        """
+        Build the catalog from a parsed questions file.
+
+        Args:
+            document (Mapping[str, Any]): The file content ({"metadata", "questions"}).
+
+        Returns:
+            QuestionCatalog: The indexed catalog.
+
+        Raises:
+            ValueError: If "questions" is not a list.
+        """
+        questions = document.get("questions", [])
+        if not isinstance(questions, (list, tuple)):
+            raise ValueError("'questions' must be a list in the JSON file")
+        metadata = _freeze(dict(document.get("metadata", {})))
+        questions = tuple(_freeze(q) for q in questions)
+
+        by_id, follow_ups, option_index, conditions = {}, {}, {}, {}
+        for question in questions:
+            qid = str(question["id"])
+            by_id[qid] = question
+            follow_ups[qid] = question.get("follow_ups", ())
+            option_index[qid] = FrozenDict(
+                (option, index)
+                for index, option in enumerate(question.get("options", ()))
+            )
+            conditions[qid] = tuple(
+                compile_condition(
+                    followup.get("condition", {}), question["type"], option_index[qid]
+                )
+                for followup in follow_ups[qid]
+            )
+
+        return cls(
+            language=metadata.get("language", ""),
+            metadata=metadata,
+            questions=questions,
+            by_id=FrozenDict(by_id),
+            follow_ups=FrozenDict(follow_ups),
+            option_index=FrozenDict(option_index),
+            conditions=FrozenDict(conditions),
+        )
+
+    def visible_followups(self, question_id: str, answer: Any) -> Tuple[int, ...]:
+        """
+        Return the indexes of the follow-ups shown for an answer.
+
+        Args:
+            question_id (str): The parent question id.
+            answer (Any): The answer to the parent question.
+
+        Returns:
+            Tuple[int, ...]: Positions of the visible follow-ups.
+        """
+        return tuple(
+            index
+            for index, condition in enumerate(self.conditions.get(question_id, ()))
+            if condition(answer)
+        )
+
+    def followup_errors(
+        self, question_id: str, answer: Any, followups: Any
+    ) -> List[str]:
+        """
+        Validate the follow-up answers submitted for a question.
+
+        Shared by every server-side validation of answers files, with the same
+        visibility rules as the questionnaire UI.
+
+        Args:
+            question_id (str): The parent question id.
+            answer (Any): The answer to the parent question.
+            followups (Any): The follow-up answers ({"<index>": answer}).
+
+        Returns:
+            List[str]: Unknown follow-up indexes and required visible follow-ups
+                left empty (an empty list if valid).
+        """
+        if followups is None:
+            followups = {}
+        if not isinstance(followups, dict):
+            return [f"{question_id}: 'followups' must be an object"]
+
+        definitions = self.follow_ups.get(question_id, ())
+        errors = []
+        for key in followups:
+            if self.followup_text(question_id, key) is None:
+                errors.append(f"{question_id}: unknown follow-up index {key!r}")
+        for index in self.visible_followups(question_id, answer):
+            value = followups.get(str(index))
+            if definitions[index].get("required") and not str(value or "").strip():
+                errors.append(f"{question_id}: required follow-up {index} is missing")
+        return errors
+
+    def followup_text(self, question_id: str, index: Union[int, str]) -> Any:
+        """
+        Return the text of a follow-up, or None if the index is not valid.
+
+        Args:
+            question_id (str): The parent question id.
+            index (Union[int, str]): The follow-up position (answers use strings).
+
+        Returns:
+            Any: The follow-up text, or None.
+        """
+        try:
+            index = int(index)
+        except (TypeError, ValueError):
+            return None
+        definitions = self.follow_ups.get(question_id, ())
+        return definitions[index].get("text") if 0 <= index < len(definitions) else None
+
+
+@lru_cache(maxsize=16)
+def _load_catalog(path: str, mtime_ns: int) -> QuestionCatalog:
+    """Parse a questions file once per (path, modification time)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return QuestionCatalog.from_document(json.load(f))
+
+
+def load_catalog(path: Union[str, Path]) -> QuestionCatalog:
+    """
+    Return the catalog of a questions file, parsing it only once.
+
+    The modification time is part of the cache key, so editing the file
+    invalidates the cached catalog without restarting the process.
+
+    Args:
+        path (Union[str, Path]): Path to a ``questions_*.json`` file.
+
+    Returns:
+        QuestionCatalog: The shared, read-only catalog.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        json.JSONDecodeError: If the file is not valid JSON.
+    """
+    path = os.path.abspath(path)
+    return _load_catalog(path, os.stat(path).st_mtime_ns)
+
+
+def get_question_catalog(language: str = "en") -> QuestionCatalog:
+    """
+    Return the catalog of ``files/questions_<language>.json``.
+
+    Args:
+        language (str, optional): The questionnaire language. Defaults to "en".
+
+    Returns:
+        QuestionCatalog: The shared, read-only catalog.
+    """
+    return load_catalog(QUESTIONS_DIR / f"questions_{language}.json")
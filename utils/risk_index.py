@@ -0,0 +1,448 @@
+"""
+Risk Index
+Full-text index (SQLite FTS5) of the risks of every run, with facets on
+subdomain, severity, causality values and run_id
+
+The causality analyzer updates the index each time it saves a run; existing
+runs can be (re)indexed from the run store, or from exported causality
+artifacts with ``--folder``.
+
+Usage:
+    python -m utils.risk_index search "model inversion" --severity high --facets
+    python -m utils.risk_index reindex
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils.run_store import RunStore, get_run_store
+from utils.serialization import dumps_artifact
+
+# Default location of the risk index database
+RISK_INDEX_DB = Path(__file__).parent.parent / "files" / "risk_index.sqlite"
+
+# Causality artifacts indexed by ``reindex``
+CAUSALITY_DIR = Path(__file__).parent.parent / "files" / "analysis" / "causality"
+
+# Columns that can be used as filters and facets
+FACETS = ("subdomain", "severity", "entity", "intent", "timing", "run_id")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS risks (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    subdomain TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    explanation TEXT NOT NULL,
+    mitigation TEXT NOT NULL,
+    severity TEXT,
+    entity TEXT,
+    intent TEXT,
+    timing TEXT,
+    language TEXT,
+    UNIQUE (run_id, subdomain, position)
+);
+CREATE INDEX IF NOT EXISTS idx_risks_subdomain ON risks (subdomain);
+CREATE INDEX IF NOT EXISTS idx_risks_severity ON risks (severity);
+CREATE INDEX IF NOT EXISTS idx_risks_entity ON risks (entity);
+CREATE INDEX IF NOT EXISTS idx_risks_intent ON risks (intent);
+CREATE INDEX IF NOT EXISTS idx_risks_timing ON risks (timing);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS risks_fts USING fts5 (
+    title, explanation, mitigation,
+    content = 'risks', content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS risks_ai AFTER INSERT ON risks BEGIN
+    INSERT INTO risks_fts (rowid, title, explanation, mitigation)
+    VALUES (new.id, new.title, new.explanation, new.mitigation);
+END;
+CREATE TRIGGER IF NOT EXISTS risks_ad AFTER DELETE ON risks BEGIN
+    INSERT INTO risks_fts (risks_fts, rowid, title, explanation, mitigation)
+    VALUES ('delete', old.id, old.title, old.explanation, old.mitigation);
+END;
+
+CREATE TABLE IF NOT EXISTS indexed_runs (
+    run_id TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    risks INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+"""
+
+
+def fts_query(text: str) -> str:
+    """
+    Turn free text into an FTS5 query matching all its words.
+
+    Each word is quoted, so punctuation and FTS5 keywords are matched
+    literally; a trailing "*" keeps its prefix meaning.
+
+    Args:
+        text (str): The words to search.
+
+    Returns:
+        str: The FTS5 MATCH expression.
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*") and len(word) > 1
+        word = word.rstrip("*") if prefix else word
+        terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def _risk_rows(
+    run_id: str, analysis: Dict[str, Any], language: Optional[str]
+) -> List[Tuple[Any, ...]]:
+    """Flatten a nested causality analysis into index rows."""
+    rows = []
+    for subdomain, content in (analysis or {}).items():
+        for position, risk in enumerate((content or {}).get("risks", [])):
+            causality = risk.get("causality") or {}
+            rows.append(
+                (
+                    run_id,
+                    subdomain,
+                    position,
+                    risk.get("title", ""),
+                    risk.get("explanation", ""),
+                    risk.get("mitigation", ""),
+                    risk.get("severity"),
+                    (causality.get("entity") or {}).get("value"),
+                    (causality.get("intent") or {}).get("value"),
+                    (causality.get("timing") or {}).get("value"),
+                    language,
+                )
+            )
+    return rows
+
+
+class RiskIndex:
+    """
+    SQLite (WAL) full-text index of the risks of all runs.
+
+    Risks live in the ``risks`` table (one row per risk, with the facet
+    columns indexed) and their texts in the ``risks_fts`` FTS5 table, kept in
+    sync by triggers.
+    """
+
+    def __init__(self, db_path: Path = RISK_INDEX_DB):
+        self.db_path = Path(db_path)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Open a connection; the transaction is committed and the connection closed on exit.
+
+        Yields:
+            sqlite3.Connection: An open connection with row access by name.
+        """
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ================================
+    # Indexing
+    # ================================
+    def index_run(
+        self,
+        run_id: str,
+        analysis: Dict[str, Any],
+        language: Optional[str] = None,
+    ) -> bool:
+        """
+        Index (or re-index) the risks of a run.
+
+        A run whose analysis has not changed since it was indexed is skipped.
+
+        Args:
+            run_id (str): The run identifier.
+            analysis (Dict[str, Any]): The nested causality analysis.
+            language (str, optional): The run language.
+
+        Returns:
+            bool: True if the index was updated, False if it was up to date.
+        """
+        digest = hashlib.sha256(
+            dumps_artifact(analysis or {}, pretty=False)
+        ).hexdigest()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT digest FROM indexed_runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+            if row and row["digest"] == digest:
+                return False
+            rows = _risk_rows(run_id, analysis, language)
+            conn.execute("DELETE FROM risks WHERE run_id = ?", (run_id,))
+            conn.executemany(
+                "INSERT INTO risks (run_id, subdomain, position, title, explanation, "
+                "mitigation, severity, entity, intent, timing, language) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO indexed_runs (run_id, digest, risks, indexed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (run_id, digest, len(rows), time.time()),
+            )
+        return True
+
+    def index_file(self, path: Path) -> bool:
+        """
+        Index a causality artifact (``causality_analysis_<run_id>.json``).
+
+        Args:
+            path (Path): The artifact path.
+
+        Returns:
+            bool: True if the index was updated.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        metadata = payload.get("metadata") or {}
+        run_id = metadata.get("run_id") or Path(path).stem.replace(
+            "causality_analysis_", ""
+        )
+        return self.index_run(run_id, payload.get("analysis"), metadata.get("language"))
+
+    def remove_run(self, run_id: str) -> None:
+        """
+        Remove the risks of a run from the index.
+
+        Args:
+            run_id (str): The run identifier.
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM risks WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM indexed_runs WHERE run_id = ?", (run_id,))
+
+    # ================================
+    # Queries
+    # ================================
+    @staticmethod
+    def _where(
+        query: Optional[str], filters: Dict[str, Optional[str]], raw: bool
+    ) -> Tuple[str, List[Any]]:
+        """Build the FROM/WHERE clause of a search."""
+        clauses, params = [], []
+        source = "risks"
+        if query:
+            source = "risks_fts JOIN risks ON risks.id = risks_fts.rowid"
+            clauses.append("risks_fts MATCH ?")
+            params.append(query if raw else fts_query(query))
+        for column, value in filters.items():
+            if column not in FACETS:
+                raise ValueError(f"Unknown facet '{column}', expected one of {FACETS}")
+            if value is not None:
+                # With a text query, "+" keeps SQLite from driving the search
+                # by the facet index instead of the (more selective) FTS match
+                clauses.append(f"{'+' if query else ''}risks.{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return f"FROM {source}{where}", params
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        limit: int = 20,
+        raw: bool = False,
+        **filters: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """
+        Search risks by text and facets, best matches first.
+
+        Args:
+            query (str, optional): Words that must all appear in the title,
+                explanation or mitigation (FTS5 syntax if ``raw``).
+            limit (int, optional): Maximum number of risks. Defaults to 20.
+            raw (bool, optional): Pass ``query`` to FTS5 unchanged.
+            **filters: Facet values (subdomain, severity, entity, intent,
+                timing, run_id).
+
+        Returns:
+            List[Dict[str, Any]]: The matching risks; with a query, "snippet"
+                highlights the matched words.
+        """
+        source, params = self._where(query, filters, raw)
+        if query:
+            columns = "risks.*, snippet(risks_fts, -1, '[', ']', '…', 12) AS snippet"
+            order = "ORDER BY bm25(risks_fts)"
+        else:
+            columns, order = "risks.*", "ORDER BY risks.id DESC"
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT {columns} {source} {order} LIMIT ?", [*params, limit]
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def facets(
+        self,
+        query: Optional[str] = None,
+        raw: bool = False,
+        top: int = 10,
+        **filters: Optional[str],
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Count the matching risks per facet value.
+
+        Args:
+            query (str, optional): Words that must all appear (see ``search``).
+            raw (bool, optional): Pass ``query`` to FTS5 unchanged.
+            top (int, optional): Most frequent values kept per facet. Defaults to 10.
+            **filters: Facet values restricting the counted risks.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Facet -> value -> number of risks.
+        """
+        source, params = self._where(query, filters, raw)
+        counts = {}
+        with self._connect() as conn:
+            for column in FACETS:
+                rows = conn.execute(
+                    f"SELECT risks.{column} AS value, COUNT(*) AS n {source} "
+                    f"GROUP BY risks.{column} ORDER BY n DESC LIMIT ?",
+                    [*params, top],
+                ).fetchall()
+                counts[column] = {str(row["value"]): row["n"] for row in rows}
+        return counts
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the number of indexed runs and risks.
+
+        Returns:
+            Dict[str, int]: {"runs": ..., "risks": ...}.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) AS runs, COALESCE(SUM(risks), 0) AS risks "
+                "FROM indexed_runs"
+            ).fetchone()
+        return dict(row)
+
+
+@lru_cache(maxsize=None)
+def get_risk_index(db_path: Path = RISK_INDEX_DB) -> RiskIndex:
+    """
+    Return the process-wide risk index for the given database.
+
+    Args:
+        db_path (Path, optional): Path to the SQLite database.
+
+    Returns:
+        RiskIndex: The shared index.
+    """
+    return RiskIndex(db_path)
+
+
+def reindex(
+    folder: Optional[Path] = None,
+    index: Optional[RiskIndex] = None,
+    store: Optional[RunStore] = None,
+) -> int:
+    """
+    Index the causality analyses of every run (unchanged runs are skipped).
+
+    Args:
+        folder (Path, optional): Folder of exported ``causality_analysis_*.json``
+            files to index instead of the run store.
+        index (RiskIndex, optional): The index. Defaults to the shared one.
+        store (RunStore, optional): The run store. Defaults to the shared one.
+
+    Returns:
+        int: Number of runs (re)indexed.
+    """
+    index = index or get_risk_index()
+    updated = 0
+    if folder is None:
+        for run_id, payload in (store or get_run_store()).iter_analyses(("causality",)):
+            if (payload.get("metadata") or {}).get("errors"):
+                continue
+            updated += index.index_run(
+                run_id,
+                payload.get("analysis"),
+                (payload.get("metadata") or {}).get("language"),
+            )
+        return updated
+    for path in sorted(Path(folder).glob("causality_analysis_*.json")):
+        try:
+            updated += index.index_file(path)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"{path}: skipped ({e})")
+    return updated
+
+
+def main() -> None:
+    """Search the risk index, or rebuild it from the run store."""
+    parser = argparse.ArgumentParser(description="Search the risks of all runs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="Full-text and faceted search")
+    search.add_argument("query", nargs="?", help="Words to search")
+    for facet in FACETS:
+        search.add_argument(f"--{facet.replace('_', '-')}", dest=facet)
+    search.add_argument("--limit", type=int, default=20, help="Maximum risks")
+    search.add_argument("--raw", action="store_true", help="Use FTS5 query syntax")
+    search.add_argument(
+        "--facets", action="store_true", help="Also print the counts per facet"
+    )
+
+    rebuild = commands.add_parser("reindex", help="Index the stored causality analyses")
+    rebuild.add_argument(
+        "--folder",
+        type=Path,
+        help=f"Index exported artifacts instead (e.g. {CAUSALITY_DIR})",
+    )
+
+    args = parser.parse_args()
+    index = get_risk_index()
+
+    if args.command == "reindex":
+        started = time.perf_counter()
+        updated = reindex(args.folder, index)
+        stats = index.stats()
+        print(
+            f"{updated} runs updated in {(time.perf_counter() - started) * 1000:.0f} ms "
+            f"({stats['runs']} runs, {stats['risks']} risks indexed)"
+        )
+        return
+
+    filters = {facet: getattr(args, facet) for facet in FACETS}
+    started = time.perf_counter()
+    results = index.search(args.query, limit=args.limit, raw=args.raw, **filters)
+    counts = index.facets(args.query, raw=args.raw, **filters) if args.facets else {}
+    elapsed = (time.perf_counter() - started) * 1000
+
+    for risk in results:
+        print(
+            f"{risk['run_id']}  {risk['subdomain']:>4}  {risk['severity'] or '-':<6}  "
+            f"{risk['entity'] or '-'}/{risk['intent'] or '-'}/{risk['timing'] or '-'}  "
+            f"{risk['title']}"
+        )
+        if risk.get("snippet"):
+            print(f"      {risk['snippet']}")
+    for facet, values in counts.items():
+        print(f"{facet}: " + ", ".join(f"{v} ({n})" for v, n in values.items()))
+    print(f"{len(results)} risks in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
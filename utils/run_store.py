@@ -0,0 +1,529 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from utils.serialization import dumps_artifact
+from utils.utils import llm_settings
+
+# Default location of the run store database
+RUN_STORE_DB = Path(__file__).parent.parent / "files" / "runs.sqlite"
+
+# Pipeline stages persisted in the analyses table
+STAGES = ("domain", "causality", "heuristic")
+
+# JSON exports of the stage outputs (``<stage>/<stage>_analysis_<run_id>.json``)
+ANALYSIS_DIR = Path(__file__).parent.parent / "files" / "analysis"
+
+# Set to "1" to derive run_ids from the answers content and reuse completed runs
+CONTENT_RUN_ID_ENV = "AREA_CONTENT_RUN_ID"
+
+# Set to "1" to also export every stage output as a JSON file under files/
+JSON_EXPORT_ENV = "AREA_JSON_EXPORT"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    language TEXT,
+    profile TEXT,
+    current_step TEXT,
+    overall_risk_level TEXT,
+    global_risk_score REAL,
+    total_risks INTEGER,
+    html_report TEXT,
+    content_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_created_at ON runs (created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_language ON runs (language);
+CREATE INDEX IF NOT EXISTS idx_runs_risk_level ON runs (overall_risk_level);
+
+CREATE TABLE IF NOT EXISTS answers (
+    run_id TEXT PRIMARY KEY REFERENCES runs (run_id),
+    payload TEXT NOT NULL,
+    saved_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS analyses (
+    run_id TEXT NOT NULL REFERENCES runs (run_id),
+    stage TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    has_errors INTEGER NOT NULL DEFAULT 0,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (run_id, stage)
+);
+
+CREATE TABLE IF NOT EXISTS report_metadata (
+    run_id TEXT PRIMARY KEY REFERENCES runs (run_id),
+    payload TEXT NOT NULL,
+    saved_at REAL NOT NULL
+);
+"""
+
+
+def content_run_enabled() -> bool:
+    """
+    Tell whether content-addressed run_ids are enabled.
+
+    Returns:
+        bool: True if the ``AREA_CONTENT_RUN_ID`` environment variable is enabled.
+    """
+    return os.getenv(CONTENT_RUN_ID_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def json_export_enabled() -> bool:
+    """
+    Tell whether stage outputs are also exported as JSON files.
+
+    The run store is the source of truth; the exports are for external tools.
+
+    Returns:
+        bool: True if the ``AREA_JSON_EXPORT`` environment variable is enabled.
+    """
+    return os.getenv(JSON_EXPORT_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def content_hash(questionnaire: Dict[str, Any], model: Optional[str] = None) -> str:
+    """
+    Hash the canonicalized responses and language of a questionnaire, with the
+    model and generation parameters of the pipeline.
+
+    Identical submissions analysed with the same model and temperatures get
+    the same hash, which can be used as a content-addressed run_id.
+
+    Args:
+        questionnaire (Dict[str, Any]): The answers payload (metadata + responses).
+        model (str, optional): Model name. Defaults to the model used by
+            ``get_llm_instance``.
+
+    Returns:
+        str: A 32-character hex digest (same length as a uuid4 hex run_id).
+    """
+    settings = llm_settings()
+    if model is not None:
+        settings["model"] = model
+    canonical = json.dumps(
+        {
+            "responses": questionnaire.get("responses", {}),
+            "language": (questionnaire.get("metadata") or {}).get("language"),
+            **settings,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+def _dumps(payload: Any) -> str:
+    """Serialize a payload compactly for storage."""
+    return dumps_artifact(payload, pretty=False).decode("utf-8")
+
+
+class RunStore:
+    """
+    SQLite (WAL) store for pipeline runs.
+
+    Keeps answers, per-stage analyses and report metadata of every run, with
+    a ``runs`` table indexed by run_id, timestamp, language and risk level so
+    runs can be listed and filtered without reading any artifact.
+    """
+
+    def __init__(self, db_path: Path = RUN_STORE_DB):
+        self.db_path = Path(db_path)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(runs)")}
+            if "content_hash" not in columns:
+                conn.execute("ALTER TABLE runs ADD COLUMN content_hash TEXT")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_runs_content_hash ON runs (content_hash)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Open a connection; the transaction is committed and the connection closed on exit.
+
+        Yields:
+            sqlite3.Connection: An open connection with row access by name.
+        """
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _touch_run(self, conn: sqlite3.Connection, run_id: str, **fields: Any) -> None:
+        """
+        Create the run row if needed and update the given (non-None) columns.
+
+        Args:
+            conn (sqlite3.Connection): The open connection.
+            run_id (str): The run identifier.
+            **fields: Column values to set.
+        """
+        now = time.time()
+        conn.execute(
+            "INSERT OR IGNORE INTO runs (run_id, created_at, updated_at) VALUES (?, ?, ?)",
+            (run_id, now, now),
+        )
+        fields = {k: v for k, v in fields.items() if v is not None}
+        fields["updated_at"] = now
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        conn.execute(
+            f"UPDATE runs SET {assignments} WHERE run_id = ?",
+            [*fields.values(), run_id],
+        )
+
+    # ================================
+    # Answers
+    # ================================
+    def save_answers(self, run_id: str, questionnaire: Dict[str, Any]) -> None:
+        """
+        Store the questionnaire answers of a run.
+
+        Args:
+            run_id (str): The run identifier.
+            questionnaire (Dict[str, Any]): The answers payload (metadata + responses).
+        """
+        meta = questionnaire.get("metadata", {}) or {}
+        with self._connect() as conn:
+            self._touch_run(
+                conn,
+                run_id,
+                language=meta.get("language"),
+                profile=meta.get("profile"),
+                content_hash=content_hash(questionnaire),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO answers (run_id, payload, saved_at) VALUES (?, ?, ?)",
+                (run_id, _dumps(questionnaire), time.time()),
+            )
+
+    def load_answers(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the questionnaire answers of a run.
+
+        Args:
+            run_id (str): The run identifier.
+
+        Returns:
+            Optional[Dict[str, Any]]: The answers payload, or None if unknown.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload FROM answers WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return json.loads(row["payload"]) if row else None
+
+    # ================================
+    # Stage analyses
+    # ================================
+    def save_stage(self, run_id: str, stage: str, payload: Dict[str, Any]) -> None:
+        """
+        Store the output of a pipeline stage.
+
+        Args:
+            run_id (str): The run identifier.
+            stage (str): One of ``STAGES``.
+            payload (Dict[str, Any]): The stage output ({"metadata", "analysis", ...}).
+        """
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage: {stage}")
+        meta = payload.get("metadata", {}) or {}
+        summary = (payload.get("heuristic") or {}).get("executive_summary", {}) or {}
+        counting = (payload.get("heuristic") or {}).get("counting", {}) or {}
+        with self._connect() as conn:
+            self._touch_run(
+                conn,
+                run_id,
+                language=meta.get("language"),
+                profile=meta.get("profile"),
+                current_step=meta.get("analysis_current_step"),
+                overall_risk_level=summary.get("overall_risk_level"),
+                global_risk_score=summary.get("global_risk_score"),
+                total_risks=counting.get("total_risks"),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO analyses (run_id, stage, payload, has_errors, saved_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    stage,
+                    _dumps(payload),
+                    int(bool(meta.get("errors"))),
+                    time.time(),
+                ),
+            )
+
+    def load_stage(self, run_id: str, stage: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the output of a pipeline stage.
+
+        Args:
+            run_id (str): The run identifier.
+            stage (str): One of ``STAGES``.
+
+        Returns:
+            Optional[Dict[str, Any]]: The stage output, or None if not stored.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload FROM analyses WHERE run_id = ? AND stage = ?",
+                (run_id, stage),
+            ).fetchone()
+        return json.loads(row["payload"]) if row else None
+
+    def iter_analyses(
+        self, stages: Sequence[str] = ("heuristic", "causality")
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream, for every run, the output of the first of ``stages`` it has.
+
+        Runs are read one at a time, so memory does not grow with the store.
+
+        Args:
+            stages (Sequence[str], optional): Stages by order of preference.
+                Defaults to heuristic, then causality.
+
+        Yields:
+            Tuple[str, Dict[str, Any]]: The run_id and the stage output.
+        """
+        with self._connect() as conn:
+            for position, stage in enumerate(stages):
+                preferred = stages[:position]
+                skip = (
+                    "AND NOT EXISTS (SELECT 1 FROM analyses p "
+                    "WHERE p.run_id = a.run_id "
+                    f"AND p.stage IN ({', '.join('?' * len(preferred))}))"
+                    if preferred
+                    else ""
+                )
+                cursor = conn.execute(
+                    f"SELECT a.run_id, a.payload FROM analyses a "
+                    f"WHERE a.stage = ? {skip} ORDER BY a.run_id",
+                    (stage, *preferred),
+                )
+                for row in cursor:
+                    yield row["run_id"], json.loads(row["payload"])
+
+    def import_folder(
+        self, folder: Path = ANALYSIS_DIR, overwrite: bool = False
+    ) -> int:
+        """
+        Import exported stage outputs, e.g. the JSON archive of older runs.
+
+        Files are read from ``<folder>/<stage>/<stage>_analysis_<run_id>.json``;
+        the run_id comes from the file metadata, or else from the file name.
+
+        Args:
+            folder (Path, optional): Folder with one sub-folder per stage.
+                Defaults to ``files/analysis``.
+            overwrite (bool, optional): Replace stages already in the store.
+                Defaults to False.
+
+        Returns:
+            int: Number of stage outputs imported.
+
+        Raises:
+            OSError: If a file cannot be read.
+            json.JSONDecodeError: If a file is not valid JSON.
+        """
+        imported = 0
+        for stage in STAGES:
+            prefix = f"{stage}_analysis_"
+            for path in sorted((Path(folder) / stage).glob(f"{prefix}*.json")):
+                payload = json.loads(path.read_bytes())
+                meta = payload.get("metadata") or {}
+                run_id = meta.get("run_id") or path.stem[len(prefix) :]
+                if not overwrite and self.load_stage(run_id, stage) is not None:
+                    continue
+                self.save_stage(run_id, stage, payload)
+                imported += 1
+        return imported
+
+    # ================================
+    # Report metadata
+    # ================================
+    def save_report_metadata(self, run_id: str, metadata: Dict[str, Any]) -> None:
+        """
+        Store the report metadata of a run.
+
+        Args:
+            run_id (str): The run identifier.
+            metadata (Dict[str, Any]): The report metadata.
+        """
+        with self._connect() as conn:
+            self._touch_run(
+                conn,
+                run_id,
+                language=metadata.get("language"),
+                current_step=metadata.get("analysis_current_step"),
+                html_report=metadata.get("html_report"),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO report_metadata (run_id, payload, saved_at) "
+                "VALUES (?, ?, ?)",
+                (run_id, _dumps(metadata), time.time()),
+            )
+
+    def load_report_metadata(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the report metadata of a run.
+
+        Args:
+            run_id (str): The run identifier.
+
+        Returns:
+            Optional[Dict[str, Any]]: The report metadata, or None if not stored.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload FROM report_metadata WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return json.loads(row["payload"]) if row else None
+
+    def stage_status(self, run_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Return when each stage of a run was saved and whether it had errors.
+
+        The report stage is keyed "report" and also carries ``html_report``.
+
+        Args:
+            run_id (str): The run identifier.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: {stage: {"saved_at", "has_errors", ...}}.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT stage, saved_at, has_errors FROM analyses WHERE run_id = ?",
+                (run_id,),
+            ).fetchall()
+            report = conn.execute(
+                "SELECT m.saved_at, r.html_report FROM report_metadata m "
+                "JOIN runs r ON r.run_id = m.run_id WHERE m.run_id = ?",
+                (run_id,),
+            ).fetchone()
+        status = {
+            row["stage"]: {
+                "saved_at": row["saved_at"],
+                "has_errors": bool(row["has_errors"]),
+            }
+            for row in rows
+        }
+        if report:
+            status["report"] = {
+                "saved_at": report["saved_at"],
+                "has_errors": not report["html_report"],
+                "html_report": report["html_report"],
+            }
+        return status
+
+    # ================================
+    # Queries
+    # ================================
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the index row of a run.
+
+        Args:
+            run_id (str): The run identifier.
+
+        Returns:
+            Optional[Dict[str, Any]]: The run row, or None if unknown.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def find_run_by_content(self, digest: str) -> Optional[str]:
+        """
+        Return the run analysing the same content, preferring completed runs.
+
+        Only finished runs are returned: completed ones, or runs with a stage
+        saved with errors (which can be resumed). A run with no failed stage
+        and no report may still be running in another worker and is skipped.
+
+        Args:
+            digest (str): The ``content_hash`` of the answers.
+
+        Returns:
+            Optional[str]: The matching run_id, or None.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT r.run_id FROM runs r WHERE r.content_hash = ? AND ("
+                "r.html_report IS NOT NULL "
+                "OR EXISTS (SELECT 1 FROM report_metadata m WHERE m.run_id = r.run_id) "
+                "OR EXISTS (SELECT 1 FROM analyses a "
+                "WHERE a.run_id = r.run_id AND a.has_errors)"
+                ") ORDER BY r.html_report IS NULL, r.updated_at DESC LIMIT 1",
+                (digest,),
+            ).fetchone()
+        return row["run_id"] if row else None
+
+    def list_runs(
+        self,
+        language: Optional[str] = None,
+        risk_level: Optional[str] = None,
+        since: Optional[float] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        List runs, newest first, optionally filtered.
+
+        Args:
+            language (str, optional): Only runs in this language.
+            risk_level (str, optional): Only runs with this overall risk level.
+            since (float, optional): Only runs created after this UNIX timestamp.
+            limit (int, optional): Maximum number of runs. Defaults to 100.
+
+        Returns:
+            List[Dict[str, Any]]: The run rows.
+        """
+        clauses, params = [], []
+        if language:
+            clauses.append("language = ?")
+            params.append(language)
+        if risk_level:
+            clauses.append("overall_risk_level = ?")
+            params.append(risk_level)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM runs {where} ORDER BY created_at DESC LIMIT ?",
+                [*params, limit],
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+@lru_cache(maxsize=None)
+def get_run_store(db_path: Path = RUN_STORE_DB) -> RunStore:
+    """
+    Return the process-wide run store for the given database.
+
+    Args:
+        db_path (Path, optional): Path to the SQLite database.
+
+    Returns:
+        RunStore: The shared run store.
+    """
+    return RunStore(db_path)
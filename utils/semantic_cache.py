@@ -0,0 +1,369 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterator, Optional, Tuple
+
+from utils.serialization import dumps_artifact
+from utils.utils import get_model_name
+
+# Default location of the semantic cache database
+SEMANTIC_CACHE_DB = Path(__file__).parent.parent / "files" / "semantic_cache.sqlite"
+
+# Set to "1" to reuse the analysis of near-duplicate answers
+SEMANTIC_CACHE_ENV = "AREA_SEMANTIC_CACHE"
+
+# Minimum similarity (0-1) of the answer signatures for a cache hit
+SEMANTIC_CACHE_THRESHOLD_ENV = "AREA_SEMANTIC_CACHE_THRESHOLD"
+DEFAULT_THRESHOLD = 0.9
+
+# Most recent entries compared per lookup
+MAX_CANDIDATES = 5000
+
+SIMHASH_BITS = 64
+_MASK = (1 << SIMHASH_BITS) - 1
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS subdomain_cache (
+    id INTEGER PRIMARY KEY,
+    subdomain TEXT NOT NULL,
+    language TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_digest TEXT NOT NULL,
+    choice_digest TEXT NOT NULL,
+    simhash INTEGER NOT NULL,
+    normalized_answer TEXT NOT NULL,
+    result TEXT NOT NULL,
+    source_run_id TEXT,
+    created_at REAL NOT NULL,
+    UNIQUE (subdomain, language, model, prompt_digest, choice_digest, simhash)
+);
+CREATE INDEX IF NOT EXISTS idx_subdomain_cache_key
+    ON subdomain_cache (
+        subdomain, language, model, prompt_digest, choice_digest, created_at
+    );
+"""
+
+
+def semantic_cache_enabled() -> bool:
+    """
+    Tell whether the semantic cache of subdomain analyses is enabled.
+
+    Returns:
+        bool: True if the ``AREA_SEMANTIC_CACHE`` environment variable is enabled.
+    """
+    return os.getenv(SEMANTIC_CACHE_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def cache_threshold() -> float:
+    """
+    Return the minimum similarity for a cache hit.
+
+    Returns:
+        float: ``AREA_SEMANTIC_CACHE_THRESHOLD`` if set to a number in (0, 1],
+            0.9 otherwise.
+    """
+    try:
+        value = float(os.getenv(SEMANTIC_CACHE_THRESHOLD_ENV, ""))
+    except ValueError:
+        return DEFAULT_THRESHOLD
+    return value if 0 < value <= 1 else DEFAULT_THRESHOLD
+
+
+def prompt_digest(*parts: Any) -> str:
+    """
+    Hash the prompts, output schema and settings that produced an analysis.
+
+    Cached analyses are keyed by this digest, so editing a prompt or the
+    schema stops reusing the analyses produced with the previous version.
+
+    Args:
+        *parts (Any): JSON-serializable prompt texts, schemas and settings.
+
+    Returns:
+        str: A 16-character hex digest.
+    """
+    canonical = json.dumps(
+        parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+# ================================
+# Normalization and signatures
+# ================================
+def _normalize_text(text: Any) -> str:
+    """Lowercase a text and collapse its whitespace."""
+    return " ".join(str(text or "").lower().split())
+
+
+def normalize_answer(answer: Any, options: Collection[str] = ()) -> Tuple[str, str]:
+    """
+    Split an answer into its normalized choices and free text.
+
+    Choices (a multiple-choice option, checkbox selections) must match
+    exactly for a cache hit; the free text (a free-text answer, the "other"
+    field) is compared by similarity.
+
+    Args:
+        answer (Any): The answer value from the answers file.
+        options (Collection[str], optional): The question options; a text
+            answer equal to one of them is a multiple-choice option.
+
+    Returns:
+        Tuple[str, str]: The sorted, deduplicated choices joined by "|", and
+            the normalized free text.
+    """
+    if isinstance(answer, dict):
+        selected = answer.get("selected") or []
+        choices = sorted({_normalize_text(option) for option in selected})
+        return "|".join(choices), _normalize_text(answer.get("other"))
+    if isinstance(answer, (list, tuple)):
+        return "|".join(sorted({_normalize_text(a) for a in answer})), ""
+    if isinstance(answer, str) and answer in options:
+        return _normalize_text(answer), ""
+    return "", _normalize_text(answer)
+
+
+def _feature_hash(feature: str) -> int:
+    """Hash a feature to a 64-bit integer."""
+    return int.from_bytes(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def simhash(text: str) -> int:
+    """
+    Compute the 64-bit SimHash of a text.
+
+    Words and word bigrams are the features, so reordered or slightly
+    edited texts keep most of their bits.
+
+    Args:
+        text (str): The normalized text.
+
+    Returns:
+        int: The unsigned 64-bit signature (0 for an empty text).
+    """
+    words = _WORD_RE.findall(text)
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not features:
+        return 0
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        value = _feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def similarity(a: int, b: int) -> float:
+    """
+    Return the similarity of two SimHash signatures.
+
+    Args:
+        a (int): First signature.
+        b (int): Second signature.
+
+    Returns:
+        float: 1 minus the fraction of differing bits.
+    """
+    return 1.0 - bin((a ^ b) & _MASK).count("1") / SIMHASH_BITS
+
+
+def _to_signed(value: int) -> int:
+    """Map an unsigned 64-bit value to the signed range of SQLite integers."""
+    return value - (1 << SIMHASH_BITS) if value >> (SIMHASH_BITS - 1) else value
+
+
+@dataclass(frozen=True)
+class CacheHit:
+    """
+    A reused subdomain analysis.
+
+    Attributes:
+        result (Dict[str, Any]): The cached analysis of the subdomain ({"risks": [...]}).
+        source_run_id (Optional[str]): Run that produced the analysis.
+        similarity (float): Similarity of the answer signatures.
+    """
+
+    result: Dict[str, Any]
+    source_run_id: Optional[str]
+    similarity: float
+
+    def provenance(self) -> Dict[str, Any]:
+        """Return the provenance recorded in the run metadata."""
+        return {
+            "source_run_id": self.source_run_id,
+            "similarity": round(self.similarity, 4),
+        }
+
+
+# ================================
+# Cache
+# ================================
+class SemanticCache:
+    """
+    SQLite (WAL) cache of domain analyses per subdomain answer.
+
+    Entries are keyed by subdomain, language, model, prompt digest and the
+    exact choices of the answer; within a key, the free text is matched by
+    SimHash similarity.
+    """
+
+    def __init__(self, db_path: Path = SEMANTIC_CACHE_DB):
+        self.db_path = Path(db_path)
+        with self._connect() as conn:
+            columns = {
+                row["name"]
+                for row in conn.execute("PRAGMA table_info(subdomain_cache)")
+            }
+            if columns and "prompt_digest" not in columns:
+                # Entries from before the prompt digest cannot be matched to a
+                # prompt version, so the old table is dropped
+                conn.execute("DROP TABLE subdomain_cache")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Open a connection; the transaction is committed and the connection closed on exit.
+
+        Yields:
+            sqlite3.Connection: An open connection with row access by name.
+        """
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _key(answer: Any, options: Collection[str]) -> Tuple[str, int, str]:
+        """Return the choice digest, free-text signature and normalized answer."""
+        choices, text = normalize_answer(answer, options)
+        digest = hashlib.sha256(choices.encode("utf-8")).hexdigest()[:16]
+        return digest, simhash(text), f"{choices}\n{text}"
+
+    def lookup(
+        self,
+        subdomain: str,
+        answer: Any,
+        language: str,
+        prompt: str = "",
+        model: Optional[str] = None,
+        threshold: Optional[float] = None,
+        options: Collection[str] = (),
+    ) -> Optional[CacheHit]:
+        """
+        Find the analysis of the most similar answer to the same subdomain.
+
+        Args:
+            subdomain (str): The subdomain (question) id.
+            answer (Any): The answer value.
+            language (str): The questionnaire language.
+            prompt (str, optional): The ``prompt_digest`` of the analysis prompts.
+            model (str, optional): Model name. Defaults to ``get_model_name()``.
+            threshold (float, optional): Minimum similarity. Defaults to
+                ``cache_threshold()``.
+            options (Collection[str], optional): The question options, so that
+                a multiple-choice answer is matched exactly.
+
+        Returns:
+            Optional[CacheHit]: The best match above the threshold, or None.
+        """
+        digest, signature, _ = self._key(answer, options)
+        threshold = cache_threshold() if threshold is None else threshold
+        model = model if model is not None else get_model_name()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT simhash, result, source_run_id FROM subdomain_cache "
+                "WHERE subdomain = ? AND language = ? AND model = ? "
+                "AND prompt_digest = ? AND choice_digest = ? "
+                "ORDER BY created_at DESC LIMIT ?",
+                (subdomain, language, model, prompt, digest, MAX_CANDIDATES),
+            ).fetchall()
+
+        best, best_score = None, threshold
+        for row in rows:
+            score = similarity(signature, row["simhash"])
+            if score >= best_score:
+                best, best_score = row, score
+                if score == 1.0:
+                    break
+        if best is None:
+            return None
+        return CacheHit(json.loads(best["result"]), best["source_run_id"], best_score)
+
+    def store(
+        self,
+        subdomain: str,
+        answer: Any,
+        language: str,
+        result: Dict[str, Any],
+        source_run_id: Optional[str] = None,
+        prompt: str = "",
+        model: Optional[str] = None,
+        options: Collection[str] = (),
+    ) -> None:
+        """
+        Cache the analysis of a subdomain answer (an identical signature is kept).
+
+        Args:
+            subdomain (str): The subdomain (question) id.
+            answer (Any): The answer value.
+            language (str): The questionnaire language.
+            result (Dict[str, Any]): The validated analysis of the subdomain.
+            source_run_id (str, optional): Run that produced the analysis.
+            prompt (str, optional): The ``prompt_digest`` of the analysis prompts.
+            model (str, optional): Model name. Defaults to ``get_model_name()``.
+            options (Collection[str], optional): The question options, so that
+                a multiple-choice answer is matched exactly.
+        """
+        digest, signature, normalized = self._key(answer, options)
+        model = model if model is not None else get_model_name()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO subdomain_cache (subdomain, language, model, "
+                "prompt_digest, choice_digest, simhash, normalized_answer, result, "
+                "source_run_id, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    subdomain,
+                    language,
+                    model,
+                    prompt,
+                    digest,
+                    _to_signed(signature),
+                    normalized,
+                    dumps_artifact(result, pretty=False).decode("utf-8"),
+                    source_run_id,
+                    time.time(),
+                ),
+            )
+
+
+@lru_cache(maxsize=None)
+def get_semantic_cache(db_path: Path = SEMANTIC_CACHE_DB) -> SemanticCache:
+    """
+    Return the process-wide semantic cache for the given database.
+
+    Args:
+        db_path (Path, optional): Path to the SQLite database.
+
+    Returns:
+        SemanticCache: The shared cache.
+    """
+    return SemanticCache(db_path)
@@ -0,0 +1,83 @@
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Optional, Union
+
+try:  # orjson is optional: faster encoding when installed
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Set to "1" to pretty-print artifacts (debugging); compact otherwise
+PRETTY_ENV = "AREA_PRETTY_JSON"
+
+
+def pretty_enabled() -> bool:
+    """
+    Tell whether artifacts should be pretty-printed.
+
+    Returns:
+        bool: True if the ``AREA_PRETTY_JSON`` environment variable is enabled.
+    """
+    return os.getenv(PRETTY_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def dumps_artifact(payload: Any, pretty: Optional[bool] = None) -> bytes:
+    """
+    Encode an artifact payload as UTF-8 JSON.
+
+    Args:
+        payload (Any): The JSON-serializable payload.
+        pretty (bool, optional): Force pretty-printing on/off. Defaults to the
+            ``AREA_PRETTY_JSON`` environment setting.
+
+    Returns:
+        bytes: The encoded payload.
+    """
+    if pretty is None:
+        pretty = pretty_enabled()
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(payload, option=option)
+    if pretty:
+        text = json.dumps(payload, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
+
+
+def write_artifact(
+    path: Union[str, Path], payload: Any, pretty: Optional[bool] = None
+) -> Path:
+    """
+    Write an artifact atomically (temporary file in the same folder, then rename).
+
+    Readers never observe a partially written file, even if the process dies
+    mid-write. The temporary file is created with mode 0666, so the kernel
+    applies the umask and the file gets the usual permissions.
+
+    Args:
+        path (Union[str, Path]): Destination file.
+        payload (Any): The JSON-serializable payload.
+        pretty (bool, optional): Force pretty-printing on/off.
+
+    Returns:
+        Path: The destination path.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = dumps_artifact(payload, pretty)
+    tmp_path = path.parent / f".{path.name}.{uuid.uuid4().hex}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return path
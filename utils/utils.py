@@ -1,19 +1,24 @@
+import atexit
 import logging
 import os
-from typing import Dict
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 import structlog
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
 from rich.console import Console
-from rich.logging import RichHandler
 from rich.theme import Theme
 
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
 # Load environment variables from a .env file
 load_dotenv()
 
 
-# Configure the standard Python logger to use RichHandler for colored output
+# Theme of the Rich console used by the dev logging profile
 custom_theme = Theme(
     {
         "info": "green",
@@ -25,37 +30,132 @@ custom_theme = Theme(
 
 # Rich console used for manual prints from agents
 CONSOLE = Console(theme=custom_theme)
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(message)s",
-    handlers=[
-        RichHandler(
-            rich_tracebacks=True,
-            tracebacks_show_locals=True,
-            markup=True,
-            show_time=True,
-            log_time_format="%H:%M:%S",
-            show_level=True,
-            show_path=True,
-            enable_link_path=True,
-            console=CONSOLE,
+
+# Logging profile: "dev" (Rich console, DEBUG) or "production" (JSON lines, INFO)
+LOG_PROFILE_ENV = "AREA_LOG_PROFILE"
+LOG_PROFILES = ("dev", "production")
+
+# Sampling temperature of the LLM calls of each pipeline stage
+STAGE_TEMPERATURES = {"domain": 0.0, "causality": 0.0, "report": 0.2}
+
+# Background listener draining the log queue in the production profile
+_queue_listener = None
+
+
+def _stop_queue_listener() -> None:
+    """Flush and stop the production log listener, if one is running."""
+    global _queue_listener
+
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+# Registered once: stops whichever listener is current at exit
+atexit.register(_stop_queue_listener)
+
+
+def _configure_dev_logging() -> None:
+    """Rich console output at DEBUG, with tracebacks showing locals."""
+    from rich.logging import RichHandler
+
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format="%(message)s",
+        handlers=[
+            RichHandler(
+                rich_tracebacks=True,
+                tracebacks_show_locals=True,
+                markup=True,
+                show_time=True,
+                log_time_format="%H:%M:%S",
+                show_level=True,
+                show_path=True,
+                enable_link_path=True,
+                console=CONSOLE,
+            )
+        ],
+        force=True,
+    )
+
+    # Configure structlog for structured logging
+    structlog.configure(
+        processors=[
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.KeyValueRenderer(key_order=["event"]),
+        ],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+
+def _configure_production_logging() -> None:
+    """
+    JSON lines on stderr at INFO, written by a background thread.
+
+    Records go through a QueueHandler so callers never block on I/O, debug
+    calls are dropped by the bound logger before any processing, and
+    tracebacks are plain text without locals.
+    """
+    global _queue_listener
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    log_queue = queue.SimpleQueue()
+    _queue_listener = QueueListener(log_queue, stream_handler)
+    _queue_listener.start()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(message)s",
+        handlers=[QueueHandler(log_queue)],
+        force=True,
+    )
+
+    structlog.configure(
+        processors=[
+            structlog.stdlib.add_logger_name,
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(),
+        ],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+        cache_logger_on_first_use=True,
+    )
+
+
+def configure_logging(profile: Optional[str] = None) -> None:
+    """
+    Configure standard logging and structlog for the given profile.
+
+    Args:
+        profile (str, optional): "dev" or "production". Defaults to the
+            ``AREA_LOG_PROFILE`` environment variable, then "dev". An unknown
+            profile falls back to "dev" with a warning, since this runs when
+            the module is imported.
+    """
+    requested = (profile or os.getenv(LOG_PROFILE_ENV) or "dev").strip().lower()
+    profile = requested if requested in LOG_PROFILES else "dev"
+    _stop_queue_listener()
+    if profile == "production":
+        _configure_production_logging()
+    else:
+        _configure_dev_logging()
+    if requested != profile:
+        structlog.get_logger("utils").warning(
+            "Unknown log profile, using dev",
+            profile=requested,
+            expected=LOG_PROFILES,
         )
-    ],
-)
 
 
-# Configure structlog for structured logging
-structlog.configure(
-    processors=[
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.KeyValueRenderer(key_order=["event"]),
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
+configure_logging()
 
 
 def create_logger(name: str) -> structlog.stdlib.BoundLogger:
@@ -71,19 +171,50 @@ def create_logger(name: str) -> structlog.stdlib.BoundLogger:
     return structlog.get_logger(name)
 
 
+def get_model_name() -> str:
+    """
+    Return the name of the Gemini model used by ``get_llm_instance``.
+
+    Returns:
+        str: The ``GEMINI_MODEL`` setting, or its backoff default.
+    """
+    return os.getenv("GEMINI_MODEL", "GEMINI_MODEL_BACKOFF")
+
+
+def llm_settings() -> Dict[str, Any]:
+    """
+    Return the model and generation parameters that shape the pipeline output.
+
+    Used to key content-addressed runs and cached analyses, so that a change
+    of model or temperature never reuses results produced with another one.
+
+    Returns:
+        Dict[str, Any]: {"model": ..., "temperatures": {stage: temperature}}.
+    """
+    return {"model": get_model_name(), "temperatures": dict(STAGE_TEMPERATURES)}
+
+
 # TODO: Add exponential backoff and retry logic for rate limit handling
-def get_llm_instance(t: float = 0.0) -> ChatGoogleGenerativeAI:
+def get_llm_instance(
+    t: float = 0.0, seed: Optional[int] = None, rate_limiter: Any = None
+) -> "ChatGoogleGenerativeAI":
     """
     Configure and return an instance of the LLM model with specific parameters.
     Also checks for rate limit issues by making a test call.
 
     Args:
         t (float, optional): Temperature setting for the model. Defaults to 0.0.
+        seed (int, optional): Sampling seed, for reproducible generations.
+        rate_limiter (BaseRateLimiter, optional): Limiter shared by several
+            instances to cap the request rate.
 
     Returns:
         ChatGoogleGenerativeAI: Configured LLM instance.
     """
-    model_name = os.getenv("GEMINI_MODEL", "GEMINI_MODEL_BACKOFF")
+    # Imported on first use: the Gemini SDK dominates the import time
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    model_name = get_model_name()
     google_api_key = os.getenv("GOOGLE_API_KEY")
 
     llm = ChatGoogleGenerativeAI(
@@ -91,10 +222,30 @@ def get_llm_instance(t: float = 0.0) -> ChatGoogleGenerativeAI:
         temperature=t,
         max_retries=2,
         google_api_key=google_api_key,
+        seed=seed,
+        rate_limiter=rate_limiter,
     )
     return llm
 
 
+def bind_json_schema(llm: "ChatGoogleGenerativeAI", schema: Dict[str, Any]) -> Any:
+    """
+    Constrain the model output to a JSON schema, without parsing the response.
+
+    Unlike ``with_structured_output``, the invocation returns the raw AIMessage,
+    so its JSON text can be parsed and validated in a single pydantic step
+    (``TypeAdapter.validate_json(message.text)``).
+
+    Args:
+        llm (ChatGoogleGenerativeAI): The LLM instance.
+        schema (Dict[str, Any]): The JSON schema of the response.
+
+    Returns:
+        Runnable: The LLM bound to the JSON response format.
+    """
+    return llm.bind(response_mime_type="application/json", response_json_schema=schema)
+
+
 if __name__ == "__main__":
     # Test logger
     logger = create_logger("test")
@@ -106,6 +257,5 @@ if __name__ == "__main__":
         resp = llm.invoke("ping")
         logger.info("LLM instance created and test call successful", response=resp)
     except Exception as e:
-
         logger.error("Failed to instantiate LLM or hit rate limit", error=str(e))
         raise RuntimeError("LLM instantiation failed or rate limit reached") from e